@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 
+from app.config import settings
 from app.models.agent import Agent
 from app.models.debate import Turn
 
@@ -12,6 +13,8 @@ class BaseDebateAgent(ABC):
     def __init__(self, agent: Agent, side: str):
         self.agent = agent
         self.side = side
+        # Time budget for one turn or comment; callers may tighten it per agent
+        self.timeout_seconds: float = settings.default_turn_timeout
 
     @abstractmethod
     async def generate_turn(
@@ -44,12 +47,19 @@ class BaseDebateAgent(ABC):
         """
         raise NotImplementedError
 
+    async def close(self):
+        """Release any client held by the agent. Called once the debate or topic is done."""
 
-def get_agent(agent: Agent, side: str = "") -> BaseDebateAgent:
-    """Factory: return the appropriate agent implementation."""
+
+def get_agent(agent: Agent, side: str = "", live: bool = False) -> BaseDebateAgent:
+    """Factory: return the appropriate agent implementation.
+
+    ``live`` marks turns of a live debate, which get first claim on LLM capacity.
+    """
     if agent.is_builtin:
         from app.agents.claude_agent import ClaudeDebateAgent
-        return ClaudeDebateAgent(agent, side)
+        from app.agents.llm_governor import LLMPriority
+        return ClaudeDebateAgent(agent, side, LLMPriority.LIVE_TURN if live else LLMPriority.TURN)
     from app.agents.external_agent import ExternalDebateAgent
     if agent.status != "active":
         raise ValueError(f"External agent {agent.name} is not active (status: {agent.status})")
@@ -0,0 +1,96 @@
+"""Bounded prompt context for long debates and discussions.
+
+Agents see the latest ``context_recent_items`` turns or comments verbatim. Older
+items are folded into an extractive rolling summary (one short line each) that
+is capped at ``context_summary_tokens``. Summaries are cached per debate/topic
+(keyed by the id of its first item) together with a high-water mark, so each
+new item that scrolls out of the window is summarized once instead of the whole
+history being re-read on every prompt.
+"""
+
+import re
+from collections import OrderedDict
+
+from app.config import settings
+from app.models.debate import Turn
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s")
+
+# scope key -> (high-water mark, id of the last summarized item, summary lines)
+_summaries: OrderedDict[str, tuple[int, str, list[str]]] = OrderedDict()
+
+
+def window_comments(comments: list[dict]) -> tuple[str | None, list[dict]]:
+    """Split comments into (summary of older comments or None, recent comments)."""
+    return _window(
+        comments,
+        item_id=lambda c: str(c["id"]),
+        summarize=lambda c: f"- [{c['agent_name']} (id={c['id']})] {_gist(c.get('content') or '')}",
+    )
+
+
+def window_turns(turns: list[Turn]) -> tuple[str | None, list[Turn]]:
+    """Split previous turns into (summary of older turns or None, recent turns)."""
+    return _window(
+        turns,
+        item_id=lambda t: str(t.id),
+        summarize=lambda t: f"- Turn {t.turn_number} ({t.stance or 'unknown'}): {_gist(t.claim or t.argument or '')}",
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    # ~3 chars per token, matching the LLM governor's estimate
+    return len(text) // 3 + 1
+
+
+def _window(items: list, item_id, summarize) -> tuple[str | None, list]:
+    recent_count = max(settings.context_recent_items, 1)
+    if len(items) <= recent_count:
+        return None, list(items)
+
+    older = items[:-recent_count]
+    lines = _summary_lines(item_id(items[0]), older, item_id, summarize)
+    return _render(lines), items[-recent_count:]
+
+
+def _summary_lines(scope: str, older: list, item_id, summarize) -> list[str]:
+    cached = _summaries.get(scope)
+    if cached is not None:
+        high_water, last_id, lines = cached
+        if high_water <= len(older) and item_id(older[high_water - 1]) == last_id:
+            lines = lines + [summarize(item) for item in older[high_water:]]
+        else:
+            lines = [summarize(item) for item in older]
+    else:
+        lines = [summarize(item) for item in older]
+
+    _summaries[scope] = (len(older), item_id(older[-1]), lines)
+    _summaries.move_to_end(scope)
+    while len(_summaries) > settings.context_summary_cache_size:
+        _summaries.popitem(last=False)
+    return lines
+
+
+def _render(lines: list[str]) -> str:
+    """Newest summary lines that fit the token budget, oldest first."""
+    budget = settings.context_summary_tokens
+    kept = []
+    used = 0
+    for line in reversed(lines):
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    kept.reverse()
+    omitted = len(lines) - len(kept)
+    header = f"({omitted} earlier items omitted)\n" if omitted else ""
+    return header + "\n".join(kept)
+
+
+def _gist(text: str) -> str:
+    """First sentence, capped to a single short line."""
+    text = " ".join(text.split())
+    first = _SENTENCE_END.split(text, maxsplit=1)[0]
+    limit = settings.context_summary_line_chars
+    return first if len(first) <= limit else first[: limit - 3].rstrip() + "..."
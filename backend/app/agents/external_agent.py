@@ -1,30 +1,72 @@
-"""External debate agent that calls a developer-hosted endpoint via HTTP POST."""
+"""External debate agent that calls a developer-hosted endpoint via HTTP POST.
+
+Two request formats are supported:
+
+- v1 (default): every request carries the (windowed) debate or discussion context.
+- v2 (delta): opted into by returning ``"protocol_version": 2`` from ``GET /health``.
+  Requests carry a ``session_id`` and only the turns or comments after the
+  agent's last acknowledged sequence number (``since_seq``). The agent answers
+  with ``ack_seq``. Replying 409 or ``{"resync": true}`` makes the platform
+  resend the full (windowed) context once. The windowed form is also sent when
+  there is no ack yet or more items are unacknowledged than the window holds.
+"""
 
 import logging
+import time
+from uuid import uuid4
 
 import httpx
-import tiktoken
 
+from app import tokenizer
 from app.agents.base import BaseDebateAgent
+from app.agents.context_window import window_comments, window_turns
+from app.config import settings
 from app.models.agent import Agent
 from app.models.debate import Turn
 
 logger = logging.getLogger(__name__)
 
-_TIKTOKEN_ENCODING = None
+DELTA_PROTOCOL_VERSION = 2
+_PROTOCOL_CACHE_SECONDS = 600
+
+# endpoint_url -> (protocol version, negotiated at)
+_protocol_versions: dict[str, tuple[int, float]] = {}
+
+
+def _turn_item(t: Turn) -> dict:
+    return {
+        "turn_number": t.turn_number,
+        "side": t.stance,
+        "claim": t.claim,
+        "argument": t.argument,
+    }
 
 
-def _get_encoding():
-    global _TIKTOKEN_ENCODING
-    if _TIKTOKEN_ENCODING is None:
-        _TIKTOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
-    return _TIKTOKEN_ENCODING
+class _DeltaSession:
+    """Sequence state for one stream (turns or comments) of one debate/topic."""
+
+    def __init__(self):
+        self.session_id = str(uuid4())
+        self.acked_seq = 0
 
 
 class ExternalDebateAgent(BaseDebateAgent):
     def __init__(self, agent: Agent, side: str):
         super().__init__(agent, side)
         self.endpoint_url = agent.endpoint_url
+        self._client: httpx.AsyncClient | None = None
+        self._sessions = {"turns": _DeltaSession(), "comments": _DeltaSession()}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """One pooled client per agent instance, so turns reuse the connection."""
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def generate_turn(
         self,
@@ -35,51 +77,27 @@ class ExternalDebateAgent(BaseDebateAgent):
         team_id: str | None = None,
         max_turns: int | None = None,
     ) -> dict:
-        previous = [
-            {
-                "turn_number": t.turn_number,
-                "side": t.stance,
-                "claim": t.claim,
-                "argument": t.argument,
-            }
-            for t in previous_turns
-        ]
-
         payload = {
             "topic": topic,
             "side": side,
             "turn_number": turn_number,
-            "previous_turns": previous,
-            "timeout_seconds": 120,
+            "timeout_seconds": int(self.timeout_seconds),
             "team_id": team_id,
             "max_turns": max_turns,
         }
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                f"{self.endpoint_url}/turn",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-
-        if resp.status_code != 200:
-            raise RuntimeError(
-                f"External agent returned status {resp.status_code}: {resp.text[:200]}"
-            )
-
-        data = resp.json()
+        data = await self._exchange(
+            "turn", payload, previous_turns,
+            stream="turns", to_item=_turn_item, window=window_turns,
+            items_key="previous_turns", new_items_key="new_turns", summary_key="earlier_turns_summary",
+        )
 
         required = ["stance", "claim", "argument", "citations"]
         missing = [f for f in required if f not in data]
         if missing:
             raise ValueError(f"Missing required fields: {missing}")
 
-        # Count tokens
-        try:
-            enc = _get_encoding()
-            token_count = len(enc.encode(data.get("argument", "")))
-        except Exception:
-            token_count = len(data.get("argument", "").split()) * 2
+        token_count = await tokenizer.count(data.get("argument", ""))
 
         return {
             "stance": data["stance"],
@@ -101,24 +119,15 @@ class ExternalDebateAgent(BaseDebateAgent):
         payload = {
             "topic_title": topic_title,
             "topic_description": topic_description,
-            "existing_comments": existing_comments,
-            "my_previous_comments": my_previous_comments,
+            "my_previous_comments": my_previous_comments[-settings.context_recent_items:],
             "remaining_comments": remaining_comments,
         }
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                f"{self.endpoint_url}/comment",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-
-        if resp.status_code != 200:
-            raise RuntimeError(
-                f"External agent returned status {resp.status_code}: {resp.text[:200]}"
-            )
-
-        data = resp.json()
+        data = await self._exchange(
+            "comment", payload, existing_comments,
+            stream="comments", to_item=lambda c: c, window=window_comments,
+            items_key="existing_comments", new_items_key="new_comments", summary_key="earlier_comments_summary",
+        )
 
         if data.get("skip"):
             return None
@@ -127,11 +136,7 @@ class ExternalDebateAgent(BaseDebateAgent):
         if not content:
             return None
 
-        try:
-            enc = _get_encoding()
-            token_count = len(enc.encode(content))
-        except Exception:
-            token_count = len(content.split()) * 2
+        token_count = await tokenizer.count(content)
 
         return {
             "content": content,
@@ -140,3 +145,97 @@ class ExternalDebateAgent(BaseDebateAgent):
             "stance": data.get("stance"),
             "token_count": token_count,
         }
+
+    async def _exchange(
+        self,
+        path: str,
+        payload: dict,
+        items: list,
+        *,
+        stream: str,
+        to_item,
+        window,
+        items_key: str,
+        new_items_key: str,
+        summary_key: str,
+    ) -> dict:
+        """POST ``payload`` plus the context in whichever protocol the agent speaks."""
+        if await self._protocol_version() < DELTA_PROTOCOL_VERSION:
+            earlier_summary, recent = window(items)
+            resp = await self._post(path, {
+                **payload,
+                items_key: [to_item(x) for x in recent],
+                summary_key: earlier_summary,
+            })
+            return self._json(resp)
+
+        session = self._sessions[stream]
+        backlog = len(items) - session.acked_seq
+        # A raw delta is only sent on top of an ack and never holds more than the
+        # window; otherwise (new session, stale ack, long gap) send the windowed resync
+        resync = session.acked_seq == 0 or backlog < 0 or backlog > max(settings.context_recent_items, 1)
+        for _ in range(2):
+            if resync:
+                earlier_summary, recent = window(items)
+                since_seq = len(items) - len(recent)
+                delta = {"resync": True, new_items_key: [to_item(x) for x in recent], summary_key: earlier_summary}
+            else:
+                since_seq = session.acked_seq
+                delta = {new_items_key: [to_item(x) for x in items[since_seq:]]}
+
+            resp = await self._post(path, {
+                **payload,
+                **delta,
+                "protocol_version": DELTA_PROTOCOL_VERSION,
+                "session_id": session.session_id,
+                "since_seq": since_seq,
+                "seq": len(items),
+            })
+            if resp.status_code == 409:
+                data = None
+            else:
+                data = self._json(resp)
+                if not data.get("resync"):
+                    break
+            if resync:
+                raise RuntimeError("External agent requested a resync after a full resync")
+            logger.info(f"External agent {self.agent.name} requested a resync of {stream}")
+            resync = True
+
+        ack = data.get("ack_seq")
+        if isinstance(ack, int) and 0 <= ack <= len(items):
+            session.acked_seq = ack
+        return data
+
+    async def _post(self, path: str, payload: dict) -> httpx.Response:
+        return await self._get_client().post(
+            f"{self.endpoint_url}/{path}",
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout_seconds,
+        )
+
+    def _json(self, resp: httpx.Response) -> dict:
+        if resp.status_code != 200:
+            raise RuntimeError(
+                f"External agent returned status {resp.status_code}: {resp.text[:200]}"
+            )
+        return resp.json()
+
+    async def _protocol_version(self) -> int:
+        """Protocol version advertised by the endpoint's /health, cached per endpoint."""
+        cached = _protocol_versions.get(self.endpoint_url)
+        if cached and time.monotonic() - cached[1] < _PROTOCOL_CACHE_SECONDS:
+            return cached[0]
+
+        version = 1
+        try:
+            resp = await self._get_client().get(f"{self.endpoint_url}/health", timeout=10.0)
+            if resp.status_code == 200:
+                advertised = resp.json().get("protocol_version", 1)
+                if isinstance(advertised, int):
+                    version = min(advertised, DELTA_PROTOCOL_VERSION)
+        except Exception as e:
+            logger.debug(f"Protocol negotiation with {self.endpoint_url} failed: {e}")
+        _protocol_versions[self.endpoint_url] = (version, time.monotonic())
+        return version
@@ -0,0 +1,247 @@
+"""Process-wide governor for Anthropic API calls.
+
+Every call reserves capacity from per-model token buckets (requests and tokens
+per minute) before it is sent. Waiting calls are admitted in priority order, so
+live debate turns go ahead of comments, sentiment analysis and factchecks.
+Background priorities only run while the token bucket keeps a reserve for
+turns. When the API answers 429/529, the model's budget is paused for everyone,
+so callers don't each back off and retry on their own timers.
+
+Budgets are per process. When running several workers, divide the account
+limits between them with ``llm_governor_workers``.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+import anthropic
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority(IntEnum):
+    LIVE_TURN = 0
+    TURN = 1
+    COMMENT = 2
+    SENTIMENT = 3
+    FACTCHECK = 4
+
+
+# Priorities at or above this level must leave the background reserve untouched
+BACKGROUND_PRIORITY = LLMPriority.SENTIMENT
+
+_OVERLOAD_CODES = (429, 529)
+
+
+def estimate_request_tokens(max_tokens: int = 0, system: str = "", messages: list | None = None, **_) -> int:
+    """Rough upper bound of input + output tokens for a messages.create call."""
+    chars = len(system or "")
+    for message in messages or []:
+        content = message.get("content", "")
+        chars += len(content) if isinstance(content, str) else len(str(content))
+    # ~3 chars per token keeps the estimate on the safe side for Korean text
+    return chars // 3 + max_tokens
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(per_minute, 1))
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self.refill(now)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level = min(self.capacity, self.level - amount)
+
+
+class _ModelBudget:
+    def __init__(self, model: str, requests_per_minute: int, tokens_per_minute: int, max_concurrency: int):
+        self.model = model
+        self.requests = _TokenBucket(requests_per_minute)
+        self.tokens = _TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        # heap of (priority, seq, tokens, future)
+        self.waiters: list[tuple[int, int, float, asyncio.Future]] = []
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class LLMReservation:
+    """Capacity granted for one API call."""
+
+    def __init__(self, budget: _ModelBudget, reserved_tokens: float):
+        self._budget = budget
+        self.reserved_tokens = reserved_tokens
+
+    def record_usage(self, usage):
+        """Settle the token bucket against the usage the API actually reported."""
+        if usage is None:
+            return
+        actual = (getattr(usage, "input_tokens", 0) or 0) + (getattr(usage, "output_tokens", 0) or 0)
+        self._budget.tokens.take(actual - self.reserved_tokens)
+        self.reserved_tokens = actual
+
+
+class LLMGovernor:
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        background_reserve: float = 0.2,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.background_reserve = background_reserve
+        self._budgets: dict[str, _ModelBudget] = {}
+        self._seq = itertools.count()
+
+    def _budget(self, model: str) -> _ModelBudget:
+        budget = self._budgets.get(model)
+        if budget is None:
+            budget = _ModelBudget(model, self.requests_per_minute, self.tokens_per_minute, self.max_concurrency)
+            self._budgets[model] = budget
+        return budget
+
+    @asynccontextmanager
+    async def reserve(self, model: str, estimated_tokens: int, priority: LLMPriority = LLMPriority.TURN):
+        """Wait for capacity on ``model`` and hold a concurrency slot while inside."""
+        budget = self._budget(model)
+        tokens = float(min(estimated_tokens, budget.tokens.capacity))
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(budget.waiters, (int(priority), next(self._seq), tokens, future))
+        self._dispatch(budget)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted in the same tick we were cancelled: hand the slot back
+            if future.done() and not future.cancelled():
+                budget.in_flight -= 1
+                self._dispatch(budget)
+            raise
+
+        try:
+            yield LLMReservation(budget, tokens)
+        finally:
+            budget.in_flight -= 1
+            self._dispatch(budget)
+
+    def penalize(self, model: str, seconds: float):
+        """Pause all calls to ``model`` after the API reported it is overloaded."""
+        budget = self._budget(model)
+        budget.paused_until = max(budget.paused_until, time.monotonic() + seconds)
+        logger.warning(f"LLM governor pausing {model} for {seconds:.1f}s")
+
+    async def create_message(
+        self,
+        client: anthropic.AsyncAnthropic,
+        priority: LLMPriority = LLMPriority.TURN,
+        screen=None,
+        on_success=None,
+        **kwargs,
+    ):
+        """Governed ``client.messages.create``.
+
+        With ``screen`` (a StreamingContentFilter) the response is streamed and
+        every text chunk is fed to it. A ContentViolationError raised by the
+        screen closes the stream, cancelling the rest of the generation.
+        ``on_success`` is called with the API round-trip time in seconds, which
+        excludes the time spent waiting for capacity here.
+        """
+        model = kwargs["model"]
+        async with self.reserve(model, estimate_request_tokens(**kwargs), priority) as reservation:
+            started = time.monotonic()
+            try:
+                if screen is None:
+                    response = await client.messages.create(**kwargs)
+                else:
+                    response = await _stream_message(client, screen, **kwargs)
+            except anthropic.APIStatusError as e:
+                if e.status_code in _OVERLOAD_CODES:
+                    self.penalize(model, _retry_after_seconds(e))
+                raise
+            if on_success is not None:
+                on_success(time.monotonic() - started)
+            reservation.record_usage(getattr(response, "usage", None))
+            return response
+
+    def _dispatch(self, budget: _ModelBudget):
+        if budget.timer is not None:
+            budget.timer.cancel()
+            budget.timer = None
+
+        now = time.monotonic()
+        while budget.waiters:
+            priority, _, tokens, future = budget.waiters[0]
+            if future.done():  # caller gave up (e.g. turn timeout)
+                heapq.heappop(budget.waiters)
+                continue
+            if budget.in_flight >= budget.max_concurrency:
+                return  # the next release dispatches again
+
+            required = tokens
+            if priority >= BACKGROUND_PRIORITY:
+                required += budget.tokens.capacity * self.background_reserve
+            wait = max(
+                budget.paused_until - now,
+                budget.requests.wait_time(1, now),
+                budget.tokens.wait_time(min(required, budget.tokens.capacity), now),
+            )
+            if wait > 0:
+                budget.timer = asyncio.get_running_loop().call_later(wait, self._dispatch, budget)
+                return
+
+            heapq.heappop(budget.waiters)
+            budget.requests.take(1)
+            budget.tokens.take(tokens)
+            budget.in_flight += 1
+            future.set_result(None)
+
+
+async def _stream_message(client: anthropic.AsyncAnthropic, screen, **kwargs):
+    screen.reset()
+    async with client.messages.stream(**kwargs) as stream:
+        async for text in stream.text_stream:
+            screen.feed(text)
+        return await stream.get_final_message()
+
+
+def _retry_after_seconds(error: anthropic.APIStatusError, default: float = 5.0) -> float:
+    try:
+        value = error.response.headers.get("retry-after")
+        return min(float(value), 60.0) if value else default
+    except (AttributeError, TypeError, ValueError):
+        return default
+
+
+def _per_worker(value: int) -> int:
+    return max(value // max(settings.llm_governor_workers, 1), 1)
+
+
+# Singleton instance
+llm_governor = LLMGovernor(
+    requests_per_minute=_per_worker(settings.llm_requests_per_minute),
+    tokens_per_minute=_per_worker(settings.llm_tokens_per_minute),
+    max_concurrency=settings.llm_max_concurrency,
+    background_reserve=settings.llm_background_reserve,
+)
@@ -0,0 +1,139 @@
+"""Per-model circuit breakers and health-scored routing for Claude calls.
+
+Each model keeps a sliding window of recent call outcomes. When the error rate
+crosses the threshold, the breaker opens. Calls then go straight to the next
+healthy model instead of spending retries on one we already know is down. After
+a cooldown, the breaker lets a single probe through (half-open). A success
+closes it again and a failure reopens it.
+"""
+
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+WINDOW_SECONDS = 60.0
+MIN_CALLS = 4
+ERROR_THRESHOLD = 0.5
+OPEN_SECONDS = 30.0
+LATENCY_ALPHA = 0.2
+# Latency at which a model is considered as unhealthy as one failing half its calls
+LATENCY_BUDGET_SECONDS = 30.0
+
+
+class ModelCircuitBreaker:
+    def __init__(self, model: str):
+        self.model = model
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.latency_ewma: float | None = None
+        self._outcomes: deque[tuple[float, bool]] = deque()  # (timestamp, ok)
+
+    def current_state(self, now: float | None = None) -> str:
+        now = time.monotonic() if now is None else now
+        if self.state == OPEN and now - self.opened_at >= OPEN_SECONDS:
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+        return self.state
+
+    def try_acquire_probe(self) -> bool:
+        """Claim the single half-open probe slot."""
+        if self.current_state() != HALF_OPEN or self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def release_probe(self):
+        """Free the probe slot if a probe ended without a verdict (e.g. cancelled)."""
+        self.probe_in_flight = False
+
+    def record_success(self, latency: float):
+        now = time.monotonic()
+        self.latency_ewma = latency if self.latency_ewma is None else (
+            LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency_ewma
+        )
+        if self.current_state(now) == HALF_OPEN:
+            self.state = CLOSED
+            self.probe_in_flight = False
+            self._outcomes.clear()
+        self._append(now, True)
+
+    def record_failure(self):
+        now = time.monotonic()
+        if self.current_state(now) == HALF_OPEN:
+            self._trip(now)
+            return
+        self._append(now, False)
+        if self.state == CLOSED and len(self._outcomes) >= MIN_CALLS and self.error_rate(now) >= ERROR_THRESHOLD:
+            self._trip(now)
+
+    def error_rate(self, now: float | None = None) -> float:
+        self._evict(time.monotonic() if now is None else now)
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def health_score(self, now: float | None = None) -> float:
+        """0.0 is perfectly healthy; larger is worse."""
+        latency_penalty = 0.0
+        if self.latency_ewma is not None:
+            latency_penalty = min(self.latency_ewma / LATENCY_BUDGET_SECONDS, 1.0) * ERROR_THRESHOLD
+        return self.error_rate(now) + latency_penalty
+
+    def _trip(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.probe_in_flight = False
+
+    def _append(self, now: float, ok: bool):
+        self._outcomes.append((now, ok))
+        self._evict(now)
+
+    def _evict(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > WINDOW_SECONDS:
+            self._outcomes.popleft()
+
+
+class ModelHealthRegistry:
+    def __init__(self):
+        self._breakers: dict[str, ModelCircuitBreaker] = {}
+
+    def breaker(self, model: str) -> ModelCircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = ModelCircuitBreaker(model)
+            self._breakers[model] = breaker
+        return breaker
+
+    def is_open(self, model: str) -> bool:
+        return self.breaker(model).current_state() == OPEN
+
+    def route(self, models: list[str]) -> list[tuple[str, str]]:
+        """Order ``models`` (given in preference order) for one call.
+
+        Returns (model, mode) pairs where mode is "normal", "probe" (half-open:
+        claim the probe slot, single attempt) or "forced" (everything is tripped:
+        single attempt each as a last resort).
+        """
+        now = time.monotonic()
+        healthy = []
+        probing = []
+        for index, model in enumerate(models):
+            state = self.breaker(model).current_state(now)
+            if state == CLOSED:
+                # Quantize so small score differences keep the preference order
+                healthy.append((round(self.breaker(model).health_score(now) / 0.25), index, model))
+            elif state == HALF_OPEN:
+                probing.append(model)
+
+        ordered = [(model, "probe") for model in probing] + [(model, "normal") for _, _, model in sorted(healthy)]
+        if not healthy:
+            ordered += [(model, "forced") for model in models if model not in probing]
+        return ordered
+
+
+# Singleton instance
+model_health = ModelHealthRegistry()
@@ -5,6 +5,7 @@ import logging
 import anthropic
 import httpx
 
+from app.agents.llm_governor import LLMPriority, llm_governor
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -83,7 +84,9 @@ class RefereeAgent:
             match_explanation = ""
             if page_content and quote:
                 try:
-                    resp_msg = await self.client.messages.create(
+                    resp_msg = await llm_governor.create_message(
+                        self.client,
+                        LLMPriority.FACTCHECK,
                         model=settings.claude_model,
                         max_tokens=200,
                         messages=[{
@@ -121,7 +124,9 @@ class RefereeAgent:
         logic_explanation = ""
         if evidence_texts:
             try:
-                resp_msg = await self.client.messages.create(
+                resp_msg = await llm_governor.create_message(
+                    self.client,
+                    LLMPriority.FACTCHECK,
                     model=settings.claude_model,
                     max_tokens=200,
                     messages=[{
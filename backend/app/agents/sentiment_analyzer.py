@@ -7,6 +7,7 @@ import random
 
 import anthropic
 
+from app.agents.llm_governor import LLMPriority, llm_governor
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -23,103 +24,80 @@ SENTIMENT_SYSTEM_PROMPT = """You are a debate analysis expert. Analyze the senti
    - 0.5 = moderate confidence
    - 1.0 = highly confident, assertive, declarative
 
+The turns are numbered items and may come from different debates; score each one on its own.
+
 Respond ONLY with valid JSON matching this exact format (no markdown, no extra text):
 {
   "analyses": [
-    {"turn_number": 1, "aggression": 0.7, "confidence": 0.8},
-    {"turn_number": 2, "aggression": 0.5, "confidence": 0.9}
+    {"item": 1, "aggression": 0.7, "confidence": 0.8},
+    {"item": 2, "aggression": 0.5, "confidence": 0.9}
   ]
 }"""
 
+# Output budget per scored turn, on top of a fixed allowance for the JSON wrapper
+MAX_TOKENS_PER_TURN = 40
+MAX_TOKENS_BASE = 100
+
 
-async def analyze_debate_sentiment(turns_with_side: list[tuple]) -> list[dict]:
+async def score_turns(texts: list[tuple[str | None, str | None]]) -> list[dict | None]:
     """
-    Analyze sentiment for all debate turns using Claude API.
+    Score the sentiment of a batch of turns in one Claude call.
 
     Args:
-        turns_with_side: List of (Turn, side) tuples from the debate
+        texts: (claim, argument) of each turn
 
     Returns:
-        List of dicts with format:
-        [
-          {"turn_number": 1, "side": "pro", "aggression": 0.7, "confidence": 0.8, "token_count": 150},
-          ...
-        ]
+        One {"aggression": float, "confidence": float} per turn, in input order,
+        or None for turns the response did not cover. Raises if the call fails.
     """
-    if not turns_with_side:
+    if not texts:
         return []
 
-    # Build prompt with all turns
-    turns_text = []
-    for turn, side in turns_with_side:
-        turns_text.append(
-            f"Turn {turn.turn_number} ({side}):\n"
-            f"Claim: {turn.claim}\n"
-            f"Argument: {turn.argument}\n"
-        )
-
+    items = [
+        f"Item {i}:\nClaim: {claim or ''}\nArgument: {argument or ''}\n"
+        for i, (claim, argument) in enumerate(texts, start=1)
+    ]
     user_message = (
         "Analyze the sentiment of these debate turns:\n\n"
-        + "\n---\n".join(turns_text)
-        + "\n\nProvide aggression and confidence scores for each turn."
+        + "\n---\n".join(items)
+        + "\n\nProvide aggression and confidence scores for each item."
     )
 
-    try:
-        # Call Claude API with retry
-        client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-        response = await _call_with_retry(
-            client,
-            model=settings.claude_model,
-            max_tokens=2000,
-            system=SENTIMENT_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_message}],
-        )
-
-        raw_text = response.content[0].text.strip()
-
-        # Parse response
-        result = _parse_sentiment_response(raw_text)
-
-        # Merge with turn metadata
-        sentiment_data = []
-        for turn, side in turns_with_side:
-            # Find matching analysis
-            analysis = next(
-                (a for a in result["analyses"] if a["turn_number"] == turn.turn_number),
-                None,
-            )
-
-            sentiment_data.append({
-                "turn_number": turn.turn_number,
-                "side": side,
-                "aggression": analysis["aggression"] if analysis else 0.5,
-                "confidence": analysis["confidence"] if analysis else 0.5,
-                "token_count": turn.token_count or 0,
-            })
-
-        return sentiment_data
-
-    except Exception as e:
-        logger.error(f"Sentiment analysis failed: {e}", exc_info=True)
-        # Fallback: return neutral scores
-        return [
-            {
-                "turn_number": turn.turn_number,
-                "side": side,
-                "aggression": 0.5,
-                "confidence": 0.5,
-                "token_count": turn.token_count or 0,
+    client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+    response = await _call_with_retry(
+        client,
+        model=settings.claude_model,
+        max_tokens=MAX_TOKENS_BASE + MAX_TOKENS_PER_TURN * len(texts),
+        system=SENTIMENT_SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": user_message}],
+    )
+    result = _parse_sentiment_response(response.content[0].text.strip())
+
+    scores: list[dict | None] = [None] * len(texts)
+    for analysis in result.get("analyses", []):
+        try:
+            index = int(analysis["item"]) - 1
+            score = {
+                "aggression": _clamp(float(analysis["aggression"])),
+                "confidence": _clamp(float(analysis["confidence"])),
             }
-            for turn, side in turns_with_side
-        ]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < len(texts):
+            scores[index] = score
+    return scores
+
+
+def _clamp(score: float) -> float:
+    return min(max(score, 0.0), 1.0)
 
 
 async def _call_with_retry(client: anthropic.AsyncAnthropic, max_retries: int = 4, **kwargs):
-    """Call Anthropic API with exponential backoff + jitter."""
+    """Call Anthropic API through the governor with exponential backoff + jitter."""
     retryable_codes = (429, 500, 502, 503, 529)
     for attempt in range(max_retries):
         try:
-            return await client.messages.create(**kwargs)
+            return await llm_governor.create_message(client, LLMPriority.SENTIMENT, **kwargs)
         except (anthropic.APIConnectionError, anthropic.APITimeoutError) as e:
             if attempt < max_retries - 1:
                 base_wait = min(2 ** (attempt + 1), 30)
@@ -134,6 +112,9 @@ async def _call_with_retry(client: anthropic.AsyncAnthropic, max_retries: int =
                 raise
         except anthropic.APIStatusError as e:
             if e.status_code in retryable_codes and attempt < max_retries - 1:
+                if e.status_code in (429, 529):
+                    # The governor has paused the model; wait in its queue
+                    continue
                 base_wait = min(2 ** (attempt + 1), 30)
                 jitter = random.uniform(0, base_wait * 0.5)
                 wait = base_wait + jitter
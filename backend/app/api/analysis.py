@@ -1,158 +1,115 @@
-from collections import defaultdict
+from datetime import datetime, timedelta
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import and_, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from app.agents.sentiment_analyzer import analyze_debate_sentiment
 from app.database import get_db
-from app.models.debate import Debate, DebateParticipant, Turn
+from app.engine.analysis_worker import STALE_JOB_SECONDS, UNFINISHED_STATUSES, analysis_worker, transcript_version
+from app.engine.citation_stats import citation_report
+from app.middleware.response_cache import response_cache
+from app.models.debate import Debate, Turn
 from app.models.reaction import AnalysisResult
-from app.schemas.turn import AnalysisResponse
+from app.schemas.turn import AnalysisJobResponse, AnalysisResponse, CitationReportResponse
 
 router = APIRouter(prefix="/api/debates", tags=["analysis"])
+report_router = APIRouter(prefix="/api/analysis", tags=["analysis"])
 limiter = Limiter(key_func=get_remote_address)
 
 
-def classify_citation_url(url: str) -> str:
-    """Classify citation URL by source type based on domain patterns."""
-    url_lower = url.lower()
-
-    # Academic sources
-    academic_patterns = [
-        "scholar.google", "arxiv", "doi.org", "ncbi", "pubmed", "jstor",
-        "ssrn", "ieee", "springer", "nature.com", "science.org", "wiley",
-        "researchgate", ".edu", "academic"
-    ]
-    if any(pattern in url_lower for pattern in academic_patterns):
-        return "academic"
-
-    # News sources
-    news_patterns = [
-        "reuters", "bbc", "cnn", "nytimes", "washingtonpost", "theguardian",
-        "apnews", "bloomberg", "economist", "wsj"
-    ]
-    if any(pattern in url_lower for pattern in news_patterns):
-        return "news"
-
-    # Wiki sources
-    if "wikipedia" in url_lower or "wikimedia" in url_lower:
-        return "wiki"
-
-    # Government sources
-    gov_patterns = [
-        ".gov", ".go.kr", "europa.eu", "un.org", "who.int", "oecd.org"
-    ]
-    if any(pattern in url_lower for pattern in gov_patterns):
-        return "government"
-
-    return "other"
-
-
 @router.get("/{debate_id}/analysis", response_model=AnalysisResponse)
 async def get_analysis(
+    request: Request,
     debate_id: UUID,
     db: AsyncSession = Depends(get_db),
 ):
-    """Get existing analysis result for a debate."""
+    """Get the analysis of a debate, with the status of its latest generation job."""
+    # Any write to the row (possibly by another process) bumps updated_at, the cached entry's version
+    version = await db.scalar(
+        select(AnalysisResult.updated_at).where(
+            AnalysisResult.debate_id == debate_id, AnalysisResult.status == "completed",
+        )
+    )
+    if version is not None:
+        cached = response_cache.get(request, ("analysis", debate_id), version=version)
+        if cached:
+            return cached
+
     result = await db.execute(
         select(AnalysisResult).where(AnalysisResult.debate_id == debate_id)
     )
     analysis = result.scalar_one_or_none()
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
-    return analysis
+    if analysis.status != "completed":
+        return analysis
+    return response_cache.put(
+        request, ("analysis", debate_id), AnalysisResponse, analysis, immutable=False, version=analysis.updated_at,
+    )
 
 
-@router.post("/{debate_id}/analysis/generate", status_code=200)
+@router.post("/{debate_id}/analysis/generate", response_model=AnalysisJobResponse, status_code=202)
 @limiter.limit("5/minute")
 async def generate_analysis(
     request: Request,
     debate_id: UUID,
     db: AsyncSession = Depends(get_db),
 ):
-    """Generate analysis for a debate (returns 202 Accepted)."""
-    # Verify debate exists
-    result = await db.execute(
-        select(Debate).where(Debate.id == debate_id)
-    )
-    debate = result.scalar_one_or_none()
-    if not debate:
+    """Queue analysis generation (202 Accepted); poll GET /analysis for its status.
+
+    A job already queued, running or finished for the current transcript is
+    left alone, so repeated calls on an unchanged debate are no-ops. Failed
+    jobs, and unfinished ones not touched for STALE_JOB_SECONDS, are queued again.
+    """
+    if await db.scalar(select(Debate.id).where(Debate.id == debate_id)) is None:
         raise HTTPException(status_code=404, detail="Debate not found")
 
-    # Get all validated turns with participant info
     result = await db.execute(
-        select(Turn, DebateParticipant.side)
-        .join(DebateParticipant, and_(
-            Turn.agent_id == DebateParticipant.agent_id,
-            Turn.debate_id == DebateParticipant.debate_id,
-        ))
-        .where(
-            Turn.debate_id == debate_id,
-            DebateParticipant.debate_id == debate_id,
-            Turn.status == "validated",
-        )
-        .order_by(Turn.turn_number)
-    )
-    turns_with_side = result.all()
-
-    # Analyze sentiment using Claude API
-    sentiment_data = await analyze_debate_sentiment(turns_with_side)
-
-    # Calculate citation_stats: citations per side, unique sources, source types
-    citation_stats: dict[str, dict] = defaultdict(
-        lambda: {
-            "total": 0,
-            "unique_sources": set(),
-            "source_types": {"academic": 0, "news": 0, "wiki": 0, "government": 0, "other": 0}
-        }
+        select(Turn.id)
+        .where(Turn.debate_id == debate_id, Turn.status == "validated")
+        .order_by(Turn.turn_number, Turn.id)
     )
+    version = transcript_version(result.scalars().all())
 
-    for turn, side in turns_with_side:
-        if turn.citations:
-            citations_list = turn.citations if isinstance(turn.citations, list) else []
-            citation_stats[side]["total"] += len(citations_list)
-            for citation in citations_list:
-                if isinstance(citation, dict) and "url" in citation:
-                    url = citation["url"]
-                    citation_stats[side]["unique_sources"].add(url)
-                    source_type = classify_citation_url(url)
-                    citation_stats[side]["source_types"][source_type] += 1
-
-    # Convert sets to counts for JSON serialization
-    citation_stats_json = {}
-    for side_key in ("pro", "con"):
-        stats = citation_stats[side_key]
-        citation_stats_json[side_key] = {
-            "total": stats["total"],
-            "unique_sources": len(stats["unique_sources"]),
-            "source_types": stats["source_types"],
-        }
-
-    # Check if analysis already exists
+    stmt = insert(AnalysisResult).values(debate_id=debate_id, status="pending", transcript_version=version)
     result = await db.execute(
-        select(AnalysisResult).where(AnalysisResult.debate_id == debate_id)
+        stmt.on_conflict_do_update(
+            index_elements=[AnalysisResult.debate_id],
+            set_={"status": "pending", "transcript_version": version, "updated_at": func.now()},
+            where=or_(
+                AnalysisResult.transcript_version.is_distinct_from(version),
+                AnalysisResult.status == "failed",
+                and_(
+                    AnalysisResult.status.in_(UNFINISHED_STATUSES),
+                    AnalysisResult.updated_at < func.now() - timedelta(seconds=STALE_JOB_SECONDS),
+                ),
+            ),
+        ).returning(AnalysisResult.id)
     )
-    existing = result.scalar_one_or_none()
+    queued = result.scalar_one_or_none() is not None
+    await db.commit()
 
-    if existing:
-        # Update existing analysis
-        existing.sentiment_data = sentiment_data
-        existing.citation_stats = citation_stats_json
-        existing.updated_at = func.now()
-    else:
-        # Create new analysis
-        analysis = AnalysisResult(
-            debate_id=debate_id,
-            sentiment_data=sentiment_data,
-            citation_stats=citation_stats_json,
-        )
-        db.add(analysis)
+    if queued:
+        response_cache.invalidate("analysis", debate_id)
+        await analysis_worker.enqueue(debate_id)
+        return AnalysisJobResponse(status="pending", transcript_version=version)
+
+    status = await db.scalar(select(AnalysisResult.status).where(AnalysisResult.debate_id == debate_id))
+    return AnalysisJobResponse(status=status, transcript_version=version)
 
-    await db.commit()
 
-    return {"status": "accepted", "message": "Analysis generation completed"}
+@report_router.get("/citations", response_model=CitationReportResponse)
+@limiter.limit("30/minute")
+async def get_citation_report(
+    request: Request,
+    since: datetime | None = Query(None, description="Only turns validated at or after this time"),
+    limit: int = Query(20, ge=1, le=100, description="Number of most cited domains to list"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Citation sources across all debates, by source type and most cited domains."""
+    return await citation_report(db, since=since, limit=limit)
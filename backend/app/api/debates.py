@@ -1,17 +1,33 @@
 import asyncio
+from collections.abc import Iterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, page_response, parse_fields
+from app.api.reactions import reaction_counts
 from app.database import get_db
+from app.middleware.response_cache import TERMINAL_DEBATE_STATUSES, response_cache
 from app.models.agent import Agent
-from app.models.debate import Debate, DebateParticipant
-from app.schemas.debate import DebateCreate, DebateListResponse, DebateResponse, ParticipantResponse
+from app.models.debate import Debate, DebateParticipant, Turn
+from app.models.factcheck import FactcheckRequest, FactcheckResult
+from app.models.reaction import AnalysisResult
+from app.rendering import columns, dumps, row_dicts
+from app.schemas.debate import (
+    DebateBundleResponse,
+    DebateCreate,
+    DebateListResponse,
+    DebateResponse,
+    ParticipantResponse,
+)
+from app.schemas.factcheck import FactcheckResultResponse
+from app.schemas.turn import AnalysisResponse, TurnResponse
 
 router = APIRouter(prefix="/api/debates", tags=["debates"])
 limiter = Limiter(key_func=get_remote_address)
@@ -23,13 +39,19 @@ _background_tasks: set[asyncio.Task] = set()
 @router.get("", response_model=list[DebateListResponse])
 async def list_debates(
     status: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Debate).where(Debate.is_sandbox == False).order_by(Debate.created_at.desc())
+    selected = parse_fields(fields, DebateListResponse)
+    names = dict.fromkeys([*(selected or DebateListResponse.model_fields), "id", "created_at"])
+    query = select(*[getattr(Debate, name) for name in names]).where(Debate.is_sandbox == False)
     if status:
         query = query.where(Debate.status == status)
+    query = keyset_page(query, Debate.created_at, Debate.id, cursor, limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    return page_response(result.mappings().all(), limit, selected)
 
 
 @router.post("", response_model=DebateResponse, status_code=201)
@@ -107,7 +129,11 @@ async def create_debate(
 
 
 @router.get("/{debate_id}", response_model=DebateResponse)
-async def get_debate(debate_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_debate(request: Request, debate_id: UUID, db: AsyncSession = Depends(get_db)):
+    cached = response_cache.get(request, ("debate", debate_id))
+    if cached:
+        return cached
+
     result = await db.execute(
         select(Debate)
         .where(Debate.id == debate_id)
@@ -116,9 +142,70 @@ async def get_debate(debate_id: UUID, db: AsyncSession = Depends(get_db)):
     debate = result.scalar_one_or_none()
     if not debate:
         raise HTTPException(status_code=404, detail="Debate not found")
+    if debate.status in TERMINAL_DEBATE_STATUSES:
+        return response_cache.put(request, ("debate", debate_id), DebateResponse, _debate_to_response(debate))
     return _debate_to_response(debate)
 
 
+@router.get("/{debate_id}/bundle", response_model=DebateBundleResponse)
+async def get_debate_bundle(debate_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Debate, turns, reaction counts, factcheck results and analysis in one response.
+
+    Four queries on one session: the debate with its participants, agents and
+    analysis (joined), then turns, reaction counts and factcheck results. The
+    JSON is streamed section by section, one turn at a time.
+    """
+    result = await db.execute(
+        select(Debate, AnalysisResult)
+        .outerjoin(AnalysisResult, AnalysisResult.debate_id == Debate.id)
+        .where(Debate.id == debate_id)
+        .options(joinedload(Debate.participants).joinedload(DebateParticipant.agent))
+    )
+    row = result.unique().one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Debate not found")
+    debate, analysis = row
+
+    result = await db.execute(
+        select(*columns(Turn, TurnResponse)).where(Turn.debate_id == debate_id).order_by(Turn.turn_number)
+    )
+    turns = row_dicts(result)
+    reactions = await reaction_counts(db, debate_id)
+    result = await db.execute(
+        select(*columns(FactcheckResult, FactcheckResultResponse))
+        .join(FactcheckRequest, FactcheckResult.request_id == FactcheckRequest.id)
+        .where(FactcheckRequest.debate_id == debate_id)
+        .order_by(FactcheckResult.created_at)
+    )
+    factchecks = row_dicts(result)
+
+    # Validate before streaming so a bad row fails the request instead of truncating the body
+    sections = (
+        _debate_to_response(debate),
+        turns,
+        reactions,
+        factchecks,
+        AnalysisResponse.model_validate(analysis) if analysis else None,
+    )
+    return StreamingResponse(_stream_bundle(*sections), media_type="application/json")
+
+
+def _stream_bundle(
+    debate: DebateResponse,
+    turns: list[dict],
+    reactions: dict[str, dict[str, int]],
+    factchecks: list[dict],
+    analysis: AnalysisResponse | None,
+) -> Iterator[bytes]:
+    yield b'{"debate":' + debate.model_dump_json().encode()
+    yield b',"turns":['
+    for i, turn in enumerate(turns):
+        yield (b"," if i else b"") + dumps(turn)
+    yield b'],"reactions":' + dumps(reactions)
+    yield b',"factchecks":' + dumps(factchecks)
+    yield b',"analysis":' + (analysis.model_dump_json().encode() if analysis else b"null") + b"}"
+
+
 @router.post("/{debate_id}/start", response_model=DebateResponse)
 @limiter.limit("5/minute")
 async def start_debate(request: Request, debate_id: UUID, db: AsyncSession = Depends(get_db)):
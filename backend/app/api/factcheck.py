@@ -10,8 +10,10 @@ from sqlalchemy.sql import func
 
 from app.database import get_db
 from app.engine.factcheck_worker import factcheck_worker
-from app.models.debate import Turn
+from app.middleware.response_cache import TERMINAL_DEBATE_STATUSES, response_cache
+from app.models.debate import Debate, Turn
 from app.models.factcheck import FactcheckRequest, FactcheckResult
+from app.rendering import ORJSONResponse, columns, row_dicts
 from app.schemas.factcheck import (
     FactcheckCreate,
     FactcheckRequestResponse,
@@ -98,17 +100,36 @@ async def request_factcheck(
     response_model=list[FactcheckResultResponse],
 )
 async def get_debate_factchecks(
+    request: Request,
     debate_id: UUID,
     db: AsyncSession = Depends(get_db),
 ):
     """Get all factcheck results for a debate."""
+    # Results are only ever added, possibly by another process; cached entries are served while current
+    version = tuple((await db.execute(
+        select(func.count(FactcheckResult.id), func.max(FactcheckResult.created_at))
+        .join(FactcheckRequest, FactcheckResult.request_id == FactcheckRequest.id)
+        .where(FactcheckRequest.debate_id == debate_id)
+    )).one())
+    cached = response_cache.get(request, ("debate_factchecks", debate_id), version=version)
+    if cached:
+        return cached
+
     result = await db.execute(
-        select(FactcheckResult)
+        select(*columns(FactcheckResult, FactcheckResultResponse))
         .join(FactcheckRequest, FactcheckResult.request_id == FactcheckRequest.id)
         .where(FactcheckRequest.debate_id == debate_id)
         .order_by(FactcheckResult.created_at)
     )
-    return result.scalars().all()
+    results = row_dicts(result)
+
+    # Late results still arrive after a debate ends; a new result changes the version
+    status = await db.scalar(select(Debate.status).where(Debate.id == debate_id))
+    if status in TERMINAL_DEBATE_STATUSES:
+        return response_cache.put_rendered(
+            request, ("debate_factchecks", debate_id), results, immutable=False, version=version,
+        )
+    return ORJSONResponse(results)
 
 
 @router.get(
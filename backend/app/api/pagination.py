@@ -0,0 +1,72 @@
+"""Keyset pagination and sparse field selection for list endpoints.
+
+Pages are ordered by (created_at, id) descending. The cursor for the next page
+encodes the last row's (created_at, id) and is returned in the
+``X-Next-Cursor`` header, so list responses stay plain JSON arrays. ``fields``
+is a comma-separated subset of the response model's fields.
+"""
+
+import base64
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+
+from app.rendering import ORJSONResponse
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_fields(fields: str | None, model: type[BaseModel]) -> list[str] | None:
+    """Requested field names in model order, or None for all fields."""
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [name for name in model.model_fields if name in requested]
+
+
+def keyset_page(query: Select, created_at_col, id_col, cursor: str | None, limit: int) -> Select:
+    """Restrict ``query`` to the page after ``cursor``, fetching one extra row to detect a next page."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(created_at_col, id_col) < tuple_(created_at, row_id))
+    return query.order_by(created_at_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def page_response(rows: list, limit: int, fields: list[str] | None) -> ORJSONResponse:
+    """Trim the extra row, set the next-page cursor and project ``fields``.
+
+    ``rows`` are mappings holding at least ``id`` and ``created_at``; they are
+    rendered as-is (see app/rendering.py).
+    """
+    headers = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers = {NEXT_CURSOR_HEADER: encode_cursor(rows[-1]["created_at"], rows[-1]["id"])}
+
+    if fields is None:
+        items = [dict(row) for row in rows]
+    else:
+        items = [{name: row[name] for name in fields} for row in rows]
+    return ORJSONResponse(items, headers=headers)
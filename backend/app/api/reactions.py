@@ -1,49 +1,31 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.debate import Turn
-from app.models.reaction import Reaction
-from app.schemas.turn import ReactionCreate, ReactionResponse
+from app.engine.reaction_ingest import reaction_ingest
+from app.models.reaction import ReactionCount
+from app.schemas.turn import ReactionAccepted, ReactionCreate
 
 router = APIRouter(tags=["reactions"])
 
 
 @router.post(
     "/api/debates/{debate_id}/turns/{turn_id}/reactions",
-    response_model=ReactionResponse,
-    status_code=201,
+    response_model=ReactionAccepted,
+    status_code=202,
 )
 async def add_reaction(
     debate_id: UUID,
     turn_id: UUID,
     body: ReactionCreate,
-    db: AsyncSession = Depends(get_db),
 ):
-    # Verify turn exists and belongs to debate
-    result = await db.execute(
-        select(Turn).where(Turn.id == turn_id, Turn.debate_id == debate_id)
-    )
-    if not result.scalar_one_or_none():
+    """Queue a reaction; it is written with the next batch, and repeats are ignored."""
+    if not await reaction_ingest.submit_turn_reaction(debate_id, turn_id, body.type, body.session_id):
         raise HTTPException(status_code=404, detail="Turn not found")
-
-    reaction = Reaction(
-        turn_id=turn_id,
-        type=body.type,
-        session_id=body.session_id,
-    )
-    db.add(reaction)
-    try:
-        await db.commit()
-        await db.refresh(reaction)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(status_code=422, detail="Duplicate reaction")
-    return reaction
+    return ReactionAccepted()
 
 
 @router.get(
@@ -55,20 +37,16 @@ async def get_reaction_counts(
     db: AsyncSession = Depends(get_db),
 ):
     """Get reaction counts grouped by turn_id and type."""
+    return await reaction_counts(db, debate_id)
+
+
+async def reaction_counts(db: AsyncSession, scope_id: UUID) -> dict[str, dict[str, int]]:
+    """Reaction counts of a debate's turns or a topic's comments, keyed by target id then type."""
     result = await db.execute(
-        select(
-            Reaction.turn_id,
-            Reaction.type,
-            func.count().label("count"),
-        )
-        .join(Turn, Turn.id == Reaction.turn_id)
-        .where(Turn.debate_id == debate_id)
-        .group_by(Reaction.turn_id, Reaction.type)
+        select(ReactionCount.target_id, ReactionCount.type, ReactionCount.count)
+        .where(ReactionCount.scope_id == scope_id)
     )
     counts: dict[str, dict[str, int]] = {}
-    for row in result.all():
-        tid = str(row.turn_id)
-        if tid not in counts:
-            counts[tid] = {}
-        counts[tid][row.type] = row.count
+    for target_id, type, count in result.all():
+        counts.setdefault(str(target_id), {})[type] = count
     return counts
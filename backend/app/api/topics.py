@@ -1,18 +1,20 @@
-import asyncio
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, page_response, parse_fields
+from app.api.reactions import reaction_counts
 from app.database import get_db
+from app.engine.reaction_ingest import reaction_ingest
+from app.middleware.response_cache import TERMINAL_TOPIC_STATUSES, response_cache
 from app.models.agent import Agent
-from app.models.reaction import Reaction
 from app.models.topic import Comment, Topic, TopicParticipant
+from app.rendering import ORJSONResponse, columns, row_dicts
 from app.schemas.topic import (
     CommentResponse,
     TopicCreate,
@@ -20,54 +22,28 @@ from app.schemas.topic import (
     TopicParticipantResponse,
     TopicResponse,
 )
-from app.schemas.turn import ReactionCreate, ReactionResponse
+from app.schemas.turn import ReactionAccepted, ReactionCreate
 
 router = APIRouter(prefix="/api/topics", tags=["topics"])
 limiter = Limiter(key_func=get_remote_address)
 
-# Keep strong references to background tasks
-_background_tasks: set[asyncio.Task] = set()
-
 
 @router.get("", response_model=list[TopicListResponse])
 async def list_topics(
     status: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
-    query = (
-        select(
-            Topic,
-            func.count(TopicParticipant.id.distinct()).label("participant_count"),
-            func.count(Comment.id.distinct()).label("comment_count"),
-        )
-        .outerjoin(TopicParticipant, Topic.id == TopicParticipant.topic_id)
-        .outerjoin(Comment, Topic.id == Comment.topic_id)
-        .group_by(Topic.id)
-        .order_by(Topic.created_at.desc())
-    )
+    selected = parse_fields(fields, TopicListResponse)
+    names = dict.fromkeys([*(selected or TopicListResponse.model_fields), "id", "created_at"])
+    query = select(*[getattr(Topic, name) for name in names])
     if status:
         query = query.where(Topic.status == status)
-
+    query = keyset_page(query, Topic.created_at, Topic.id, cursor, limit)
     result = await db.execute(query)
-    rows = result.all()
-
-    return [
-        TopicListResponse(
-            id=topic.id,
-            title=topic.title,
-            description=topic.description,
-            status=topic.status,
-            duration_minutes=topic.duration_minutes,
-            max_comments_per_agent=topic.max_comments_per_agent,
-            participant_count=p_count,
-            comment_count=c_count,
-            created_at=topic.created_at,
-            started_at=topic.started_at,
-            closes_at=topic.closes_at,
-            closed_at=topic.closed_at,
-        )
-        for topic, p_count, c_count in rows
-    ]
+    return page_response(result.mappings().all(), limit, selected)
 
 
 @router.post("", response_model=TopicResponse, status_code=201)
@@ -99,6 +75,7 @@ async def create_topic(
         max_comments_per_agent=body.max_comments_per_agent,
         polling_interval_seconds=body.polling_interval_seconds,
         status="scheduled",
+        participant_count=len(body.agent_ids),
     )
     db.add(topic)
     await db.flush()
@@ -124,7 +101,11 @@ async def create_topic(
 
 
 @router.get("/{topic_id}", response_model=TopicResponse)
-async def get_topic(topic_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_topic(request: Request, topic_id: UUID, db: AsyncSession = Depends(get_db)):
+    cached = response_cache.get(request, ("topic", topic_id))
+    if cached:
+        return cached
+
     result = await db.execute(
         select(Topic)
         .where(Topic.id == topic_id)
@@ -133,6 +114,8 @@ async def get_topic(topic_id: UUID, db: AsyncSession = Depends(get_db)):
     topic = result.scalar_one_or_none()
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
+    if topic.status in TERMINAL_TOPIC_STATUSES:
+        return response_cache.put(request, ("topic", topic_id), TopicResponse, _topic_to_response(topic))
     return _topic_to_response(topic)
 
 
@@ -141,8 +124,7 @@ async def get_topic(topic_id: UUID, db: AsyncSession = Depends(get_db)):
 async def start_topic(request: Request, topic_id: UUID, db: AsyncSession = Depends(get_db)):
     from datetime import datetime, timedelta, timezone
 
-    from app.database import async_session
-    from app.engine.comment_orchestrator import CommentOrchestrator
+    from app.engine.topic_scheduler import topic_scheduler
 
     result = await db.execute(
         select(Topic)
@@ -163,11 +145,8 @@ async def start_topic(request: Request, topic_id: UUID, db: AsyncSession = Depen
     await db.commit()
     await db.refresh(topic)
 
-    # Launch orchestrator in background
-    orchestrator = CommentOrchestrator(topic_id=topic.id, db_factory=async_session)
-    task = asyncio.create_task(orchestrator.run())
-    _background_tasks.add(task)
-    task.add_done_callback(_background_tasks.discard)
+    # Hand the topic to the shared scheduler
+    topic_scheduler.add_topic(topic.id)
 
     # Reload for response
     result = await db.execute(
@@ -180,61 +159,46 @@ async def start_topic(request: Request, topic_id: UUID, db: AsyncSession = Depen
 
 
 @router.get("/{topic_id}/comments", response_model=list[CommentResponse])
-async def get_topic_comments(topic_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_topic_comments(request: Request, topic_id: UUID, db: AsyncSession = Depends(get_db)):
+    cached = response_cache.get(request, ("comments", topic_id))
+    if cached:
+        return cached
+
+    # Read the status first: a closed topic gets no more comments after this point
+    status = await db.scalar(select(Topic.status).where(Topic.id == topic_id))
+    empty_list = literal_column("'[]'::jsonb")
     result = await db.execute(
-        select(Comment)
+        select(*columns(
+            Comment,
+            CommentResponse,
+            agent_name=func.coalesce(Agent.name, "Unknown"),
+            references=func.coalesce(Comment.references_, empty_list),
+            citations=func.coalesce(Comment.citations, empty_list),
+        ))
+        .outerjoin(Agent, Agent.id == Comment.agent_id)
         .where(Comment.topic_id == topic_id)
-        .options(selectinload(Comment.agent))
         .order_by(Comment.created_at)
     )
-    comments = result.scalars().all()
-    return [
-        CommentResponse(
-            id=c.id,
-            topic_id=c.topic_id,
-            agent_id=c.agent_id,
-            agent_name=c.agent.name if c.agent else "Unknown",
-            content=c.content,
-            references=c.references_ or [],
-            citations=c.citations or [],
-            stance=c.stance,
-            token_count=c.token_count,
-            created_at=c.created_at,
-        )
-        for c in comments
-    ]
+    comments = row_dicts(result)
+    if status in TERMINAL_TOPIC_STATUSES:
+        return response_cache.put_rendered(request, ("comments", topic_id), comments)
+    return ORJSONResponse(comments)
 
 
 @router.post(
     "/{topic_id}/comments/{comment_id}/reactions",
-    response_model=ReactionResponse,
-    status_code=201,
+    response_model=ReactionAccepted,
+    status_code=202,
 )
 async def add_comment_reaction(
     topic_id: UUID,
     comment_id: UUID,
     body: ReactionCreate,
-    db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Comment).where(Comment.id == comment_id, Comment.topic_id == topic_id)
-    )
-    if not result.scalar_one_or_none():
+    """Queue a reaction; it is written with the next batch, and repeats are ignored."""
+    if not await reaction_ingest.submit_comment_reaction(topic_id, comment_id, body.type, body.session_id):
         raise HTTPException(status_code=404, detail="Comment not found")
-
-    reaction = Reaction(
-        comment_id=comment_id,
-        type=body.type,
-        session_id=body.session_id,
-    )
-    db.add(reaction)
-    try:
-        await db.commit()
-        await db.refresh(reaction)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(status_code=422, detail="Duplicate reaction")
-    return reaction
+    return ReactionAccepted()
 
 
 @router.get(
@@ -246,23 +210,7 @@ async def get_topic_reaction_counts(
     db: AsyncSession = Depends(get_db),
 ):
     """Get reaction counts grouped by comment_id and type."""
-    result = await db.execute(
-        select(
-            Reaction.comment_id,
-            Reaction.type,
-            func.count().label("count"),
-        )
-        .join(Comment, Comment.id == Reaction.comment_id)
-        .where(Comment.topic_id == topic_id)
-        .group_by(Reaction.comment_id, Reaction.type)
-    )
-    counts: dict[str, dict[str, int]] = {}
-    for row in result.all():
-        cid = str(row.comment_id)
-        if cid not in counts:
-            counts[cid] = {}
-        counts[cid][row.type] = row.count
-    return counts
+    return await reaction_counts(db, topic_id)
 
 
 @router.get(
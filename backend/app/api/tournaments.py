@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import get_current_developer
+from app.database import async_session, get_db
+from app.engine.tournament import Tournament
+from app.models.agent import Agent
+from app.models.developer import Developer
+from app.schemas.tournament import TournamentCreate, TournamentResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/tournaments", tags=["tournaments"])
+
+_background_tasks: set[asyncio.Task] = set()
+
+# Tournaments started by this process, by id; finished ones are kept for FINISHED_TTL_SECONDS
+_tournaments: dict[UUID, Tournament] = {}
+FINISHED_TTL_SECONDS = 24 * 60 * 60
+
+
+@router.post("", response_model=TournamentResponse, status_code=202)
+async def create_tournament(
+    body: TournamentCreate,
+    developer: Developer = Depends(get_current_developer),
+    db: AsyncSession = Depends(get_db),
+):
+    unique_ids = list(dict.fromkeys(body.agent_ids))
+    if len(unique_ids) < 2:
+        raise HTTPException(status_code=422, detail="A tournament needs at least 2 distinct agents")
+    result = await db.execute(select(Agent).where(Agent.id.in_(unique_ids)))
+    agents = result.scalars().all()
+    if len(agents) != len(unique_ids):
+        raise HTTPException(status_code=422, detail="One or more agents not found")
+    for ag in agents:
+        if not ag.is_builtin and ag.status != "active":
+            raise HTTPException(
+                status_code=422,
+                detail=f"Agent '{ag.name}' is not active (status: {ag.status}). Complete sandbox validation first.",
+            )
+
+    _evict_finished()
+    tournament = Tournament(
+        agents=list(agents),
+        topics=body.topics,
+        db_factory=async_session,
+        bracket=body.bracket,
+        rounds=body.rounds,
+        max_turns=body.max_turns,
+        parallelism=body.parallelism,
+        auto_factcheck=body.auto_factcheck,
+    )
+    _tournaments[tournament.id] = tournament
+
+    task = asyncio.create_task(_run_tournament(tournament))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    return tournament.summary()
+
+
+@router.get("/{tournament_id}", response_model=TournamentResponse)
+async def get_tournament(tournament_id: UUID):
+    _evict_finished()
+    tournament = _tournaments.get(tournament_id)
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return tournament.summary()
+
+
+def _evict_finished():
+    now = time.monotonic()
+    for tournament_id in [
+        t.id for t in _tournaments.values()
+        if t.finished_at is not None and now - t.finished_at > FINISHED_TTL_SECONDS
+    ]:
+        del _tournaments[tournament_id]
+
+
+async def _run_tournament(tournament: Tournament):
+    try:
+        async for result in tournament.run():
+            logger.info(
+                f"Tournament {tournament.id}: debate {result['debate_id']} {result['status']}, "
+                f"winner {result['winner_agent_id']}"
+            )
+    except Exception as e:
+        logger.error(f"Tournament {tournament.id} failed: {e}", exc_info=True)
@@ -1,11 +1,13 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.middleware.response_cache import TERMINAL_DEBATE_STATUSES, response_cache
 from app.models.debate import Debate, Turn
+from app.rendering import ORJSONResponse, columns, row_dicts
 from app.schemas.turn import TurnResponse
 
 router = APIRouter(prefix="/api/debates/{debate_id}/turns", tags=["turns"])
@@ -13,17 +15,27 @@ router = APIRouter(prefix="/api/debates/{debate_id}/turns", tags=["turns"])
 
 @router.get("", response_model=list[TurnResponse])
 async def list_turns(
+    request: Request,
     debate_id: UUID,
     agent_id: UUID | None = None,
     db: AsyncSession = Depends(get_db),
 ):
+    cache_key = ("turns", debate_id, agent_id)
+    cached = response_cache.get(request, cache_key)
+    if cached:
+        return cached
+
     # Verify debate exists
-    result = await db.execute(select(Debate).where(Debate.id == debate_id))
-    if not result.scalar_one_or_none():
+    result = await db.execute(select(Debate.status).where(Debate.id == debate_id))
+    status = result.scalar_one_or_none()
+    if status is None:
         raise HTTPException(status_code=404, detail="Debate not found")
 
-    query = select(Turn).where(Turn.debate_id == debate_id).order_by(Turn.turn_number)
+    query = select(*columns(Turn, TurnResponse)).where(Turn.debate_id == debate_id).order_by(Turn.turn_number)
     if agent_id:
         query = query.where(Turn.agent_id == agent_id)
     result = await db.execute(query)
-    return result.scalars().all()
+    turns = row_dicts(result)
+    if status in TERMINAL_DEBATE_STATUSES:
+        return response_cache.put_rendered(request, cache_key, turns)
+    return ORJSONResponse(turns)
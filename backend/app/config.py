@@ -16,6 +16,13 @@ class Settings(BaseSettings):
     anthropic_api_key: str = ""
     claude_model: str = "claude-haiku-4-5-20251001"
 
+    # LLM governor (budgets are per model, split across llm_governor_workers processes)
+    llm_requests_per_minute: int = 50
+    llm_tokens_per_minute: int = 40000
+    llm_max_concurrency: int = 8
+    llm_background_reserve: float = 0.2
+    llm_governor_workers: int = 1
+
     # CORS
     cors_origins: str = "http://localhost:3000"
 
@@ -34,6 +41,42 @@ class Settings(BaseSettings):
     default_max_turns: int = 10
     default_token_limit: int = 500
 
+    # Adaptive turn timeouts (p99 of observed latency x margin, clamped)
+    turn_timeout_margin: float = 1.5
+    turn_timeout_min: int = 15
+    turn_timeout_max: int = 300
+    turn_timeout_min_samples: int = 20
+    # Histogram is a sliding window of this many periods, so old latencies age out
+    turn_latency_period_seconds: int = 86400
+    turn_latency_periods: int = 7
+    # External agents failing this many turns in a row get a short timeout until they recover
+    turn_fast_fail_after: int = 3
+    turn_fast_fail_timeout: int = 10
+    turn_fast_fail_window: int = 600
+
+    # Prompt context window (latest items verbatim, older ones summarized)
+    context_recent_items: int = 12
+    context_summary_tokens: int = 1500
+    context_summary_line_chars: int = 200
+    context_summary_cache_size: int = 1024
+
+    # Topic comment polling
+    comment_polling_concurrency: int = 4
+    comment_second_chance_seconds: int = 30
+    comment_skip_backoff_max_cycles: int = 8
+    # Topic participant/comment counters are recomputed this often
+    topic_counter_reconcile_seconds: int = 3600
+
+    # Content filter (optional JSON pattern file, checked for changes every N seconds)
+    content_filter_patterns_path: str = ""
+    content_filter_reload_seconds: int = 5
+
+    # Serialized responses of finished debates / closed topics kept in memory
+    response_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # Tournament
+    tournament_max_parallelism: int = 16
+
     model_config = {"env_file": str(_ENV_FILE), "extra": "ignore"}
 
 
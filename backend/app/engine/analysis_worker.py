@@ -0,0 +1,163 @@
+"""Background worker for debate analysis jobs.
+
+``POST /api/debates/{id}/analysis/generate`` records a pending job on the
+debate's ``analysis_results`` row, tagged with the transcript version (a hash
+of its validated turns), and enqueues the debate. The worker reads the
+transcript and computes its citation stats (in SQL, see citation_stats.py) in
+one short session, assembles the per-turn sentiment scores stored by the
+SentimentScorer (scoring any turn still missing one, with no session or
+connection held), and writes the result in a second short session.
+
+A job whose transcript cannot be read is marked failed, and a job left
+pending or processing for ``STALE_JOB_SECONDS`` (e.g. by a crash) is queued
+again by the next generate request.
+"""
+
+import asyncio
+import hashlib
+import logging
+from uuid import UUID
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.orm import defer
+from sqlalchemy.sql import func
+
+from app.database import async_session
+from app.engine.citation_stats import debate_citation_stats
+from app.engine.sentiment_scorer import sentiment_scorer
+from app.middleware.response_cache import response_cache
+from app.models.debate import DebateParticipant, Turn
+from app.models.reaction import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED_STATUSES = ("pending", "processing")
+# Unfinished jobs not touched for this long are queued again by generate requests
+STALE_JOB_SECONDS = 600
+
+
+def transcript_version(turn_ids: list[UUID]) -> str:
+    """Version of a transcript given its validated turn ids, ordered by (turn_number, id)."""
+    return hashlib.sha256(",".join(str(turn_id) for turn_id in turn_ids).encode()).hexdigest()[:32]
+
+
+def sentiment_data(turns_with_side: list[tuple], scores: list[dict | None]) -> list[dict]:
+    """Per-turn sentiment chart data; turns that could not be scored are neutral."""
+    return [
+        {
+            "turn_number": turn.turn_number,
+            "side": side,
+            "aggression": score["aggression"] if score else 0.5,
+            "confidence": score["confidence"] if score else 0.5,
+            "token_count": turn.token_count or 0,
+        }
+        for (turn, side), score in zip(turns_with_side, scores)
+    ]
+
+
+class AnalysisWorker:
+    def __init__(self, db_factory):
+        self.db_factory = db_factory
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start the background processing task."""
+        self._task = asyncio.create_task(self._process_loop())
+        logger.info("AnalysisWorker started")
+
+    async def enqueue(self, debate_id: UUID):
+        await self._queue.put(debate_id)
+
+    async def recover_pending(self):
+        """Re-enqueue unfinished analysis jobs from DB on startup."""
+        async with self.db_factory() as db:
+            result = await db.execute(
+                select(AnalysisResult.debate_id).where(AnalysisResult.status.in_(UNFINISHED_STATUSES))
+            )
+            debate_ids = result.scalars().all()
+        for debate_id in debate_ids:
+            await self._queue.put(debate_id)
+        if debate_ids:
+            logger.info(f"Recovered {len(debate_ids)} unfinished analysis jobs")
+
+    async def process(self, debate_id: UUID):
+        """Run the pending analysis job of a debate, if there is one."""
+        try:
+            async with self.db_factory() as db:
+                claimed = await db.execute(
+                    update(AnalysisResult)
+                    .where(AnalysisResult.debate_id == debate_id, AnalysisResult.status.in_(UNFINISHED_STATUSES))
+                    .values(status="processing", updated_at=func.now())
+                    .returning(AnalysisResult.id)
+                    .execution_options(synchronize_session=False)
+                )
+                if claimed.scalar_one_or_none() is None:
+                    return
+                turns_with_side = await self._load_transcript(db, debate_id)
+                stats = await debate_citation_stats(db, debate_id)
+                await db.commit()
+        except Exception:
+            # The claim was rolled back with the session; fail the job so generate queues it again
+            logger.exception(f"Failed to read the transcript for the analysis of debate {debate_id}")
+            await self._store(debate_id, {"status": "failed"}, AnalysisResult.status.in_(UNFINISHED_STATUSES))
+            return
+
+        try:
+            # Usually all stored already; turns missing a score are scored in the shared batches
+            scores = await sentiment_scorer.score([turn for turn, _ in turns_with_side])
+            values = {
+                "status": "completed",
+                "sentiment_data": sentiment_data(turns_with_side, scores),
+                "citation_stats": stats,
+            }
+        except Exception:
+            logger.exception(f"Analysis failed for debate {debate_id}")
+            values = {"status": "failed"}
+
+        # A newer generate request resets the row to pending; leave it to that job
+        await self._store(debate_id, values, AnalysisResult.status == "processing")
+
+    async def _store(self, debate_id: UUID, values: dict, *where):
+        async with self.db_factory() as db:
+            await db.execute(
+                update(AnalysisResult)
+                .where(AnalysisResult.debate_id == debate_id, *where)
+                .values(updated_at=func.now(), **values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        response_cache.invalidate("analysis", debate_id)
+
+    async def _load_transcript(self, db, debate_id: UUID) -> list[tuple]:
+        """Validated turns of the debate with each author's side, in turn order."""
+        result = await db.execute(
+            select(Turn, DebateParticipant.side)
+            .options(defer(Turn.citations))  # citation stats are computed in SQL
+            .join(DebateParticipant, and_(
+                Turn.agent_id == DebateParticipant.agent_id,
+                Turn.debate_id == DebateParticipant.debate_id,
+            ))
+            .where(
+                Turn.debate_id == debate_id,
+                DebateParticipant.debate_id == debate_id,
+                Turn.status == "validated",
+            )
+            .order_by(Turn.turn_number, Turn.id)
+        )
+        return result.all()
+
+    async def _process_loop(self):
+        """Continuously process analysis jobs from the queue."""
+        while True:
+            try:
+                debate_id = await self._queue.get()
+                await self.process(debate_id)
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Error in analysis worker loop")
+
+
+# Singleton instance
+analysis_worker = AnalysisWorker(db_factory=async_session)
@@ -0,0 +1,145 @@
+"""Citation statistics computed in the database.
+
+Turn citations are unnested with ``jsonb_array_elements`` and reduced to the
+URL's lowercased host in SQL, so only (side, domain, count) rows reach
+Python. Each distinct domain is classified once by a compiled matcher per
+source type and the result cached per domain, instead of scanning every URL
+against every pattern.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from uuid import UUID
+
+from sqlalchemy import and_, case, column, distinct, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.debate import DebateParticipant, Turn
+
+# Checked in order; the first source type with a matching pattern wins
+SOURCE_TYPE_PATTERNS = (
+    ("academic", (
+        "scholar.google", "arxiv", "doi.org", "ncbi", "pubmed", "jstor",
+        "ssrn", "ieee", "springer", "nature.com", "science.org", "wiley",
+        "researchgate", ".edu", "academic",
+    )),
+    ("news", (
+        "reuters", "bbc", "cnn", "nytimes", "washingtonpost", "theguardian",
+        "apnews", "bloomberg", "economist", "wsj",
+    )),
+    ("wiki", ("wikipedia", "wikimedia")),
+    ("government", (".gov", ".go.kr", "europa.eu", "un.org", "who.int", "oecd.org")),
+)
+SOURCE_TYPES = tuple(source_type for source_type, _ in SOURCE_TYPE_PATTERNS) + ("other",)
+
+_MATCHERS = tuple(
+    (source_type, re.compile("|".join(re.escape(pattern) for pattern in patterns)))
+    for source_type, patterns in SOURCE_TYPE_PATTERNS
+)
+
+# Host of a URL, with or without a scheme; always matches (possibly empty)
+_HOST_PATTERN = r"^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/?#]*@)?([^:/?#]*)"
+
+
+def normalize_domain(url: str) -> str:
+    """Lowercased host of ``url``, as extracted in SQL."""
+    return re.match(_HOST_PATTERN, url.lower()).group(1)
+
+
+@lru_cache(maxsize=10_000)
+def classify_domain(domain: str) -> str:
+    """Source type of a normalized citation domain."""
+    for source_type, matcher in _MATCHERS:
+        if matcher.search(domain):
+            return source_type
+    return "other"
+
+
+def classify_citation_url(url: str) -> str:
+    """Classify citation URL by source type based on its domain."""
+    return classify_domain(normalize_domain(url))
+
+
+def _citations(*where):
+    """Validated turns' citations as (debate_id, side, url, domain) rows."""
+    array = case(
+        (func.jsonb_typeof(Turn.citations) == "array", Turn.citations),
+        else_=literal_column("'[]'::jsonb"),
+    )
+    element = func.jsonb_array_elements(array).table_valued(column("value", JSONB), joins_implicitly=True)
+    url = element.c.value["url"].astext
+    return (
+        select(
+            Turn.debate_id,
+            DebateParticipant.side,
+            url.label("url"),
+            func.substring(func.lower(url), _HOST_PATTERN).label("domain"),
+        )
+        .select_from(Turn)
+        .join(DebateParticipant, and_(
+            Turn.agent_id == DebateParticipant.agent_id,
+            Turn.debate_id == DebateParticipant.debate_id,
+        ))
+        .join(element, literal_column("true"))
+        .where(Turn.status == "validated", *where)
+        .subquery("citations")
+    )
+
+
+async def debate_citation_stats(db: AsyncSession, debate_id: UUID) -> dict:
+    """Citations per side, unique sources and source types of a debate."""
+    citations = _citations(Turn.debate_id == debate_id, DebateParticipant.debate_id == debate_id)
+    result = await db.execute(
+        select(
+            citations.c.side,
+            citations.c.domain,
+            func.grouping(citations.c.domain).label("per_side"),
+            func.count().label("total"),
+            func.count(citations.c.url).label("with_url"),
+            func.count(distinct(citations.c.url)).label("unique_sources"),
+        ).group_by(func.grouping_sets(
+            tuple_(citations.c.side, citations.c.domain),
+            tuple_(citations.c.side),
+        ))
+    )
+
+    stats = {
+        side: {"total": 0, "unique_sources": 0, "source_types": dict.fromkeys(SOURCE_TYPES, 0)}
+        for side in ("pro", "con")
+    }
+    for side, domain, per_side, total, with_url, unique_sources in result.all():
+        if side not in stats:
+            continue
+        if per_side:
+            stats[side]["total"] = total
+            stats[side]["unique_sources"] = unique_sources
+        elif domain is not None:
+            stats[side]["source_types"][classify_domain(domain)] += with_url
+    return stats
+
+
+async def citation_report(db: AsyncSession, since: datetime | None = None, limit: int = 20) -> dict:
+    """Citation sources across debates: totals per source type and the most cited domains."""
+    where = [Turn.validated_at >= since] if since else []
+    citations = _citations(*where)
+    result = await db.execute(
+        select(
+            citations.c.domain,
+            func.count().label("citations"),
+            func.count(distinct(citations.c.debate_id)).label("debates"),
+        )
+        .where(citations.c.domain.is_not(None))
+        .group_by(citations.c.domain)
+        .order_by(func.count().desc(), citations.c.domain)
+    )
+
+    source_types = dict.fromkeys(SOURCE_TYPES, 0)
+    domains = []
+    for domain, count, debates in result.all():
+        source_type = classify_domain(domain)
+        source_types[source_type] += count
+        if len(domains) < limit:
+            domains.append({"domain": domain, "source_type": source_type, "citations": count, "debates": debates})
+    return {"total_citations": sum(source_types.values()), "source_types": source_types, "domains": domains}
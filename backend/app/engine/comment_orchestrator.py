@@ -4,228 +4,413 @@ import asyncio
 import hashlib
 import logging
 import random
+import re
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.middleware.content_filter import content_filter
-from app.models.factcheck import FactcheckRequest
+from app.agents.base import BaseDebateAgent, get_agent
+from app.config import settings
+from app.engine.factcheck_intake import factcheck_intake
+from app.middleware.content_filter import ContentViolationError, content_filter
+from app.models.agent import Agent
 from app.models.topic import Comment, Topic, TopicParticipant
 
 logger = logging.getLogger(__name__)
 
 
 class CommentOrchestrator:
-    """Orchestrates a free-form comment discussion on a topic."""
+    """Orchestrates a free-form comment discussion on a topic.
+
+    The shared TopicScheduler drives start/run_cycle/finish for every open topic.
+    """
 
     def __init__(self, topic_id: UUID, db_factory):
         self.topic_id = topic_id
         self.db_factory = db_factory
-
-    async def run(self):
-        """Run the comment orchestration loop."""
-        try:
-            await self._run_loop()
-        except Exception as e:
-            logger.error(f"Topic {self.topic_id} orchestrator failed: {e}", exc_info=True)
-            try:
-                async with self.db_factory() as db:
-                    result = await db.execute(select(Topic).where(Topic.id == self.topic_id))
-                    topic = result.scalar_one()
-                    topic.status = "closed"
-                    topic.closed_at = datetime.now(timezone.utc)
-                    await db.commit()
-            except Exception:
-                logger.error(f"Failed to mark topic {self.topic_id} as closed", exc_info=True)
-
-    async def _run_loop(self):
-        """Internal orchestration loop."""
-        from app.agents.base import get_agent
-        from app.engine.live_event_bus import event_bus
-
+        self._agents: dict[UUID, BaseDebateAgent] = {}  # agent id -> implementation (one client per topic)
+        # Comment context kept in memory; only comments newer than the cursor are fetched
+        self._comments: list[dict] = []
+        self._comment_ids: set[str] = set()
+        self._comments_cursor: datetime | None = None
+        self._agent_names: dict[str, str] = {}
+        self._topic: Topic | None = None
+        self._participants: list[TopicParticipant] = []
+        # Adaptive polling: agents that keep skipping are polled less often
+        self._cycle = 0
+        self._skip_streaks: dict[UUID, int] = {}
+        self._next_poll_cycle: dict[UUID, int] = {}
+        self._wake_scan_from: dict[UUID, int] = {}  # agent id -> first comment index not yet checked
+        self._comment_ids_by_agent: dict[str, set[str]] = {}
+        self._stances: dict[str, str] = {}  # agent id -> stance of its latest comment
+        self._stance_change_ids: set[str] = set()  # comments whose author changed stance
+        self._mention_patterns: dict[str, re.Pattern] = {}
+
+    async def start(self) -> int | None:
+        """Load the topic and its participants. Returns the polling interval, or None if not found."""
         async with self.db_factory() as db:
             topic = await self._load_topic(db)
             if not topic:
                 logger.error(f"Topic {self.topic_id} not found")
-                return
+                return None
 
-            polling_interval = topic.polling_interval_seconds
+            # Participants and their comment counters are tracked locally from here on
+            self._topic = topic
+            self._participants = list(topic.participants)
+            self._agent_names = {str(p.agent_id): p.agent.name for p in self._participants}
             logger.info(
-                f"Starting topic '{topic.title}' with {len(topic.participants)} participants, "
-                f"polling every {polling_interval}s"
+                f"Starting topic '{topic.title}' with {len(self._participants)} participants, "
+                f"polling every {topic.polling_interval_seconds}s"
             )
+            return topic.polling_interval_seconds
+
+    async def run_cycle(self) -> bool:
+        """Run one polling cycle. Returns False once the topic has closed."""
+        # Pick up comments added since the last cycle and the agents' current status
+        async with self.db_factory() as db:
+            await self._load_new_comments(db)
+            await self._refresh_participants(db)
 
-        while True:
-            # Check if topic should close (time expired)
+        # Check if all agents hit max comments
+        if all(p.comment_count >= p.max_comments for p in self._participants):
             async with self.db_factory() as db:
                 result = await db.execute(select(Topic).where(Topic.id == self.topic_id))
                 topic = result.scalar_one()
+                await self._close_topic(db, topic, "All agents reached comment limit")
+            return False
+
+        # Poll agents concurrently (shuffled order); comments are committed as they arrive
+        self._cycle += 1
+        eligible = [
+            p for p in self._participants
+            if p.comment_count < p.max_comments and _pollable(p.agent) and self._poll_due(p)
+        ]
+        random.shuffle(eligible)
+        counts_before = {p.agent_id: p.comment_count for p in eligible}
+        skipped = await self._poll_cycle(self._topic, eligible, self._comments)
+        for participant in skipped:
+            if participant.comment_count == counts_before[participant.agent_id]:
+                self._back_off(participant)
+        return True
+
+    def _poll_due(self, participant: TopicParticipant) -> bool:
+        """Whether a participant should be polled this cycle.
+
+        After n consecutive skips an agent sits out 2^(n-1) - 1 cycles (capped).
+        It is woken early by a new comment that references one of its comments,
+        mentions it by name (as a whole word or ``@name``), or changes its
+        author's stance.
+        """
+        agent_id = participant.agent_id
+        if self._cycle >= self._next_poll_cycle.get(agent_id, 0):
+            return True
+
+        my_ids = self._comment_ids_by_agent.get(str(agent_id), set())
+        name = participant.agent.name
+        mentions = self._mention_pattern(name)
+        start = self._wake_scan_from.get(agent_id, 0)
+        self._wake_scan_from[agent_id] = len(self._comments)
+        for c in self._comments[start:]:
+            if c["agent_id"] == str(agent_id):
+                continue
+            if (
+                c["id"] in self._stance_change_ids
+                or mentions.search(c["content"])
+                or any(isinstance(r, dict) and r.get("comment_id") in my_ids for r in c["references"])
+            ):
+                logger.info(f"Agent {name} woken early by comment {c['id']}")
+                return True
+        return False
+
+    def _mention_pattern(self, name: str) -> re.Pattern:
+        pattern = self._mention_patterns.get(name)
+        if pattern is None:
+            escaped = re.escape(name)
+            # "@name" anywhere (e.g. followed by a Korean particle), otherwise only as a whole word
+            pattern = re.compile(rf"@{escaped}|(?<!\w){escaped}(?!\w)")
+            self._mention_patterns[name] = pattern
+        return pattern
+
+    def _back_off(self, participant: TopicParticipant):
+        streak = self._skip_streaks.get(participant.agent_id, 0) + 1
+        self._skip_streaks[participant.agent_id] = streak
+        wait = min(2 ** (streak - 1), settings.comment_skip_backoff_max_cycles)
+        self._next_poll_cycle[participant.agent_id] = self._cycle + wait
+        self._wake_scan_from[participant.agent_id] = len(self._comments)
+
+    async def finish(self):
+        """Release agent clients and announce the topic has closed."""
+        from app.engine.live_event_bus import event_bus
 
-                if topic.status != "open":
-                    logger.info(f"Topic '{topic.title}' is no longer open (status={topic.status})")
-                    break
+        await self._close_agents()
+        factcheck_intake.forget("topic", self.topic_id)
+        await event_bus.publish(self.topic_id, {
+            "type": "topic_closed",
+            "data": {"topic_id": str(self.topic_id)},
+        })
 
-                now = datetime.now(timezone.utc)
-                if topic.closes_at and now >= topic.closes_at.replace(tzinfo=timezone.utc if topic.closes_at.tzinfo is None else topic.closes_at.tzinfo):
-                    await self._close_topic(db, topic, "Time expired")
-                    break
+    async def release(self):
+        """Release agent clients when another process has taken the topic over."""
+        await self._close_agents()
+        factcheck_intake.forget("topic", self.topic_id)
 
-            # Load participants and existing comments
+    async def close_after_failure(self):
+        try:
             async with self.db_factory() as db:
-                participants = await db.execute(
-                    select(TopicParticipant)
-                    .where(TopicParticipant.topic_id == self.topic_id)
-                    .options(selectinload(TopicParticipant.agent))
-                )
-                participants = participants.scalars().all()
+                result = await db.execute(select(Topic).where(Topic.id == self.topic_id))
+                topic = result.scalar_one()
+                topic.status = "closed"
+                topic.closed_at = datetime.now(timezone.utc)
+                await db.commit()
+        except Exception:
+            logger.error(f"Failed to mark topic {self.topic_id} as closed", exc_info=True)
+
+    async def _poll_cycle(
+        self,
+        topic: Topic,
+        participants: list[TopicParticipant],
+        existing_comments: list[dict],
+    ) -> list[TopicParticipant]:
+        """Poll ``participants`` concurrently and commit their comments in arrival order.
+
+        Each agent sees the comments committed before its poll started. Agents
+        that skipped without seeing comments committed later in the cycle are
+        polled once more, with a short timeout, so they can respond to them.
+        Returns the participants that skipped their first poll.
+        """
+        semaphore = asyncio.Semaphore(settings.comment_polling_concurrency)
+
+        async def poll(participant: TopicParticipant, timeout: float):
+            async with semaphore:
+                snapshot = list(existing_comments)
+                comment_data, ok = await self._request_comment(topic, participant, snapshot, timeout)
+                return participant, len(snapshot), comment_data, ok
+
+        skipped = []
+        tasks = [asyncio.create_task(poll(p, settings.default_turn_timeout)) for p in participants]
+        for next_done in asyncio.as_completed(tasks):
+            participant, seen, comment_data, ok = await next_done
+            if comment_data is not None:
+                await self._commit_comment(participant, comment_data, existing_comments)
+            elif ok:
+                skipped.append((participant, seen))
+
+        # Second chance: skipped agents that missed comments arriving after their poll started
+        second_chance = [
+            p for p, seen in skipped
+            if len(existing_comments) > seen and p.comment_count < p.max_comments
+        ]
+        if not second_chance:
+            return [p for p, _ in skipped]
+        timeout = min(settings.comment_second_chance_seconds, settings.default_turn_timeout)
+        tasks = [asyncio.create_task(poll(p, timeout)) for p in second_chance]
+        for next_done in asyncio.as_completed(tasks):
+            participant, _, comment_data, _ = await next_done
+            if comment_data is not None:
+                await self._commit_comment(participant, comment_data, existing_comments)
+        return [p for p, _ in skipped]
+
+    async def _request_comment(
+        self,
+        topic: Topic,
+        participant: TopicParticipant,
+        existing_comments: list[dict],
+        timeout: float,
+    ) -> tuple[dict | None, bool]:
+        """Ask one agent for a comment. Returns (comment_data, ok); ok is False on failure or violation."""
+        agent = participant.agent
+        my_comments = [c for c in existing_comments if c["agent_id"] == str(agent.id)]
+        remaining = participant.max_comments - participant.comment_count
 
-                comments_result = await db.execute(
-                    select(Comment)
-                    .where(Comment.topic_id == self.topic_id)
-                    .options(selectinload(Comment.agent))
-                    .order_by(Comment.created_at)
+        try:
+            debate_agent = self._get_agent(participant)
+            comment_data = await asyncio.wait_for(
+                debate_agent.generate_comment(
+                    topic_title=topic.title,
+                    topic_description=topic.description,
+                    existing_comments=existing_comments,
+                    my_previous_comments=my_comments,
+                    remaining_comments=remaining,
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Agent {agent.name} timed out")
+            return None, False
+        except ContentViolationError as e:
+            logger.warning(f"Agent {agent.name} content violation (stopped while streaming): {e.reason}")
+            return None, False
+        except Exception as e:
+            logger.error(f"Agent {agent.name} error: {e}", exc_info=True)
+            return None, False
+
+        if comment_data is None:
+            logger.info(f"Agent {agent.name} skipped this cycle")
+            return None, True
+
+        # Content filter check
+        is_safe, violation_reason = content_filter.check_content(comment_data.get("content", ""))
+        if not is_safe:
+            logger.warning(f"Agent {agent.name} content violation: {violation_reason}")
+            return None, False
+        return comment_data, True
+
+    async def _commit_comment(self, participant: TopicParticipant, comment_data: dict, existing_comments: list[dict]):
+        """Save a comment, publish it and add it to the context for agents polled after it."""
+        from app.engine.live_event_bus import event_bus
+
+        agent = participant.agent
+        try:
+            async with self.db_factory() as db:
+                comment = Comment(
+                    topic_id=self.topic_id,
+                    agent_id=agent.id,
+                    content=comment_data["content"],
+                    references_=comment_data.get("references", []),
+                    citations=comment_data.get("citations", []),
+                    stance=comment_data.get("stance"),
+                    token_count=comment_data.get("token_count"),
                 )
-                all_comments = comments_result.scalars().all()
-
-            # Build comment context for agents
-            existing_comments = [
-                {
-                    "id": str(c.id),
-                    "agent_id": str(c.agent_id),
-                    "agent_name": c.agent.name if c.agent else "Unknown",
-                    "content": c.content,
-                    "references": c.references_ or [],
-                    "citations": c.citations or [],
-                    "stance": c.stance,
-                    "created_at": str(c.created_at),
-                }
-                for c in all_comments
-            ]
-
-            # Check if all agents hit max comments
-            all_maxed = all(p.comment_count >= p.max_comments for p in participants)
-            if all_maxed:
-                async with self.db_factory() as db:
-                    result = await db.execute(select(Topic).where(Topic.id == self.topic_id))
-                    topic = result.scalar_one()
-                    await self._close_topic(db, topic, "All agents reached comment limit")
-                break
-
-            # Poll each agent (shuffled order)
-            shuffled_participants = list(participants)
-            random.shuffle(shuffled_participants)
-
-            for participant in shuffled_participants:
-                if participant.comment_count >= participant.max_comments:
-                    continue
-
-                agent = participant.agent
-                my_comments = [c for c in existing_comments if c["agent_id"] == str(agent.id)]
-                remaining = participant.max_comments - participant.comment_count
-
-                try:
-                    debate_agent = get_agent(agent, side="")
-                    comment_data = await asyncio.wait_for(
-                        debate_agent.generate_comment(
-                            topic_title=topic.title,
-                            topic_description=topic.description,
-                            existing_comments=existing_comments,
-                            my_previous_comments=my_comments,
-                            remaining_comments=remaining,
-                        ),
-                        timeout=120,
+                db.add(comment)
+
+                # Increment participant and topic comment counts
+                await db.execute(
+                    update(TopicParticipant)
+                    .where(
+                        TopicParticipant.topic_id == self.topic_id,
+                        TopicParticipant.agent_id == agent.id,
                     )
+                    .values(comment_count=TopicParticipant.comment_count + 1)
+                )
+                await db.execute(
+                    update(Topic)
+                    .where(Topic.id == self.topic_id)
+                    .values(comment_count=Topic.comment_count + 1)
+                )
 
-                    if comment_data is None:
-                        logger.info(f"Agent {agent.name} skipped this cycle")
-                        await asyncio.sleep(2)
-                        continue
+                await db.commit()
+                await db.refresh(comment)
 
-                    # Content filter check
-                    is_safe, violation_reason = content_filter.check_content(
-                        comment_data.get("content", "")
-                    )
-                    if not is_safe:
-                        logger.warning(f"Agent {agent.name} content violation: {violation_reason}")
-                        await asyncio.sleep(2)
-                        continue
-
-                    # Save comment
-                    async with self.db_factory() as db:
-                        comment = Comment(
-                            topic_id=self.topic_id,
-                            agent_id=agent.id,
-                            content=comment_data["content"],
-                            references_=comment_data.get("references", []),
-                            citations=comment_data.get("citations", []),
-                            stance=comment_data.get("stance"),
-                            token_count=comment_data.get("token_count"),
-                        )
-                        db.add(comment)
-
-                        # Increment participant comment count
-                        part_result = await db.execute(
-                            select(TopicParticipant).where(
-                                TopicParticipant.topic_id == self.topic_id,
-                                TopicParticipant.agent_id == agent.id,
-                            )
-                        )
-                        db_participant = part_result.scalar_one()
-                        db_participant.comment_count += 1
-
-                        await db.commit()
-                        await db.refresh(comment)
-
-                        comment_id = comment.id
-
-                    # Publish event for realtime
-                    await event_bus.publish(self.topic_id, {
-                        "type": "new_comment",
-                        "data": {
-                            "comment_id": str(comment_id),
-                            "agent_id": str(agent.id),
-                            "agent_name": agent.name,
-                        },
-                    })
-
-                    # Add to context for subsequent agents in this cycle
-                    existing_comments.append({
-                        "id": str(comment_id),
-                        "agent_id": str(agent.id),
-                        "agent_name": agent.name,
-                        "content": comment_data["content"],
-                        "references": comment_data.get("references", []),
-                        "citations": comment_data.get("citations", []),
-                        "stance": comment_data.get("stance"),
-                        "created_at": str(datetime.now(timezone.utc)),
-                    })
-
-                    # Auto-factcheck
-                    await self._auto_factcheck(comment_id, comment_data)
-
-                    logger.info(f"Agent {agent.name} commented on topic {self.topic_id}")
-
-                except asyncio.TimeoutError:
-                    logger.warning(f"Agent {agent.name} timed out")
-                except Exception as e:
-                    logger.error(f"Agent {agent.name} error: {e}", exc_info=True)
-
-                # Small delay between agents
-                await asyncio.sleep(5)
-
-            # Sleep before next polling cycle
-            await asyncio.sleep(polling_interval)
-
-        # Publish topic closed event
-        from app.engine.live_event_bus import event_bus
+                comment_id = comment.id
+        except Exception as e:
+            logger.error(f"Failed to save comment from {agent.name}: {e}", exc_info=True)
+            return
+        participant.comment_count += 1
+
+        # Publish event for realtime
         await event_bus.publish(self.topic_id, {
-            "type": "topic_closed",
-            "data": {"topic_id": str(self.topic_id)},
+            "type": "new_comment",
+            "data": {
+                "comment_id": str(comment_id),
+                "agent_id": str(agent.id),
+                "agent_name": agent.name,
+            },
         })
 
+        self._add_comment(existing_comments, self._comment_context(comment))
+        self._skip_streaks.pop(agent.id, None)
+        self._next_poll_cycle.pop(agent.id, None)
+        if self._comments_cursor is None or comment.created_at > self._comments_cursor:
+            self._comments_cursor = comment.created_at
+
+        # Auto-factcheck
+        self._auto_factcheck(comment_id, comment_data)
+
+        logger.info(f"Agent {agent.name} commented on topic {self.topic_id}")
+
+    async def _load_new_comments(self, db: AsyncSession):
+        """Append comments created since the last load to the in-memory context.
+
+        Uses idx_comments_created (topic_id, created_at). The cursor is inclusive
+        so comments sharing the last timestamp are not missed; ids dedupe them.
+        """
+        query = select(Comment).where(Comment.topic_id == self.topic_id).order_by(Comment.created_at)
+        if self._comments_cursor is not None:
+            query = query.where(Comment.created_at >= self._comments_cursor)
+        result = await db.execute(query)
+        for comment in result.scalars().all():
+            self._comments_cursor = comment.created_at
+            if str(comment.id) in self._comment_ids:
+                continue
+            self._add_comment(self._comments, self._comment_context(comment))
+
+    async def _refresh_participants(self, db: AsyncSession):
+        """Re-read the participants' comment counters and agent status.
+
+        An agent suspended mid-topic is not polled and its cached implementation
+        is closed; a new one is created if the agent is reactivated.
+        """
+        result = await db.execute(
+            select(TopicParticipant.agent_id, TopicParticipant.comment_count, Agent.status)
+            .join(Agent, Agent.id == TopicParticipant.agent_id)
+            .where(TopicParticipant.topic_id == self.topic_id)
+        )
+        current = {agent_id: (comment_count, status) for agent_id, comment_count, status in result.all()}
+        participants = []
+        for participant in self._participants:
+            row = current.get(participant.agent_id)
+            if row is None:
+                # Left the topic
+                await self._drop_agent(participant.agent_id)
+                continue
+            participant.comment_count, participant.agent.status = row
+            if not _pollable(participant.agent):
+                await self._drop_agent(participant.agent_id)
+            participants.append(participant)
+        self._participants = participants
+
+    async def _drop_agent(self, agent_id: UUID):
+        debate_agent = self._agents.pop(agent_id, None)
+        if debate_agent is None:
+            return
+        logger.info(f"Agent {debate_agent.agent.name} is no longer active on topic {self.topic_id}")
+        try:
+            await debate_agent.close()
+        except Exception:
+            logger.warning(f"Failed to close agent client for topic {self.topic_id}", exc_info=True)
+
+    def _add_comment(self, comments: list[dict], context: dict):
+        comments.append(context)
+        self._comment_ids.add(context["id"])
+        self._comment_ids_by_agent.setdefault(context["agent_id"], set()).add(context["id"])
+        stance = context.get("stance")
+        if stance:
+            previous = self._stances.get(context["agent_id"])
+            if previous is not None and previous != stance:
+                self._stance_change_ids.add(context["id"])
+            self._stances[context["agent_id"]] = stance
+
+    def _comment_context(self, comment: Comment) -> dict:
+        return {
+            "id": str(comment.id),
+            "agent_id": str(comment.agent_id),
+            "agent_name": self._agent_names.get(str(comment.agent_id), "Unknown"),
+            "content": comment.content,
+            "references": comment.references_ or [],
+            "citations": comment.citations or [],
+            "stance": comment.stance,
+            "created_at": str(comment.created_at),
+        }
+
+    def _get_agent(self, participant: TopicParticipant) -> BaseDebateAgent:
+        """Return the participant's agent implementation, created once per topic."""
+        debate_agent = self._agents.get(participant.agent_id)
+        if debate_agent is None:
+            debate_agent = get_agent(participant.agent, side="")
+            self._agents[participant.agent_id] = debate_agent
+        return debate_agent
+
+    async def _close_agents(self):
+        for debate_agent in self._agents.values():
+            try:
+                await debate_agent.close()
+            except Exception:
+                logger.warning(f"Failed to close agent client for topic {self.topic_id}", exc_info=True)
+        self._agents.clear()
+
     async def _load_topic(self, db: AsyncSession) -> Topic | None:
         result = await db.execute(
             select(Topic)
@@ -240,39 +425,17 @@ class CommentOrchestrator:
         await db.commit()
         logger.info(f"Topic '{topic.title}' closed: {reason}")
 
-    async def _auto_factcheck(self, comment_id: UUID, comment_data: dict):
-        """Automatically enqueue a factcheck for a comment with citations."""
-        from app.engine.factcheck_worker import factcheck_worker
-
-        try:
-            citations = comment_data.get("citations", [])
-            if not citations:
-                return
-
-            content = comment_data.get("content", "")
-            claim_hash = hashlib.sha256(content.encode()).hexdigest()[:64]
+    def _auto_factcheck(self, comment_id: UUID, comment_data: dict):
+        """Queue a factcheck for a comment with citations (deduplicated per topic, inserted in batches)."""
+        if not comment_data.get("citations", []):
+            return
 
-            async with self.db_factory() as db:
-                existing = await db.execute(
-                    select(FactcheckRequest).where(
-                        FactcheckRequest.topic_id == self.topic_id,
-                        FactcheckRequest.claim_hash == claim_hash,
-                    )
-                )
-                if existing.scalar_one_or_none():
-                    return
+        content = comment_data.get("content", "")
+        claim_hash = hashlib.sha256(content.encode()).hexdigest()[:64]
+        if factcheck_intake.submit_comment(self.topic_id, comment_id, claim_hash):
+            logger.info(f"Auto-factcheck queued for comment {comment_id}")
 
-                fc_request = FactcheckRequest(
-                    comment_id=comment_id,
-                    topic_id=self.topic_id,
-                    claim_hash=claim_hash,
-                    session_id="auto",
-                )
-                db.add(fc_request)
-                await db.commit()
-                await db.refresh(fc_request)
 
-            await factcheck_worker.enqueue(str(fc_request.id))
-            logger.info(f"Auto-factcheck enqueued for comment {comment_id}")
-        except Exception:
-            logger.exception(f"Failed to enqueue auto-factcheck for comment {comment_id}")
+def _pollable(agent: Agent) -> bool:
+    """Whether an agent can be polled (external agents only while active, as in get_agent)."""
+    return agent.is_builtin or agent.status == "active"
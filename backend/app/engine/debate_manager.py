@@ -3,40 +3,46 @@
 import asyncio
 import hashlib
 import logging
+import time
 from datetime import datetime, timezone
 from uuid import UUID
 
-import tiktoken
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app import tokenizer
+from app.agents.base import BaseDebateAgent, get_agent
 from app.config import settings
-from app.middleware.content_filter import content_filter
+from app.engine.debate_slots import MAX_CONCURRENT_DEBATES, acquire_debate_slot, release_debate_slot
+from app.engine.factcheck_intake import factcheck_intake
+from app.engine.latency_tracker import AgentLatency, load_agent_latencies, record_turn_failure, record_turn_latency
+from app.engine.sentiment_scorer import sentiment_scorer
+from app.middleware.content_filter import ContentViolationError, content_filter
 from app.models.agent import Agent
 from app.models.debate import Debate, DebateParticipant, Turn
-from app.models.factcheck import FactcheckRequest
 
 logger = logging.getLogger(__name__)
 
-# Cache tiktoken encoding
-_TIKTOKEN_ENCODING = None
-
-
-def _get_tiktoken_encoding():
-    """Get cached tiktoken encoding."""
-    global _TIKTOKEN_ENCODING
-    if _TIKTOKEN_ENCODING is None:
-        _TIKTOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
-    return _TIKTOKEN_ENCODING
-
-
 class DebateManager:
     """Orchestrates a debate from start to completion."""
 
-    def __init__(self, debate_id: UUID, db_factory):
+    def __init__(self, debate_id: UUID, db_factory, auto_factcheck: bool = True, claimed_slots: set[UUID] | None = None):
         self.debate_id = debate_id
         self.db_factory = db_factory  # async_session factory
+        self.auto_factcheck = auto_factcheck
+        # External agents holding a debate slot; slots claimed by the caller are released with ours
+        self._slot_agent_ids: set[UUID] = set(claimed_slots or ())
+        self._over_limit_agent_ids: set[UUID] = set()  # external agents denied a slot
+        self._agents: dict[UUID, BaseDebateAgent] = {}  # participant id -> agent (one client per debate)
+        self._transcript: list[Turn] = []  # validated turns, in order
+        self._closing_agents: list[BaseDebateAgent] = []
+        self._latencies: dict[UUID, AgentLatency] = {}  # agent id -> latency history
+
+    @property
+    def transcript(self) -> list[Turn]:
+        """Validated turns of this debate so far, in turn order."""
+        return list(self._transcript)
 
     async def run(self):
         """Run the full debate loop."""
@@ -53,10 +59,13 @@ class DebateManager:
                     await db.commit()
             except Exception:
                 logger.error(f"Failed to mark debate {self.debate_id} as failed", exc_info=True)
+        finally:
+            await self._close_agents()
+            await self._release_debate_slots()
+            factcheck_intake.forget("debate", self.debate_id)
 
     async def _run_debate(self):
         """Internal debate loop."""
-        from app.agents.base import get_agent
         from app.engine.live_event_bus import event_bus
 
         async with self.db_factory() as db:
@@ -67,8 +76,12 @@ class DebateManager:
 
             is_live = debate.mode == "live"
             participants = sorted(debate.participants, key=lambda p: p.turn_order)
+            self._latencies = await load_agent_latencies(db, [p.agent for p in participants])
             logger.info(f"Starting debate '{debate.topic}' with {len(participants)} participants, {debate.max_turns} turns")
 
+        # Claim concurrent debate slots for external agents once, up front
+        await self._acquire_debate_slots(participants)
+
         for turn_number in range(1, debate.max_turns + 1):
             # Determine whose turn it is (round-robin)
             participant = participants[(turn_number - 1) % len(participants)]
@@ -87,21 +100,8 @@ class DebateManager:
                 await db.refresh(turn)
                 turn_id = turn.id
 
-                # Load agent info and previous turns for context
-                agent_result = await db.execute(
-                    select(DebateParticipant)
-                    .where(DebateParticipant.id == participant.id)
-                    .options(selectinload(DebateParticipant.agent))
-                )
-                participant_with_agent = agent_result.scalar_one()
-                agent = participant_with_agent.agent
-
-                prev_turns = await db.execute(
-                    select(Turn)
-                    .where(Turn.debate_id == self.debate_id, Turn.status == "validated")
-                    .order_by(Turn.turn_number)
-                )
-                previous_turns = prev_turns.scalars().all()
+            agent = participant.agent
+            previous_turns = list(self._transcript)
 
             # Publish turn_start event for live mode
             if is_live:
@@ -115,47 +115,44 @@ class DebateManager:
                     },
                 })
 
-            # Check concurrent debate limit for external agents
-            if not agent.is_builtin:
+            # Skip external agents that were denied a debate slot at start
+            if participant.agent_id in self._over_limit_agent_ids:
                 async with self.db_factory() as db:
-                    concurrent_count = await db.execute(
-                        select(DebateParticipant)
-                        .join(Debate, DebateParticipant.debate_id == Debate.id)
-                        .where(
-                            DebateParticipant.agent_id == agent.id,
-                            Debate.status == "in_progress",
-                            Debate.id != self.debate_id,
-                        )
-                    )
-                    active_debates = len(concurrent_count.scalars().all())
-                if active_debates >= 3:
-                    async with self.db_factory() as db:
-                        await self._error_turn(db, turn_id, "Concurrent debate limit exceeded (max 3)")
-                        await self._update_current_turn(db, self.debate_id, turn_number)
-                    logger.warning(f"Turn {turn_number}: {agent.name} skipped - concurrent debate limit exceeded")
-                    if turn_number < debate.max_turns:
-                        await asyncio.sleep(debate.turn_cooldown_seconds)
-                    continue
-
-            # Get agent response with timeout
+                    await self._error_turn(db, turn_id, f"Concurrent debate limit exceeded (max {MAX_CONCURRENT_DEBATES})")
+                    await self._update_current_turn(db, self.debate_id, turn_number)
+                logger.warning(f"Turn {turn_number}: {agent.name} skipped - concurrent debate limit exceeded")
+                if turn_number < debate.max_turns:
+                    await asyncio.sleep(debate.turn_cooldown_seconds)
+                continue
+
+            # Get agent response with a timeout adapted to the agent's latency history
+            latency = self._latencies[participant.agent_id]
+            turn_timeout = latency.timeout(debate.turn_timeout_seconds)
+            started = time.monotonic()
             try:
-                debate_agent = get_agent(agent, participant.side)
-                turn_data = await asyncio.wait_for(
-                    debate_agent.generate_turn(
-                        topic=debate.topic,
-                        side=participant.side,
-                        previous_turns=previous_turns,
-                        turn_number=turn_number,
-                        team_id=participant.team_id,
-                        max_turns=debate.max_turns,
-                    ),
-                    timeout=debate.turn_timeout_seconds,
-                )
+                debate_agent = self._get_debate_agent(participant, is_live)
+                debate_agent.timeout_seconds = turn_timeout
+                try:
+                    turn_data = await asyncio.wait_for(
+                        debate_agent.generate_turn(
+                            topic=debate.topic,
+                            side=participant.side,
+                            previous_turns=previous_turns,
+                            turn_number=turn_number,
+                            team_id=participant.team_id,
+                            max_turns=debate.max_turns,
+                        ),
+                        timeout=turn_timeout,
+                    )
+                    # Content filter check
+                    is_safe, violation_reason = content_filter.check_content(
+                        turn_data.get("argument", "")
+                    )
+                except ContentViolationError as e:
+                    # Caught while streaming; the rest of the generation was cancelled
+                    is_safe, violation_reason = False, e.reason
+                elapsed = time.monotonic() - started
 
-                # Content filter check
-                is_safe, violation_reason = content_filter.check_content(
-                    turn_data.get("argument", "")
-                )
                 if not is_safe:
                     async with self.db_factory() as db:
                         await self._content_violation_turn(db, turn_id, violation_reason)
@@ -165,6 +162,7 @@ class DebateManager:
                         db_agent = agent_result2.scalar_one()
                         db_agent.status = "suspended"
                         await db.commit()
+                    self._suspend_local_agent(participant.agent_id)
                     logger.warning(f"Turn {turn_number}: {agent.name} content violation: {violation_reason}")
                     if turn_number < debate.max_turns:
                         await asyncio.sleep(debate.turn_cooldown_seconds)
@@ -172,11 +170,16 @@ class DebateManager:
 
                 # Validate and save turn
                 async with self.db_factory() as db:
-                    await self._save_turn(db, turn_id, turn_data)
+                    saved_turn = await self._save_turn(db, turn_id, turn_data)
                     await self._update_current_turn(db, self.debate_id, turn_number)
+                    await record_turn_latency(db, participant.agent_id, elapsed)
+                latency.observe(elapsed)
+                self._transcript.append(saved_turn)
+                sentiment_scorer.submit(saved_turn)
 
                 # Auto-factcheck: enqueue for background verification
-                await self._auto_factcheck(turn_id, turn_data)
+                if self.auto_factcheck:
+                    self._auto_factcheck(turn_id, turn_data)
 
                 logger.info(f"Turn {turn_number}: {agent.name} ({participant.side}) - {turn_data.get('stance', 'unknown')}")
 
@@ -199,13 +202,17 @@ class DebateManager:
                 async with self.db_factory() as db:
                     await self._timeout_turn(db, turn_id)
                     await self._update_current_turn(db, self.debate_id, turn_number)
-                logger.warning(f"Turn {turn_number}: {agent.name} timed out")
+                    await record_turn_failure(db, participant.agent_id, timed_out_after=turn_timeout)
+                latency.fail(timed_out_after=turn_timeout)
+                logger.warning(f"Turn {turn_number}: {agent.name} timed out after {turn_timeout:.0f}s")
 
             except Exception as e:
                 logger.error(f"Turn {turn_number}: {agent.name} error: {e}", exc_info=True)
                 async with self.db_factory() as db:
                     await self._error_turn(db, turn_id, str(e))
                     await self._update_current_turn(db, self.debate_id, turn_number)
+                    await record_turn_failure(db, participant.agent_id)
+                latency.fail()
 
             # Cooldown between turns
             if turn_number < debate.max_turns:
@@ -238,11 +245,55 @@ class DebateManager:
         result = await db.execute(
             select(Debate)
             .where(Debate.id == self.debate_id)
-            .options(selectinload(Debate.participants))
+            .options(selectinload(Debate.participants).selectinload(DebateParticipant.agent))
         )
         return result.scalar_one_or_none()
 
-    async def _save_turn(self, db: AsyncSession, turn_id: UUID, data: dict):
+    async def _acquire_debate_slots(self, participants: list[DebateParticipant]):
+        """Claim one slot per distinct external agent not holding one yet; remember who was denied."""
+        external_ids = {p.agent_id for p in participants if p.agent and not p.agent.is_builtin} - self._slot_agent_ids
+        for agent_id in external_ids:
+            async with self.db_factory() as db:
+                if await acquire_debate_slot(db, agent_id):
+                    self._slot_agent_ids.add(agent_id)
+                else:
+                    self._over_limit_agent_ids.add(agent_id)
+
+    async def _release_debate_slots(self):
+        while self._slot_agent_ids:
+            agent_id = self._slot_agent_ids.pop()
+            try:
+                async with self.db_factory() as db:
+                    await release_debate_slot(db, agent_id)
+            except Exception:
+                logger.error(f"Failed to release debate slot for agent {agent_id}", exc_info=True)
+
+    def _get_debate_agent(self, participant: DebateParticipant, is_live: bool) -> BaseDebateAgent:
+        """Return the participant's agent implementation, created once per debate."""
+        debate_agent = self._agents.get(participant.id)
+        if debate_agent is None:
+            debate_agent = get_agent(participant.agent, participant.side, live=is_live)
+            self._agents[participant.id] = debate_agent
+        return debate_agent
+
+    def _suspend_local_agent(self, agent_id: UUID):
+        """Mirror a suspension locally so later turns of this debate fail fast."""
+        for participant_id, debate_agent in list(self._agents.items()):
+            if debate_agent.agent.id == agent_id:
+                debate_agent.agent.status = "suspended"
+                del self._agents[participant_id]
+                self._closing_agents.append(debate_agent)
+
+    async def _close_agents(self):
+        for debate_agent in [*self._agents.values(), *self._closing_agents]:
+            try:
+                await debate_agent.close()
+            except Exception:
+                logger.warning(f"Failed to close agent client for debate {self.debate_id}", exc_info=True)
+        self._agents.clear()
+        self._closing_agents.clear()
+
+    async def _save_turn(self, db: AsyncSession, turn_id: UUID, data: dict) -> Turn:
         result = await db.execute(select(Turn).where(Turn.id == turn_id))
         turn = result.scalar_one()
         turn.stance = data.get("stance")
@@ -253,11 +304,10 @@ class DebateManager:
         # Enforce 500 token limit - truncate if exceeded
         if token_count > 500:
             try:
-                encoding = _get_tiktoken_encoding()
-                tokens = encoding.encode(argument)
+                # Usually a cache hit: the agent already encoded this argument to count it
+                tokens = await tokenizer.encode(argument)
                 if len(tokens) > 500:
-                    truncated_tokens = tokens[:500]
-                    argument = encoding.decode(truncated_tokens)
+                    argument = tokenizer.decode(tokens[:500])
                     token_count = 500
                     logger.warning(
                         f"Turn {turn.turn_number} exceeded 500 token limit "
@@ -282,6 +332,7 @@ class DebateManager:
         turn.submitted_at = datetime.now(timezone.utc)
         turn.validated_at = datetime.now(timezone.utc)
         await db.commit()
+        return turn
 
     async def _timeout_turn(self, db: AsyncSession, turn_id: UUID):
         result = await db.execute(select(Turn).where(Turn.id == turn_id))
@@ -312,39 +363,12 @@ class DebateManager:
         turn.rebuttal_target_id = None
         await db.commit()
 
-    async def _auto_factcheck(self, turn_id: UUID, turn_data: dict):
-        """Automatically enqueue a factcheck for every validated turn."""
-        from app.engine.factcheck_worker import factcheck_worker
-
-        try:
-            claim_text = (turn_data.get("claim") or "") + (turn_data.get("argument") or "")
-            claim_hash = hashlib.sha256(claim_text.encode()).hexdigest()[:64]
-
-            async with self.db_factory() as db:
-                # Dedup: skip if already requested for this claim in this debate
-                existing = await db.execute(
-                    select(FactcheckRequest).where(
-                        FactcheckRequest.debate_id == self.debate_id,
-                        FactcheckRequest.claim_hash == claim_hash,
-                    )
-                )
-                if existing.scalar_one_or_none():
-                    return
-
-                fc_request = FactcheckRequest(
-                    turn_id=turn_id,
-                    debate_id=self.debate_id,
-                    claim_hash=claim_hash,
-                    session_id="auto",
-                )
-                db.add(fc_request)
-                await db.commit()
-                await db.refresh(fc_request)
-
-            await factcheck_worker.enqueue(str(fc_request.id))
-            logger.info(f"Auto-factcheck enqueued for turn {turn_id}")
-        except Exception:
-            logger.exception(f"Failed to enqueue auto-factcheck for turn {turn_id}")
+    def _auto_factcheck(self, turn_id: UUID, turn_data: dict):
+        """Queue a factcheck for every validated turn (deduplicated per debate, inserted in batches)."""
+        claim_text = (turn_data.get("claim") or "") + (turn_data.get("argument") or "")
+        claim_hash = hashlib.sha256(claim_text.encode()).hexdigest()[:64]
+        if factcheck_intake.submit_turn(self.debate_id, turn_id, claim_hash):
+            logger.info(f"Auto-factcheck queued for turn {turn_id}")
 
     async def _update_current_turn(self, db: AsyncSession, debate_id: UUID, turn_number: int):
         result = await db.execute(select(Debate).where(Debate.id == debate_id))
@@ -0,0 +1,70 @@
+"""Per-agent concurrent debate slots for external agents.
+
+Each external agent carries an ``active_debate_count`` column. A debate claims a
+slot with a single conditional UPDATE when it starts and gives it back when it
+finishes, so the limit holds across processes without counting rows per turn.
+"""
+
+import logging
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.agent import Agent
+from app.models.debate import Debate, DebateParticipant
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_DEBATES = 3
+
+
+async def acquire_debate_slot(db: AsyncSession, agent_id: UUID) -> bool:
+    """Atomically claim a debate slot. Returns False if the agent is at the limit."""
+    result = await db.execute(
+        update(Agent)
+        .where(Agent.id == agent_id, Agent.active_debate_count < MAX_CONCURRENT_DEBATES)
+        .values(active_debate_count=Agent.active_debate_count + 1)
+        .returning(Agent.id)
+        .execution_options(synchronize_session=False)
+    )
+    acquired = result.scalar_one_or_none() is not None
+    await db.commit()
+    return acquired
+
+
+async def release_debate_slot(db: AsyncSession, agent_id: UUID):
+    """Give back a slot claimed with acquire_debate_slot."""
+    await db.execute(
+        update(Agent)
+        .where(Agent.id == agent_id, Agent.active_debate_count > 0)
+        .values(active_debate_count=Agent.active_debate_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def reconcile_debate_slots(db: AsyncSession):
+    """Recompute every external agent's counter from in-progress debates.
+
+    Repairs counters leaked by a process that died mid-debate.
+    """
+    active = (
+        select(func.count(DebateParticipant.debate_id.distinct()))
+        .join(Debate, Debate.id == DebateParticipant.debate_id)
+        .where(
+            DebateParticipant.agent_id == Agent.id,
+            Debate.status == "in_progress",
+            Debate.is_sandbox == False,
+        )
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Agent)
+        .where(Agent.is_builtin == False, Agent.active_debate_count != active)
+        .values(active_debate_count=active)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.info(f"Reconciled active debate count for {result.rowcount} agents")
@@ -0,0 +1,151 @@
+"""Buffered intake for automatic factcheck requests.
+
+Turns and comments with claims are deduplicated against an in-memory set of
+claim hashes per debate or topic and buffered. The buffer is flushed as one
+multi-row ``INSERT ... ON CONFLICT DO NOTHING RETURNING id``, with the unique
+(debate_id, claim_hash) / (topic_id, claim_hash) indexes as the backstop for
+anything the in-memory sets miss (other processes, restarts). Only the rows
+actually inserted are handed to the FactcheckWorker. Rows from a failed flush
+go back into the buffer (up to ``MAX_PENDING``) and are retried.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import async_session
+from app.models.factcheck import FactcheckRequest
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+FLUSH_INTERVAL_SECONDS = 0.5
+# Debates/topics whose claim hashes are remembered; older scopes fall back to the unique index
+MAX_SCOPES = 10_000
+# Buffered rows kept while inserts fail; the oldest beyond this are dropped
+MAX_PENDING = 10_000
+
+
+class FactcheckIntake:
+    def __init__(self, db_factory):
+        self.db_factory = db_factory
+        self._seen: OrderedDict[tuple[str, UUID], set[str]] = OrderedDict()
+        self._pending: list[dict] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start the background flush task."""
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info("FactcheckIntake started")
+
+    def submit_turn(self, debate_id: UUID, turn_id: UUID, claim_hash: str) -> bool:
+        """Buffer a factcheck for a turn. Returns False if the claim was already seen in this debate."""
+        if not self._first_sighting(("debate", debate_id), claim_hash):
+            return False
+        self._buffer({"turn_id": turn_id, "debate_id": debate_id, "claim_hash": claim_hash})
+        return True
+
+    def submit_comment(self, topic_id: UUID, comment_id: UUID, claim_hash: str) -> bool:
+        """Buffer a factcheck for a comment. Returns False if the claim was already seen in this topic."""
+        if not self._first_sighting(("topic", topic_id), claim_hash):
+            return False
+        self._buffer({"comment_id": comment_id, "topic_id": topic_id, "claim_hash": claim_hash})
+        return True
+
+    def forget(self, kind: str, scope_id: UUID):
+        """Drop the claim set of a finished debate ("debate") or topic ("topic")."""
+        self._seen.pop((kind, scope_id), None)
+
+    async def flush(self) -> list[UUID]:
+        """Insert everything buffered in one statement and enqueue the new requests."""
+        from app.engine.factcheck_worker import factcheck_worker
+
+        rows, self._pending = self._pending, []
+        if not rows:
+            return []
+
+        try:
+            async with self.db_factory() as db:
+                result = await db.execute(
+                    insert(FactcheckRequest)
+                    .values(rows)
+                    .on_conflict_do_nothing()
+                    .returning(FactcheckRequest.id)
+                )
+                inserted = list(result.scalars().all())
+                await db.commit()
+        except Exception:
+            logger.exception(f"Failed to insert {len(rows)} auto-factcheck requests")
+            self._requeue(rows)
+            return []
+
+        for request_id in inserted:
+            await factcheck_worker.enqueue(str(request_id))
+        if inserted:
+            logger.info(f"Auto-factcheck enqueued {len(inserted)} of {len(rows)} buffered claims")
+        return inserted
+
+    def _first_sighting(self, scope: tuple[str, UUID], claim_hash: str) -> bool:
+        hashes = self._seen.get(scope)
+        if hashes is None:
+            hashes = set()
+            self._seen[scope] = hashes
+            if len(self._seen) > MAX_SCOPES:
+                self._seen.popitem(last=False)
+        else:
+            self._seen.move_to_end(scope)
+        if claim_hash in hashes:
+            return False
+        hashes.add(claim_hash)
+        return True
+
+    def _requeue(self, rows: list[dict]):
+        """Put the rows of a failed flush back in front of the buffer, dropping the oldest beyond MAX_PENDING."""
+        self._pending = rows + self._pending
+        overflow = len(self._pending) - MAX_PENDING
+        if overflow <= 0:
+            return
+        dropped, self._pending = self._pending[:overflow], self._pending[overflow:]
+        for row in dropped:
+            # Forget the claim so it can be submitted again
+            scope = ("debate", row["debate_id"]) if row["turn_id"] is not None else ("topic", row["topic_id"])
+            self._seen.get(scope, set()).discard(row["claim_hash"])
+        logger.warning(f"Dropped {overflow} buffered auto-factcheck requests")
+
+    def _buffer(self, row: dict):
+        self._pending.append({
+            "id": uuid.uuid4(),
+            "session_id": "auto",
+            "status": "pending",
+            "request_count": 1,
+            "turn_id": None,
+            "debate_id": None,
+            "comment_id": None,
+            "topic_id": None,
+            **row,
+        })
+        if len(self._pending) >= BATCH_SIZE:
+            self._wakeup.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), FLUSH_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Error in factcheck intake loop")
+
+
+# Singleton instance
+factcheck_intake = FactcheckIntake(db_factory=async_session)
@@ -7,6 +7,7 @@ from sqlalchemy import select
 
 from app.agents.referee_agent import RefereeAgent
 from app.database import async_session
+from app.middleware.response_cache import response_cache
 from app.models.debate import Turn
 from app.models.factcheck import FactcheckRequest, FactcheckResult
 
@@ -121,6 +122,7 @@ class FactcheckWorker:
                     db.add(fc_result)
                     req.status = "completed"
                     await db.commit()
+                    _invalidate_cached_results(req)
                     return
 
                 # Run the referee agent
@@ -141,6 +143,7 @@ class FactcheckWorker:
                 db.add(fc_result)
                 req.status = "completed"
                 await db.commit()
+                _invalidate_cached_results(req)
 
                 logger.info(f"Factcheck {request_id} completed: {verification['verdict']}")
 
@@ -163,5 +166,10 @@ class FactcheckWorker:
         await self._referee.close()
 
 
+def _invalidate_cached_results(req: FactcheckRequest):
+    if req.debate_id:
+        response_cache.invalidate("debate_factchecks", req.debate_id)
+
+
 # Singleton instance
 factcheck_worker = FactcheckWorker()
@@ -0,0 +1,163 @@
+"""Per-agent turn latency histograms and adaptive turn timeouts.
+
+Every turn records its latency into a fixed, roughly logarithmic bucket of the
+agent's histogram (``agent_latency_buckets``). Turns that time out are recorded
+at the timeout they hit, a lower bound of their real latency, so the tail is
+not biased low by dropping the slowest turns. Counts are kept per period of
+``turn_latency_period_seconds`` and only the last ``turn_latency_periods``
+periods are read (older rows are pruned), so the histogram follows an agent
+whose latency changes. When a debate starts, each agent's timeout is the p99
+of that window times a margin, clamped to the configured range. Agents with too little history keep the debate's configured
+timeout. External agents that failed several turns in a row get a short
+fast-fail timeout, so a dead endpoint gives its debate slot back quickly.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.agent import Agent, AgentLatencyBucket
+
+logger = logging.getLogger(__name__)
+
+# Upper bound (seconds) of each histogram bucket; the last bucket is open-ended
+BUCKET_BOUNDS = (0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 240, 300)
+
+
+def current_period() -> int:
+    """Index of the histogram period that now falls in."""
+    return int(datetime.now(timezone.utc).timestamp() // settings.turn_latency_period_seconds)
+
+
+def bucket_for(latency: float) -> int:
+    for index, bound in enumerate(BUCKET_BOUNDS):
+        if latency <= bound:
+            return index
+    return len(BUCKET_BOUNDS)
+
+
+def percentile(counts: dict[int, int], q: float) -> float | None:
+    """Upper bound of the bucket holding the q-th quantile, or None without samples."""
+    total = sum(counts.values())
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for bucket in sorted(counts):
+        seen += counts[bucket]
+        if seen >= rank:
+            return BUCKET_BOUNDS[min(bucket, len(BUCKET_BOUNDS) - 1)]
+    return BUCKET_BOUNDS[-1]
+
+
+@dataclass
+class AgentLatency:
+    """An agent's histogram and failure streak, kept in memory for one debate."""
+
+    is_external: bool
+    counts: dict[int, int] = field(default_factory=dict)
+    consecutive_failures: int = 0
+    last_failure_at: datetime | None = None
+
+    def timeout(self, fallback: float) -> float:
+        if self.is_external and self._known_down():
+            return float(settings.turn_fast_fail_timeout)
+        if sum(self.counts.values()) < settings.turn_timeout_min_samples:
+            return float(fallback)
+        p99 = percentile(self.counts, 0.99)
+        return float(min(max(p99 * settings.turn_timeout_margin, settings.turn_timeout_min), settings.turn_timeout_max))
+
+    def observe(self, latency: float):
+        self._add(latency)
+        self.consecutive_failures = 0
+
+    def fail(self, timed_out_after: float | None = None):
+        if timed_out_after is not None:
+            self._add(timed_out_after)
+        self.consecutive_failures += 1
+        self.last_failure_at = datetime.now(timezone.utc)
+
+    def _add(self, latency: float):
+        bucket = bucket_for(latency)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+
+    def _known_down(self) -> bool:
+        if self.consecutive_failures < settings.turn_fast_fail_after or self.last_failure_at is None:
+            return False
+        last = self.last_failure_at
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - last < timedelta(seconds=settings.turn_fast_fail_window)
+
+
+async def load_agent_latencies(db: AsyncSession, agents: list[Agent]) -> dict[UUID, AgentLatency]:
+    """Load histograms for ``agents`` over the recent periods in one query."""
+    latencies = {
+        a.id: AgentLatency(
+            is_external=not a.is_builtin,
+            consecutive_failures=a.consecutive_turn_failures or 0,
+            last_failure_at=a.last_turn_failure_at,
+        )
+        for a in agents
+    }
+    result = await db.execute(
+        select(AgentLatencyBucket.agent_id, AgentLatencyBucket.bucket, func.sum(AgentLatencyBucket.count))
+        .where(
+            AgentLatencyBucket.agent_id.in_(list(latencies)),
+            AgentLatencyBucket.period > current_period() - settings.turn_latency_periods,
+        )
+        .group_by(AgentLatencyBucket.agent_id, AgentLatencyBucket.bucket)
+    )
+    for agent_id, bucket, count in result.all():
+        latencies[agent_id].counts[bucket] = int(count)
+    return latencies
+
+
+async def record_turn_latency(db: AsyncSession, agent_id: UUID, latency: float):
+    """Add one sample to the agent's histogram and end any failure streak."""
+    await _add_sample(db, agent_id, latency)
+    await db.execute(
+        update(Agent)
+        .where(Agent.id == agent_id, Agent.consecutive_turn_failures != 0)
+        .values(consecutive_turn_failures=0)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def record_turn_failure(db: AsyncSession, agent_id: UUID, timed_out_after: float | None = None):
+    """Extend the agent's failure streak after a timeout or error; a timeout is also recorded as a sample."""
+    if timed_out_after is not None:
+        await _add_sample(db, agent_id, timed_out_after)
+    await db.execute(
+        update(Agent)
+        .where(Agent.id == agent_id)
+        .values(
+            consecutive_turn_failures=Agent.consecutive_turn_failures + 1,
+            last_turn_failure_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def _add_sample(db: AsyncSession, agent_id: UUID, latency: float):
+    period = current_period()
+    stmt = insert(AgentLatencyBucket).values(agent_id=agent_id, period=period, bucket=bucket_for(latency), count=1)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[AgentLatencyBucket.agent_id, AgentLatencyBucket.period, AgentLatencyBucket.bucket],
+            set_={"count": AgentLatencyBucket.count + 1},
+        )
+    )
+    await db.execute(
+        delete(AgentLatencyBucket)
+        .where(AgentLatencyBucket.agent_id == agent_id, AgentLatencyBucket.period <= period - settings.turn_latency_periods)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,200 @@
+"""Write-behind ingestion of viewer reactions.
+
+Reactions are checked against in-memory sets of known turn ids per debate and
+comment ids per topic (loaded once per scope; a miss is looked up individually), buffered,
+and flushed as one multi-row ``INSERT ... ON CONFLICT DO NOTHING``. The unique
+(turn_id, session_id, type) / (comment_id, session_id, type) indexes keep
+repeated clicks idempotent across flushes and processes; repeats within one
+buffer window are collapsed before the insert. Rows from a failed flush go
+back into the buffer (up to ``MAX_PENDING``) and are retried.
+
+The same transaction adds the newly inserted reactions to the
+``reaction_counts`` rollup, and the updated counts are published as a
+``reaction_counts`` live event at most once per ``PUBLISH_INTERVAL_SECONDS``
+per debate/topic.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter, OrderedDict
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import async_session
+from app.engine.live_event_bus import event_bus
+from app.models.debate import Turn
+from app.models.reaction import Reaction, ReactionCount
+from app.models.topic import Comment
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+FLUSH_INTERVAL_SECONDS = 0.5
+PUBLISH_INTERVAL_SECONDS = 1.0
+# Debates/topics whose target ids are remembered (viewers keep reacting after they end);
+# least recently used scopes are reloaded on demand
+MAX_SCOPES = 1_000
+# Buffered reactions kept while inserts fail; the oldest beyond this are dropped
+MAX_PENDING = 50_000
+
+
+class ReactionIngest:
+    def __init__(self, db_factory):
+        self.db_factory = db_factory
+        self._known: OrderedDict[tuple[str, UUID], set[UUID]] = OrderedDict()
+        self._pending: dict[tuple, dict] = {}
+        # Debate/topic of each buffered turn/comment, for the rollup rows
+        self._scopes: dict[UUID, UUID] = {}
+        # Counts changed since the last live event, per debate/topic: {target_id: {type: count}}
+        self._changed: dict[UUID, dict[str, dict[str, int]]] = {}
+        self._published_at: dict[UUID, float] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start the background flush task."""
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info("ReactionIngest started")
+
+    async def submit_turn_reaction(self, debate_id: UUID, turn_id: UUID, type: str, session_id: str) -> bool:
+        """Buffer a reaction to a turn. Returns False if the turn is not in the debate."""
+        if not await self._is_known(("debate", debate_id), turn_id):
+            return False
+        self._buffer(debate_id, turn_id=turn_id, comment_id=None, type=type, session_id=session_id)
+        return True
+
+    async def submit_comment_reaction(self, topic_id: UUID, comment_id: UUID, type: str, session_id: str) -> bool:
+        """Buffer a reaction to a comment. Returns False if the comment is not in the topic."""
+        if not await self._is_known(("topic", topic_id), comment_id):
+            return False
+        self._buffer(topic_id, turn_id=None, comment_id=comment_id, type=type, session_id=session_id)
+        return True
+
+    async def flush(self) -> int:
+        """Insert everything buffered in one statement and roll it up. Returns the number of new reactions."""
+        rows, self._pending = list(self._pending.values()), {}
+        scopes, self._scopes = self._scopes, {}
+        if not rows:
+            return 0
+
+        try:
+            async with self.db_factory() as db:
+                result = await db.execute(
+                    insert(Reaction)
+                    .values(rows)
+                    .on_conflict_do_nothing()
+                    .returning(Reaction.turn_id, Reaction.comment_id, Reaction.type)
+                )
+                inserted = result.all()
+                counts = []
+                if inserted:
+                    # Only rows that were actually inserted count; repeats hit ON CONFLICT
+                    deltas = Counter((turn_id or comment_id, type) for turn_id, comment_id, type in inserted)
+                    stmt = insert(ReactionCount).values([
+                        {"target_id": target_id, "type": type, "scope_id": scopes[target_id], "count": delta}
+                        for (target_id, type), delta in deltas.items()
+                    ])
+                    result = await db.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[ReactionCount.target_id, ReactionCount.type],
+                            set_={"count": ReactionCount.count + stmt.excluded["count"]},
+                        ).returning(ReactionCount.scope_id, ReactionCount.target_id, ReactionCount.type, ReactionCount.count)
+                    )
+                    counts = result.all()
+                await db.commit()
+        except Exception:
+            logger.exception(f"Failed to insert {len(rows)} buffered reactions")
+            self._requeue(rows, scopes)
+            return 0
+
+        for scope_id, target_id, type, count in counts:
+            self._changed.setdefault(scope_id, {}).setdefault(str(target_id), {})[type] = count
+        return len(inserted)
+
+    async def publish_counts(self):
+        """Publish changed counts of each debate/topic not published within the interval."""
+        now = time.monotonic()
+        self._published_at = {
+            scope_id: at for scope_id, at in self._published_at.items() if now - at < PUBLISH_INTERVAL_SECONDS
+        }
+        for scope_id in [s for s in self._changed if s not in self._published_at]:
+            counts = self._changed.pop(scope_id)
+            self._published_at[scope_id] = now
+            await event_bus.publish(scope_id, {"type": "reaction_counts", "data": {"counts": counts}})
+
+    async def _is_known(self, scope: tuple[str, UUID], target_id: UUID) -> bool:
+        ids = self._known.get(scope)
+        if ids is None:
+            ids = await self._load(scope)
+            self._known[scope] = ids
+            if len(self._known) > MAX_SCOPES:
+                self._known.popitem(last=False)
+        else:
+            self._known.move_to_end(scope)
+        if target_id in ids:
+            return True
+
+        # Turns and comments are added while a debate or topic runs; look the miss up
+        if await self._load(scope, target_id):
+            ids.add(target_id)
+            return True
+        return False
+
+    async def _load(self, scope: tuple[str, UUID], target_id: UUID | None = None) -> set[UUID]:
+        kind, scope_id = scope
+        if kind == "debate":
+            query = select(Turn.id).where(Turn.debate_id == scope_id)
+            if target_id:
+                query = query.where(Turn.id == target_id)
+        else:
+            query = select(Comment.id).where(Comment.topic_id == scope_id)
+            if target_id:
+                query = query.where(Comment.id == target_id)
+        async with self.db_factory() as db:
+            result = await db.execute(query)
+            return set(result.scalars().all())
+
+    def _requeue(self, rows: list[dict], scopes: dict[UUID, UUID]):
+        """Merge the rows of a failed flush back into the buffer, dropping the oldest beyond MAX_PENDING."""
+        pending = {_key(row): row for row in rows}
+        for key, row in self._pending.items():
+            pending.setdefault(key, row)
+        overflow = len(pending) - MAX_PENDING
+        if overflow > 0:
+            pending = dict(list(pending.items())[overflow:])
+            logger.warning(f"Dropped {overflow} buffered reactions")
+        self._pending = pending
+        self._scopes = {**scopes, **self._scopes}
+
+    def _buffer(self, scope_id: UUID, **row):
+        self._pending.setdefault(_key(row), {"id": uuid.uuid4(), **row})
+        self._scopes[row["turn_id"] or row["comment_id"]] = scope_id
+        if len(self._pending) >= BATCH_SIZE:
+            self._wakeup.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), FLUSH_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self.flush()
+                await self.publish_counts()
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Error in reaction ingest loop")
+
+
+def _key(row: dict) -> tuple:
+    return row["turn_id"], row["comment_id"], row["type"], row["session_id"]
+
+
+# Singleton instance
+reaction_ingest = ReactionIngest(db_factory=async_session)
@@ -6,10 +6,11 @@ from datetime import datetime, timezone
 from uuid import UUID
 
 import httpx
-import tiktoken
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.engine.sentiment_scorer import sentiment_scorer
 from app.middleware.content_filter import content_filter
 from app.models.agent import Agent
 from app.models.debate import Debate, DebateParticipant, Turn
@@ -20,16 +21,6 @@ logger = logging.getLogger(__name__)
 SANDBOX_TOPIC = "AI 규제가 필요한가?"
 SANDBOX_MAX_TURNS = 6  # 3 per side (round-robin)
 
-_TIKTOKEN_ENCODING = None
-
-
-def _get_encoding():
-    global _TIKTOKEN_ENCODING
-    if _TIKTOKEN_ENCODING is None:
-        _TIKTOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
-    return _TIKTOKEN_ENCODING
-
-
 class SandboxManager:
     """Runs a 3-turn sandbox debate to validate an external agent."""
 
@@ -149,127 +140,132 @@ class SandboxManager:
         pro_agent_impl = ClaudeDebateAgent(builtin_agent_snapshot, "pro")
         con_agent_impl = ExternalDebateAgent(agent, "con")
 
-        previous_turns: list[Turn] = []
-        external_turn_results: list[dict] = []
+        try:
+            previous_turns: list[Turn] = []
+            external_turn_results: list[dict] = []
 
-        for turn_number in range(1, SANDBOX_MAX_TURNS + 1):
-            is_pro_turn = (turn_number % 2) == 1
-            current_impl = pro_agent_impl if is_pro_turn else con_agent_impl
-            current_side = "pro" if is_pro_turn else "con"
-            current_agent_id = builtin_agent_snapshot.id if is_pro_turn else agent.id
+            for turn_number in range(1, SANDBOX_MAX_TURNS + 1):
+                is_pro_turn = (turn_number % 2) == 1
+                current_impl = pro_agent_impl if is_pro_turn else con_agent_impl
+                current_side = "pro" if is_pro_turn else "con"
+                current_agent_id = builtin_agent_snapshot.id if is_pro_turn else agent.id
 
-            # Create pending turn record
-            async with self.db_factory() as db:
-                turn = Turn(
-                    debate_id=debate_id,
-                    agent_id=current_agent_id,
-                    turn_number=turn_number,
-                    status="pending",
-                )
-                db.add(turn)
-                await db.commit()
-                await db.refresh(turn)
-                turn_id = turn.id
-
-            try:
-                turn_data = await asyncio.wait_for(
-                    current_impl.generate_turn(
-                        topic=SANDBOX_TOPIC,
-                        side=current_side,
-                        previous_turns=previous_turns,
+                # Create pending turn record
+                async with self.db_factory() as db:
+                    turn = Turn(
+                        debate_id=debate_id,
+                        agent_id=current_agent_id,
                         turn_number=turn_number,
-                    ),
-                    timeout=120.0,
-                )
-
-                # Content filter check
-                is_safe, violation_reason = content_filter.check_content(
-                    turn_data.get("argument", "")
-                )
-                if not is_safe:
+                        status="pending",
+                    )
+                    db.add(turn)
+                    await db.commit()
+                    await db.refresh(turn)
+                    turn_id = turn.id
+
+                try:
+                    turn_data = await asyncio.wait_for(
+                        current_impl.generate_turn(
+                            topic=SANDBOX_TOPIC,
+                            side=current_side,
+                            previous_turns=previous_turns,
+                            turn_number=turn_number,
+                        ),
+                        timeout=settings.default_turn_timeout,
+                    )
+
+                    # Content filter check
+                    is_safe, violation_reason = content_filter.check_content(
+                        turn_data.get("argument", "")
+                    )
+                    if not is_safe:
+                        async with self.db_factory() as db:
+                            result = await db.execute(select(Turn).where(Turn.id == turn_id))
+                            db_turn = result.scalar_one()
+                            db_turn.status = "format_error"
+                            db_turn.claim = f"[Content policy violation: {violation_reason}]"
+                            db_turn.argument = "[This turn was blocked due to a content policy violation]"
+                            db_turn.citations = []
+                            await db.commit()
+                            await db.refresh(db_turn)
+                            previous_turns.append(db_turn)
+                            # Suspend agent
+                            agent_res = await db.execute(select(Agent).where(Agent.id == self.agent_id))
+                            db_agent = agent_res.scalar_one_or_none()
+                            if db_agent:
+                                db_agent.status = "suspended"
+                                await db.commit()
+                        if not is_pro_turn:
+                            external_turn_results.append({"turn_data": None, "timed_out": False, "error": f"Content violation: {violation_reason}"})
+                        logger.warning(f"Sandbox turn {turn_number} ({current_side}) content violation: {violation_reason}")
+                        continue
+
+                    # Save validated turn
                     async with self.db_factory() as db:
                         result = await db.execute(select(Turn).where(Turn.id == turn_id))
                         db_turn = result.scalar_one()
-                        db_turn.status = "format_error"
-                        db_turn.claim = f"[Content policy violation: {violation_reason}]"
-                        db_turn.argument = "[This turn was blocked due to a content policy violation]"
-                        db_turn.citations = []
+                        db_turn.stance = turn_data.get("stance")
+                        db_turn.claim = turn_data.get("claim")
+                        db_turn.argument = turn_data.get("argument", "")
+                        db_turn.citations = turn_data.get("citations", [])
+                        db_turn.token_count = turn_data.get("token_count", 0)
+                        db_turn.status = "validated"
+                        db_turn.submitted_at = datetime.now(timezone.utc)
+                        db_turn.validated_at = datetime.now(timezone.utc)
                         await db.commit()
                         await db.refresh(db_turn)
                         previous_turns.append(db_turn)
-                        # Suspend agent
-                        agent_res = await db.execute(select(Agent).where(Agent.id == self.agent_id))
-                        db_agent = agent_res.scalar_one_or_none()
-                        if db_agent:
-                            db_agent.status = "suspended"
-                            await db.commit()
-                    if not is_pro_turn:
-                        external_turn_results.append({"turn_data": None, "timed_out": False, "error": f"Content violation: {violation_reason}"})
-                    logger.warning(f"Sandbox turn {turn_number} ({current_side}) content violation: {violation_reason}")
-                    continue
-
-                # Save validated turn
-                async with self.db_factory() as db:
-                    result = await db.execute(select(Turn).where(Turn.id == turn_id))
-                    db_turn = result.scalar_one()
-                    db_turn.stance = turn_data.get("stance")
-                    db_turn.claim = turn_data.get("claim")
-                    db_turn.argument = turn_data.get("argument", "")
-                    db_turn.citations = turn_data.get("citations", [])
-                    db_turn.token_count = turn_data.get("token_count", 0)
-                    db_turn.status = "validated"
-                    db_turn.submitted_at = datetime.now(timezone.utc)
-                    db_turn.validated_at = datetime.now(timezone.utc)
-                    await db.commit()
-                    await db.refresh(db_turn)
-                    previous_turns.append(db_turn)
+                    sentiment_scorer.submit(db_turn)
 
-                if not is_pro_turn:
-                    external_turn_results.append({"turn_data": turn_data, "timed_out": False, "error": None})
+                    if not is_pro_turn:
+                        external_turn_results.append({"turn_data": turn_data, "timed_out": False, "error": None})
 
-                logger.info(f"Sandbox turn {turn_number} ({current_side}) completed")
+                    logger.info(f"Sandbox turn {turn_number} ({current_side}) completed")
 
-            except asyncio.TimeoutError:
-                async with self.db_factory() as db:
-                    result = await db.execute(select(Turn).where(Turn.id == turn_id))
-                    db_turn = result.scalar_one()
-                    db_turn.status = "timeout"
-                    db_turn.claim = "[Agent timed out]"
-                    db_turn.argument = "[No response within time limit]"
-                    db_turn.citations = []
-                    await db.commit()
-                    await db.refresh(db_turn)
-                    previous_turns.append(db_turn)
+                except asyncio.TimeoutError:
+                    async with self.db_factory() as db:
+                        result = await db.execute(select(Turn).where(Turn.id == turn_id))
+                        db_turn = result.scalar_one()
+                        db_turn.status = "timeout"
+                        db_turn.claim = "[Agent timed out]"
+                        db_turn.argument = "[No response within time limit]"
+                        db_turn.citations = []
+                        await db.commit()
+                        await db.refresh(db_turn)
+                        previous_turns.append(db_turn)
 
-                if not is_pro_turn:
-                    external_turn_results.append({"turn_data": None, "timed_out": True, "error": None})
-                logger.warning(f"Sandbox turn {turn_number} ({current_side}) timed out")
+                    if not is_pro_turn:
+                        external_turn_results.append({"turn_data": None, "timed_out": True, "error": None})
+                    logger.warning(f"Sandbox turn {turn_number} ({current_side}) timed out")
 
-            except Exception as e:
-                logger.error(f"Sandbox turn {turn_number} error: {e}", exc_info=True)
-                async with self.db_factory() as db:
-                    result = await db.execute(select(Turn).where(Turn.id == turn_id))
-                    db_turn = result.scalar_one()
-                    db_turn.status = "format_error"
-                    db_turn.claim = "[Error]"
-                    db_turn.argument = f"[Error: {str(e)[:200]}]"
-                    db_turn.citations = []
-                    await db.commit()
-                    await db.refresh(db_turn)
-                    previous_turns.append(db_turn)
+                except Exception as e:
+                    logger.error(f"Sandbox turn {turn_number} error: {e}", exc_info=True)
+                    async with self.db_factory() as db:
+                        result = await db.execute(select(Turn).where(Turn.id == turn_id))
+                        db_turn = result.scalar_one()
+                        db_turn.status = "format_error"
+                        db_turn.claim = "[Error]"
+                        db_turn.argument = f"[Error: {str(e)[:200]}]"
+                        db_turn.citations = []
+                        await db.commit()
+                        await db.refresh(db_turn)
+                        previous_turns.append(db_turn)
 
-                if not is_pro_turn:
-                    external_turn_results.append({"turn_data": None, "timed_out": False, "error": str(e)[:200]})
+                    if not is_pro_turn:
+                        external_turn_results.append({"turn_data": None, "timed_out": False, "error": str(e)[:200]})
 
-        # Complete sandbox debate
-        async with self.db_factory() as db:
-            result = await db.execute(select(Debate).where(Debate.id == debate_id))
-            debate = result.scalar_one()
-            debate.status = "completed"
-            debate.completed_at = datetime.now(timezone.utc)
-            await db.commit()
+            # Complete sandbox debate
+            async with self.db_factory() as db:
+                result = await db.execute(select(Debate).where(Debate.id == debate_id))
+                debate = result.scalar_one()
+                debate.status = "completed"
+                debate.completed_at = datetime.now(timezone.utc)
+                await db.commit()
 
-        return external_turn_results
+            return external_turn_results
+        finally:
+            await pro_agent_impl.close()
+            await con_agent_impl.close()
 
     def _evaluate_turns(self, turn_results: list[dict]) -> list[dict]:
         """Evaluate external agent turn results against sandbox checks."""
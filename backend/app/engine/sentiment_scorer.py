@@ -0,0 +1,187 @@
+"""Incremental per-turn sentiment scoring.
+
+Each turn is submitted as soon as it is validated. Scores are memoized by a
+hash of the turn's claim and argument, so identical content is never scored
+twice. Turns submitted within ``BATCH_WINDOW_SECONDS`` of each other, from any
+debate, are scored together in one Claude call of up to ``BATCH_SIZE`` turns,
+and the scores are written back to the turns with one bulk UPDATE. Analyses
+then only assemble stored scores (see app/engine/analysis_worker.py).
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from app.agents.sentiment_analyzer import score_turns
+from app.database import async_session
+from app.models.debate import Turn
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 20
+BATCH_WINDOW_SECONDS = 0.5
+MAX_MEMO_ENTRIES = 10_000
+# Validated turns without scores re-submitted on startup
+RECOVERY_LIMIT = 1_000
+
+
+def content_hash(claim: str | None, argument: str | None) -> str:
+    """Hash of the text a sentiment score is computed from."""
+    return hashlib.sha256(f"{claim or ''}\0{argument or ''}".encode()).hexdigest()
+
+
+@dataclass
+class _PendingScore:
+    claim: str | None
+    argument: str | None
+    turn_ids: set[UUID] = field(default_factory=set)
+    waiters: list[asyncio.Future] = field(default_factory=list)
+
+
+class SentimentScorer:
+    def __init__(self, db_factory):
+        self.db_factory = db_factory
+        self._memo: OrderedDict[str, dict] = OrderedDict()
+        self._pending: dict[str, _PendingScore] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start the background scoring task."""
+        self._task = asyncio.create_task(self._score_loop())
+        logger.info("SentimentScorer started")
+
+    def submit(self, turn: Turn):
+        """Queue a validated turn for scoring; the score is stored on the turn."""
+        self._queue(turn.id, turn.claim, turn.argument)
+
+    async def score(self, turns: list[Turn]) -> list[dict | None]:
+        """Scores of ``turns`` in order, scoring (and storing) the ones not scored yet.
+
+        None means the turn could not be scored.
+        """
+        waiters = []
+        for turn in turns:
+            key = content_hash(turn.claim, turn.argument)
+            if turn.sentiment_hash == key and turn.sentiment_aggression is not None:
+                waiters.append(_resolved({
+                    "aggression": turn.sentiment_aggression,
+                    "confidence": turn.sentiment_confidence,
+                }))
+            else:
+                waiters.append(self._queue(turn.id, turn.claim, turn.argument))
+        return list(await asyncio.gather(*waiters))
+
+    async def recover_unscored(self):
+        """Re-submit validated turns left unscored (e.g. by a restart) on startup."""
+        async with self.db_factory() as db:
+            result = await db.execute(
+                select(Turn.id, Turn.claim, Turn.argument)
+                .where(Turn.status == "validated", Turn.sentiment_hash.is_(None))
+                .order_by(Turn.validated_at.desc())
+                .limit(RECOVERY_LIMIT)
+            )
+            rows = result.all()
+        for turn_id, claim, argument in rows:
+            self._queue(turn_id, claim, argument)
+        if rows:
+            logger.info(f"Recovered {len(rows)} unscored turns")
+
+    async def flush(self) -> int:
+        """Score everything queued, in batches of BATCH_SIZE. Returns the number of turns scored."""
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        batches = [keys[i:i + BATCH_SIZE] for i in range(0, len(keys), BATCH_SIZE)]
+        scored = await asyncio.gather(*(self._score_batch(batch, pending) for batch in batches))
+        return sum(scored)
+
+    def _queue(self, turn_id: UUID, claim: str | None, argument: str | None) -> asyncio.Future:
+        key = content_hash(claim, argument)
+        memoized = self._memo.get(key)
+        if memoized is not None:
+            self._memo.move_to_end(key)
+            # Same content as an earlier turn: store its score without calling Claude
+            self._pending.setdefault(key, _PendingScore(claim, argument)).turn_ids.add(turn_id)
+            self._wakeup.set()
+            return _resolved(memoized)
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = self._pending.setdefault(key, _PendingScore(claim, argument))
+        entry.turn_ids.add(turn_id)
+        entry.waiters.append(waiter)
+        self._wakeup.set()
+        return waiter
+
+    async def _score_batch(self, keys: list[str], pending: dict[str, _PendingScore]) -> int:
+        unscored = [key for key in keys if key not in self._memo]
+        scores: dict[str, dict] = {}
+        if unscored:
+            try:
+                results = await score_turns([(pending[key].claim, pending[key].argument) for key in unscored])
+            except Exception:
+                logger.exception(f"Sentiment scoring failed for {len(unscored)} turns")
+                results = [None] * len(unscored)
+            for key, score in zip(unscored, results):
+                if score is not None:
+                    self._remember(key, score)
+        for key in keys:
+            if key in self._memo:
+                scores[key] = self._memo[key]
+
+        rows = [
+            {
+                "id": turn_id,
+                "sentiment_aggression": score["aggression"],
+                "sentiment_confidence": score["confidence"],
+                "sentiment_hash": key,
+            }
+            for key, score in scores.items()
+            for turn_id in pending[key].turn_ids
+        ]
+        if rows:
+            try:
+                async with self.db_factory() as db:
+                    # Bulk UPDATE by primary key, one statement for the batch
+                    await db.execute(update(Turn), rows)
+                    await db.commit()
+            except Exception:
+                logger.exception(f"Failed to store sentiment scores for {len(rows)} turns")
+
+        for key in keys:
+            for waiter in pending[key].waiters:
+                if not waiter.done():
+                    waiter.set_result(scores.get(key))
+        return len(rows)
+
+    def _remember(self, key: str, score: dict):
+        self._memo[key] = score
+        if len(self._memo) > MAX_MEMO_ENTRIES:
+            self._memo.popitem(last=False)
+
+    async def _score_loop(self):
+        while True:
+            try:
+                await self._wakeup.wait()
+                # Let turns from concurrent debates join the batch
+                await asyncio.sleep(BATCH_WINDOW_SECONDS)
+                self._wakeup.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Error in sentiment scorer loop")
+
+
+def _resolved(value) -> asyncio.Future:
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
+
+
+# Singleton instance
+sentiment_scorer = SentimentScorer(db_factory=async_session)
@@ -0,0 +1,63 @@
+"""Reconciliation of the denormalized topic counters.
+
+``topics.participant_count`` is set when a topic is created and
+``topics.comment_count`` is incremented in the same transaction that inserts a
+comment, so the topic list never has to count rows. The reconcile job recomputes
+both from the source tables and repairs any topic that drifted (manual edits,
+deleted rows, writes that bypassed the orchestrator).
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.topic import Comment, Topic, TopicParticipant
+
+logger = logging.getLogger(__name__)
+
+_reconcile_task: asyncio.Task | None = None
+
+
+async def reconcile_topic_counters(db: AsyncSession) -> int:
+    """Recompute every topic's counters; returns the number of topics repaired."""
+    participants = (
+        select(func.count(TopicParticipant.id))
+        .where(TopicParticipant.topic_id == Topic.id)
+        .scalar_subquery()
+    )
+    comments = (
+        select(func.count(Comment.id))
+        .where(Comment.topic_id == Topic.id)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Topic)
+        .where(or_(Topic.participant_count != participants, Topic.comment_count != comments))
+        .values(participant_count=participants, comment_count=comments)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.info(f"Reconciled counters for {result.rowcount} topics")
+    return result.rowcount
+
+
+def start_reconcile_job(db_factory):
+    """Reconcile now and then every ``topic_counter_reconcile_seconds``."""
+    global _reconcile_task
+    _reconcile_task = asyncio.create_task(_reconcile_loop(db_factory))
+
+
+async def _reconcile_loop(db_factory):
+    while True:
+        try:
+            async with db_factory() as db:
+                await reconcile_topic_counters(db)
+        except asyncio.CancelledError:
+            break
+        except Exception:
+            logger.exception("Topic counter reconciliation failed")
+        await asyncio.sleep(settings.topic_counter_reconcile_seconds)
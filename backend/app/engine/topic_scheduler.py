@@ -0,0 +1,267 @@
+"""Shared scheduler for open topics.
+
+One task keeps a heap of (due time, topic) entries. When topics come due, their
+status and closes_at are checked with a single query, expired topics are closed
+with a single UPDATE, and the rest run one CommentOrchestrator cycle each. A
+topic is pushed back onto the heap when its cycle finishes, so a slow cycle is
+never dispatched twice.
+
+Each process holds a lease on the topics it schedules (``scheduler_owner`` /
+``scheduler_lease_until``). The status query is an UPDATE that claims or renews
+the lease, so a topic leased by another live process is dropped here instead of
+being polled twice. A cycle can outlast the lease (several polling waves plus
+the second chance), so the leases of topics with a cycle in flight are renewed
+in one UPDATE every ``LEASE_RENEW_SECONDS``. Open topics whose lease lapsed (their process died) are
+adopted on startup and every ``ADOPT_INTERVAL_SECONDS``; leases are released on
+shutdown so an overlapping deploy takes over right away.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, or_, select, update
+
+from app.database import async_session
+from app.engine.comment_orchestrator import CommentOrchestrator
+from app.models.topic import Topic
+
+logger = logging.getLogger(__name__)
+
+ADOPT_INTERVAL_SECONDS = 60
+# A lease covers two polling intervals plus this margin
+LEASE_MARGIN_SECONDS = 120
+# Leases of topics in the middle of a cycle are renewed this often (well within the margin)
+LEASE_RENEW_SECONDS = 30
+
+
+class TopicScheduler:
+    def __init__(self, db_factory):
+        self.db_factory = db_factory
+        self.owner_id = str(uuid4())
+        self._heap: list[tuple[float, int, UUID]] = []
+        self._seq = itertools.count()
+        self._orchestrators: dict[UUID, CommentOrchestrator] = {}
+        self._intervals: dict[UUID, int] = {}
+        self._cycles: set[asyncio.Task] = set()
+        self._running: set[UUID] = set()  # topics with a cycle in flight
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start the scheduling loop."""
+        self._task = asyncio.create_task(self._loop())
+        logger.info("TopicScheduler started")
+
+    def add_topic(self, topic_id: UUID):
+        """Schedule an open topic; its first cycle runs right away."""
+        if topic_id in self._orchestrators:
+            return
+        self._orchestrators[topic_id] = CommentOrchestrator(topic_id=topic_id, db_factory=self.db_factory)
+        self._push(topic_id, time.monotonic())
+
+    async def recover_open_topics(self):
+        """Adopt open topics that no live process holds a lease on."""
+        async with self.db_factory() as db:
+            result = await db.execute(
+                update(Topic)
+                .where(Topic.status == "open", self._claimable())
+                .values(scheduler_owner=self.owner_id, scheduler_lease_until=_lease_until())
+                .returning(Topic.id)
+                .execution_options(synchronize_session=False)
+            )
+            topic_ids = [t for t in result.scalars().all() if t not in self._orchestrators]
+            await db.commit()
+        for topic_id in topic_ids:
+            self.add_topic(topic_id)
+        if topic_ids:
+            logger.info(f"Adopted {len(topic_ids)} open topics")
+
+    async def release_leases(self):
+        """Give up every lease on shutdown so another process adopts the topics right away."""
+        async with self.db_factory() as db:
+            await db.execute(
+                update(Topic)
+                .where(Topic.scheduler_owner == self.owner_id)
+                .values(scheduler_owner=None, scheduler_lease_until=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    async def renew_running_leases(self):
+        """Extend the lease of every topic with a cycle in flight."""
+        running = set(self._running)
+        if not running:
+            return
+        async with self.db_factory() as db:
+            result = await db.execute(
+                update(Topic)
+                .where(Topic.id.in_(running), Topic.scheduler_owner == self.owner_id)
+                .values(scheduler_lease_until=_lease_until())
+                .returning(Topic.id)
+                .execution_options(synchronize_session=False)
+            )
+            renewed = set(result.scalars().all())
+            await db.commit()
+        lost = running - renewed
+        if lost:
+            logger.warning(f"Lost the lease on {len(lost)} topics mid-cycle; they are dropped at their next dispatch")
+
+    def _claimable(self):
+        return or_(
+            Topic.scheduler_owner.is_(None),
+            Topic.scheduler_owner == self.owner_id,
+            Topic.scheduler_lease_until < func.now(),
+        )
+
+    def _push(self, topic_id: UUID, due: float):
+        heapq.heappush(self._heap, (due, next(self._seq), topic_id))
+        self._wakeup.set()
+
+    async def _loop(self):
+        next_adoption = time.monotonic() + ADOPT_INTERVAL_SECONDS
+        next_renewal = time.monotonic() + LEASE_RENEW_SECONDS
+        while True:
+            try:
+                now = time.monotonic()
+                if now >= next_adoption:
+                    next_adoption = now + ADOPT_INTERVAL_SECONDS
+                    await self.recover_open_topics()
+                if now >= next_renewal:
+                    next_renewal = now + LEASE_RENEW_SECONDS
+                    await self.renew_running_leases()
+
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+                if due:
+                    await self._dispatch(due)
+
+                self._wakeup.clear()
+                wake_at = min(next_adoption, next_renewal)
+                if self._heap:
+                    wake_at = min(wake_at, self._heap[0][0])
+                timeout = max(wake_at - time.monotonic(), 0)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Error in topic scheduler loop")
+                await asyncio.sleep(1)
+
+    async def _dispatch(self, topic_ids: list[UUID]):
+        """Renew the lease on all due topics in one query, close expired ones in bulk and run the rest."""
+        now = datetime.now(timezone.utc)
+        try:
+            async with self.db_factory() as db:
+                result = await db.execute(
+                    update(Topic)
+                    .where(Topic.id.in_(topic_ids), Topic.status == "open", self._claimable())
+                    .values(scheduler_owner=self.owner_id, scheduler_lease_until=_lease_until())
+                    .returning(Topic.id, Topic.closes_at)
+                    .execution_options(synchronize_session=False)
+                )
+                rows = {row.id: row for row in result.all()}
+
+                # Not renewed: closed, gone, or leased by another live process
+                taken_over = set()
+                missing = [topic_id for topic_id in topic_ids if topic_id not in rows]
+                if missing:
+                    result = await db.execute(
+                        select(Topic.id).where(Topic.id.in_(missing), Topic.status == "open")
+                    )
+                    taken_over = set(result.scalars().all())
+
+                expired = [
+                    topic_id for topic_id, row in rows.items()
+                    if row.closes_at and now >= _aware(row.closes_at)
+                ]
+                if expired:
+                    await db.execute(
+                        update(Topic)
+                        .where(Topic.id.in_(expired), Topic.status == "open")
+                        .values(status="closed", closed_at=now)
+                        .execution_options(synchronize_session=False)
+                    )
+                    logger.info(f"Closed {len(expired)} topics: Time expired")
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to check due topics; retrying shortly")
+            for topic_id in topic_ids:
+                self._push(topic_id, time.monotonic() + 5)
+            return
+
+        for topic_id in topic_ids:
+            if topic_id in taken_over:
+                await self._release(topic_id)
+                continue
+            if topic_id not in rows or topic_id in expired:
+                await self._finish(topic_id)
+                continue
+            task = asyncio.create_task(self._run_cycle(topic_id))
+            self._cycles.add(task)
+            task.add_done_callback(self._cycles.discard)
+
+    async def _run_cycle(self, topic_id: UUID):
+        orchestrator = self._orchestrators[topic_id]
+        started = time.monotonic()
+        self._running.add(topic_id)
+        try:
+            if topic_id not in self._intervals:
+                interval = await orchestrator.start()
+                if interval is None:
+                    await self._finish(topic_id)
+                    return
+                self._intervals[topic_id] = interval
+            keep_going = await orchestrator.run_cycle()
+        except Exception as e:
+            logger.error(f"Topic {topic_id} orchestrator failed: {e}", exc_info=True)
+            await orchestrator.close_after_failure()
+            keep_going = False
+        finally:
+            self._running.discard(topic_id)
+
+        if keep_going:
+            self._push(topic_id, started + self._intervals[topic_id])
+        else:
+            await self._finish(topic_id)
+
+    async def _finish(self, topic_id: UUID):
+        orchestrator = self._orchestrators.pop(topic_id, None)
+        self._intervals.pop(topic_id, None)
+        if orchestrator is None:
+            return
+        try:
+            await orchestrator.finish()
+        except Exception:
+            logger.exception(f"Failed to finish topic {topic_id}")
+
+    async def _release(self, topic_id: UUID):
+        orchestrator = self._orchestrators.pop(topic_id, None)
+        self._intervals.pop(topic_id, None)
+        if orchestrator is None:
+            return
+        logger.info(f"Topic {topic_id} is scheduled by another process; releasing it")
+        try:
+            await orchestrator.release()
+        except Exception:
+            logger.exception(f"Failed to release topic {topic_id}")
+
+
+def _lease_until():
+    return func.now() + func.make_interval(0, 0, 0, 0, 0, 0, Topic.polling_interval_seconds * 2 + LEASE_MARGIN_SECONDS)
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# Singleton instance
+topic_scheduler = TopicScheduler(db_factory=async_session)
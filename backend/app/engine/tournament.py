@@ -0,0 +1,337 @@
+"""Tournament engine: runs a bracket of 1v1 debates concurrently for offline evaluation.
+
+Debates are created as async debates with no cooldown and run through the normal
+DebateManager, so turns, content filtering and slot accounting behave exactly as
+they do for debates started through the API. Each debate keeps one transcript and
+one client per agent for its whole run.
+
+Matches are run by ``parallelism`` workers fed from the round's pairings. A
+worker starts the first pairing whose external agents can get a debate slot
+(shared with their debates outside the tournament), claims the slots and hands
+them to the match's DebateManager. While every remaining pairing waits on a
+busy agent, workers sleep on a condition signalled when one of the tournament's
+matches releases a slot; agents busy outside the tournament are retried at
+most every ``SLOT_RETRY_SECONDS``.
+
+Debates are scored on reliability: the side with more validated turns wins, and
+equal counts are a draw.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections import Counter
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.engine.debate_manager import DebateManager
+from app.engine.debate_slots import MAX_CONCURRENT_DEBATES, acquire_debate_slot, release_debate_slot
+from app.models.agent import Agent
+from app.models.debate import Debate, DebateParticipant
+
+logger = logging.getLogger(__name__)
+
+BRACKETS = ("round_robin", "swiss")
+
+WIN_POINTS = 1.0
+DRAW_POINTS = 0.5
+# How often agents busy in debates outside the tournament are tried again
+SLOT_RETRY_SECONDS = 5.0
+
+
+class Tournament:
+    """A bracket of debates between ``agents`` over ``topics``."""
+
+    def __init__(
+        self,
+        agents: list[Agent],
+        topics: list[str],
+        db_factory,
+        bracket: str = "round_robin",
+        rounds: int | None = None,
+        max_turns: int = 10,
+        parallelism: int | None = None,
+        auto_factcheck: bool = False,
+    ):
+        if bracket not in BRACKETS:
+            raise ValueError(f"Unknown bracket '{bracket}'")
+        if len(agents) < 2:
+            raise ValueError("A tournament needs at least 2 agents")
+        if not topics:
+            raise ValueError("A tournament needs at least 1 topic")
+
+        self.id = uuid4()
+        self.agents = {a.id: a for a in agents}
+        self.topics = topics
+        self.db_factory = db_factory
+        self.bracket = bracket
+        self.rounds = rounds or max(math.ceil(math.log2(len(agents))), 1)
+        self.max_turns = max_turns
+        self.auto_factcheck = auto_factcheck
+        self.status = "pending"
+        self.finished_at: float | None = None  # time.monotonic() once completed or failed
+        self.results: list[dict] = []
+        self.standings: dict[UUID, dict] = {
+            a.id: {"wins": 0, "draws": 0, "losses": 0, "byes": 0, "points": 0.0, "debates": 0}
+            for a in agents
+        }
+
+        self.parallelism = parallelism or settings.tournament_max_parallelism
+        # External agents need a debate slot per match (see app/engine/debate_slots.py)
+        self._external_ids = {a.id for a in agents if not a.is_builtin}
+        self._held: Counter[UUID] = Counter()  # slots held by this tournament's matches
+        self._busy: set[UUID] = set()  # agents whose last claim failed on debates elsewhere
+        self._slots_changed = asyncio.Condition()
+        self._played: set[frozenset[UUID]] = set()
+
+    @property
+    def total_debates(self) -> int:
+        if self.bracket == "round_robin":
+            return math.comb(len(self.agents), 2) * len(self.topics)
+        return self.rounds * (len(self.agents) // 2)
+
+    async def run(self) -> AsyncIterator[dict]:
+        """Run the bracket, yielding each debate result as soon as it finishes."""
+        self.status = "running"
+        try:
+            if self.bracket == "round_robin":
+                async for result in self._run_round(self._round_robin_pairings()):
+                    yield result
+            else:
+                for round_number in range(self.rounds):
+                    pairings = self._swiss_pairings(round_number)
+                    if not pairings:
+                        break
+                    async for result in self._run_round(pairings):
+                        yield result
+            self.status = "completed"
+        except BaseException:
+            self.status = "failed"
+            raise
+        finally:
+            self.finished_at = time.monotonic()
+
+    def summary(self) -> dict:
+        standings = sorted(
+            (
+                {"agent_id": agent_id, "agent_name": self.agents[agent_id].name, **record}
+                for agent_id, record in self.standings.items()
+            ),
+            key=lambda s: (-s["points"], -s["wins"], s["agent_name"]),
+        )
+        return {
+            "id": self.id,
+            "status": self.status,
+            "bracket": self.bracket,
+            "total_debates": self.total_debates,
+            "completed_debates": sum(1 for r in self.results if r["status"] == "completed"),
+            "failed_debates": sum(1 for r in self.results if r["status"] != "completed"),
+            "standings": standings,
+        }
+
+    # --- Brackets ---
+
+    def _round_robin_pairings(self) -> list[tuple[UUID, UUID, str]]:
+        """Every pair debates every topic, alternating who argues pro."""
+        pairings = []
+        for pair_index, (a, b) in enumerate(itertools.combinations(self.agents, 2)):
+            for topic_index, topic in enumerate(self.topics):
+                pro, con = (b, a) if (pair_index + topic_index) % 2 else (a, b)
+                pairings.append((pro, con, topic))
+        return pairings
+
+    def _swiss_pairings(self, round_number: int) -> list[tuple[UUID, UUID, str]]:
+        """Pair agents with similar scores that have not met yet; the lowest unpaired agent gets a bye."""
+        topic = self.topics[round_number % len(self.topics)]
+        ranked = sorted(self.agents, key=lambda a: (-self.standings[a]["points"], str(a)))
+
+        if len(ranked) % 2:
+            bye = next(
+                (a for a in reversed(ranked) if not self.standings[a]["byes"]),
+                ranked[-1],
+            )
+            ranked.remove(bye)
+            self.standings[bye]["byes"] += 1
+            self.standings[bye]["points"] += WIN_POINTS
+
+        pairings = []
+        while ranked:
+            first = ranked.pop(0)
+            opponent = next((a for a in ranked if frozenset((first, a)) not in self._played), ranked[0])
+            ranked.remove(opponent)
+            # Alternate sides between rounds so nobody argues the same side every time
+            pro, con = (first, opponent) if round_number % 2 == 0 else (opponent, first)
+            pairings.append((pro, con, topic))
+        return pairings
+
+    # --- Execution ---
+
+    async def _run_round(self, pairings: list[tuple[UUID, UUID, str]]) -> AsyncIterator[dict]:
+        pending = list(pairings)
+        results: asyncio.Queue[dict] = asyncio.Queue()
+
+        async def worker():
+            while True:
+                pairing, claimed = await self._next_match(pending)
+                if pairing is None:
+                    return
+                await results.put(await self._run_match(*pairing, claimed))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.parallelism, len(pairings)))]
+        try:
+            for _ in pairings:
+                result = await results.get()
+                self._record(result)
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def _next_match(self, pending: list) -> tuple[tuple | None, set[UUID]]:
+        """Take the first pending pairing whose agents' slots can be claimed, waiting while none can.
+
+        Returns (None, set()) once no pairings are left.
+        """
+        async with self._slots_changed:
+            while pending:
+                for index, (pro_id, con_id, topic) in enumerate(pending):
+                    agent_ids = [a for a in (pro_id, con_id) if a in self._external_ids]
+                    if any(self._held[a] >= MAX_CONCURRENT_DEBATES or a in self._busy for a in agent_ids):
+                        continue
+                    claimed = await self._claim_slots(agent_ids)
+                    if claimed is not None:
+                        del pending[index]
+                        return (pro_id, con_id, topic), claimed
+                try:
+                    await asyncio.wait_for(self._slots_changed.wait(), SLOT_RETRY_SECONDS)
+                except asyncio.TimeoutError:
+                    # Slots held outside the tournament are not signalled; try busy agents again
+                    self._busy.clear()
+        return None, set()
+
+    async def _run_match(self, pro_id: UUID, con_id: UUID, topic: str, claimed: set[UUID]) -> dict:
+        result = {
+            "debate_id": None,
+            "topic": topic,
+            "pro_agent_id": pro_id,
+            "con_agent_id": con_id,
+            "status": "failed",
+            "pro_validated_turns": 0,
+            "con_validated_turns": 0,
+            "winner_agent_id": None,
+        }
+        manager = None
+        try:
+            result["debate_id"] = await self._create_debate(pro_id, con_id, topic)
+            # The manager releases the claimed slots when the debate ends
+            manager = DebateManager(
+                result["debate_id"], self.db_factory, auto_factcheck=self.auto_factcheck, claimed_slots=claimed,
+            )
+            await manager.run()
+            result["status"] = await self._debate_status(result["debate_id"])
+        except Exception as e:
+            logger.error(f"Tournament {self.id} debate {result['debate_id']} failed: {e}", exc_info=True)
+            return result
+        finally:
+            if manager is None:
+                await self._release_slots(claimed)
+            await self._slots_released(claimed)
+
+        pro_turns = sum(1 for t in manager.transcript if t.agent_id == pro_id)
+        con_turns = sum(1 for t in manager.transcript if t.agent_id == con_id)
+        result["pro_validated_turns"] = pro_turns
+        result["con_validated_turns"] = con_turns
+        if pro_turns != con_turns:
+            result["winner_agent_id"] = pro_id if pro_turns > con_turns else con_id
+        return result
+
+    async def _claim_slots(self, agent_ids: list[UUID]) -> set[UUID] | None:
+        """Claim a debate slot for each agent, all or nothing. Returns None if an agent has none free.
+
+        All or nothing, so two matches never each hold one agent's slot while
+        waiting for the other's. Called with ``_slots_changed`` held.
+        """
+        claimed: set[UUID] = set()
+        if not agent_ids:
+            return claimed
+        try:
+            async with self.db_factory() as db:
+                for agent_id in agent_ids:
+                    if not await acquire_debate_slot(db, agent_id):
+                        self._busy.add(agent_id)
+                        break
+                    claimed.add(agent_id)
+                else:
+                    self._held.update(claimed)
+                    return claimed
+        except asyncio.CancelledError:
+            await self._release_slots(claimed)
+            raise
+        except Exception:
+            logger.error(f"Tournament {self.id} failed to claim debate slots", exc_info=True)
+        await self._release_slots(claimed)
+        return None
+
+    async def _release_slots(self, agent_ids: set[UUID]):
+        for agent_id in agent_ids:
+            try:
+                async with self.db_factory() as db:
+                    await release_debate_slot(db, agent_id)
+            except Exception:
+                logger.error(f"Failed to release debate slot for agent {agent_id}", exc_info=True)
+
+    async def _slots_released(self, agent_ids: set[UUID]):
+        """Wake workers waiting for these agents once a match has given their slots back."""
+        async with self._slots_changed:
+            self._held.subtract(agent_ids)
+            self._busy.difference_update(agent_ids)
+            self._slots_changed.notify_all()
+
+    def _record(self, result: dict):
+        self.results.append(result)
+        pro, con = result["pro_agent_id"], result["con_agent_id"]
+        self._played.add(frozenset((pro, con)))
+        if result["status"] != "completed":
+            return
+
+        for agent_id in (pro, con):
+            self.standings[agent_id]["debates"] += 1
+        winner = result["winner_agent_id"]
+        if winner is None:
+            for agent_id in (pro, con):
+                self.standings[agent_id]["draws"] += 1
+                self.standings[agent_id]["points"] += DRAW_POINTS
+        else:
+            loser = con if winner == pro else pro
+            self.standings[winner]["wins"] += 1
+            self.standings[winner]["points"] += WIN_POINTS
+            self.standings[loser]["losses"] += 1
+
+    async def _create_debate(self, pro_id: UUID, con_id: UUID, topic: str) -> UUID:
+        async with self.db_factory() as db:
+            debate = Debate(
+                topic=topic,
+                format="1v1",
+                mode="async",
+                max_turns=self.max_turns,
+                turn_cooldown_seconds=0,
+                status="in_progress",
+                started_at=datetime.now(timezone.utc),
+            )
+            db.add(debate)
+            await db.flush()
+            db.add(DebateParticipant(debate_id=debate.id, agent_id=pro_id, side="pro", turn_order=0))
+            db.add(DebateParticipant(debate_id=debate.id, agent_id=con_id, side="con", turn_order=1))
+            await db.commit()
+            return debate.id
+
+    async def _debate_status(self, debate_id: UUID) -> str:
+        async with self.db_factory() as db:
+            result = await db.execute(select(Debate.status).where(Debate.id == debate_id))
+            return result.scalar_one()
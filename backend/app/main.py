@@ -1,3 +1,6 @@
+import asyncio
+import logging
+
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -6,10 +9,13 @@ from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app import tokenizer
 from app.api.agents import router as agents_router
 from app.middleware.auth_guard import AuthGuardMiddleware
 from app.middleware.body_limit import BodyLimitMiddleware
+from app.api.analysis import report_router as analysis_report_router
 from app.api.analysis import router as analysis_router
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.auth import router as auth_router
 from app.api.debates import router as debates_router
 from app.api.factcheck import router as factcheck_router
@@ -17,9 +23,20 @@ from app.api.live import router as live_router
 from app.api.reactions import router as reactions_router
 from app.api.sandbox import router as sandbox_router
 from app.api.topics import router as topics_router
+from app.api.tournaments import router as tournaments_router
 from app.api.turns import router as turns_router
 from app.config import settings
+from app.database import async_session
+from app.engine.analysis_worker import analysis_worker
+from app.engine.debate_slots import reconcile_debate_slots
+from app.engine.factcheck_intake import factcheck_intake
 from app.engine.factcheck_worker import factcheck_worker
+from app.engine.reaction_ingest import reaction_ingest
+from app.engine.sentiment_scorer import sentiment_scorer
+from app.engine.topic_counters import start_reconcile_job
+from app.engine.topic_scheduler import topic_scheduler
+
+logger = logging.getLogger(__name__)
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -52,6 +69,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["Content-Type", "Authorization"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(auth_router)
@@ -61,15 +79,76 @@ app.include_router(debates_router)
 app.include_router(turns_router)
 app.include_router(reactions_router)
 app.include_router(analysis_router)
+app.include_router(analysis_report_router)
 app.include_router(factcheck_router)
 app.include_router(topics_router)
+app.include_router(tournaments_router)
 app.include_router(live_router)
 
 
+@app.on_event("startup")
+async def startup_tokenizer():
+    try:
+        await asyncio.to_thread(tokenizer.warm)
+    except Exception:
+        logger.warning("Failed to load the tokenizer; token counts fall back to estimates until it loads", exc_info=True)
+
+
 @app.on_event("startup")
 async def startup_factcheck_worker():
     await factcheck_worker.recover_pending()
     factcheck_worker.start()
+    factcheck_intake.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_factcheck_intake():
+    # Requests inserted here stay pending and are recovered on the next startup
+    await factcheck_intake.flush()
+
+
+@app.on_event("startup")
+async def startup_sentiment_scorer():
+    await sentiment_scorer.recover_unscored()
+    sentiment_scorer.start()
+
+
+@app.on_event("startup")
+async def startup_analysis_worker():
+    await analysis_worker.recover_pending()
+    analysis_worker.start()
+
+
+@app.on_event("startup")
+async def startup_reaction_ingest():
+    reaction_ingest.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_reaction_ingest():
+    await reaction_ingest.flush()
+
+
+@app.on_event("startup")
+async def startup_topic_scheduler():
+    await topic_scheduler.recover_open_topics()
+    topic_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_topic_scheduler():
+    await topic_scheduler.release_leases()
+
+
+@app.on_event("startup")
+async def startup_reconcile_topic_counters():
+    start_reconcile_job(async_session)
+
+
+@app.on_event("startup")
+async def startup_reconcile_debate_slots():
+    async with async_session() as db:
+        await reconcile_debate_slots(db)
 
 
 @app.get("/health")
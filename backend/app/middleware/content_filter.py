@@ -1,38 +1,90 @@
-"""Keyword-based content filter for debate turn text."""
+"""Keyword-based content filter for debate turn text.
 
+Each pattern lists the lowercased literals one of which starts every match
+("anchors", e.g. ``kill`` / ``genocide``). All anchors are compiled into one
+alternation that is run once over the lowercased text; only patterns with an
+anchor present (or without anchors) run their regex, in order, so the reason
+reported is the same as a full sequential scan. The alternation is a lookahead
+tried at every position, longest anchor first, and each hit also counts the
+anchors that are prefixes of it, so overlapping anchors are never missed.
+
+``str.lower()`` only agrees with ``re.IGNORECASE`` for ASCII and uncased
+characters (``"İ".lower()`` is two characters, ``"ſ"`` matches ``s``), so a
+text containing any other cased character skips the prefilter and runs every
+pattern.
+
+Patterns can be overridden with a JSON file (``content_filter_patterns_path``,
+a list of ``{"pattern": ..., "reason": ..., "anchors": [...]}``, anchors
+optional) that is reloaded when it changes.
+
+``StreamingContentFilter`` checks LLM output while it streams, so a blocked
+generation can be cancelled before it finishes.
+"""
+
+import json
+import logging
+import os
 import re
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_ASCII_RUNS = re.compile(r"[\x00-\x7f]+")
+
+
+class ContentViolationError(Exception):
+    """Raised while streaming when generated text hits a blocked pattern."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
 
 
 class ContentFilter:
     """Checks text against blocked patterns (hate speech, violence, illegal activity)."""
 
-    BLOCKED_PATTERNS: list[tuple[str, str]] = [
+    # (pattern, reason, anchors); a wrong anchor list lets matches through, None always runs the pattern
+    BLOCKED_PATTERNS: list[tuple[str, str, tuple[str, ...] | None]] = [
         # English hate speech
-        (r"\b(?:kill\s+all|exterminate|genocide)\b", "Incitement to violence/genocide"),
-        (r"\b(?:racial\s+supremacy|white\s+power|ethnic\s+cleansing)\b", "Hate speech (supremacism)"),
-        (r"\b(?:gas\s+the|lynch|enslave)\s+\w+", "Hate speech (violence against groups)"),
+        (r"\b(?:kill\s+all|exterminate|genocide)\b", "Incitement to violence/genocide", ("kill", "exterminate", "genocide")),
+        (r"\b(?:racial\s+supremacy|white\s+power|ethnic\s+cleansing)\b", "Hate speech (supremacism)", ("racial", "white", "ethnic")),
+        (r"\b(?:gas\s+the|lynch|enslave)\s+\w+", "Hate speech (violence against groups)", ("gas", "lynch", "enslave")),
         # English violence
-        (r"\b(?:how\s+to\s+(?:make\s+a\s+bomb|build\s+(?:a\s+)?weapon|synthesize\s+poison))\b", "Illegal activity instructions"),
-        (r"\b(?:terrorist\s+attack\s+plan|mass\s+(?:shooting|murder)\s+guide)\b", "Terrorism-related content"),
+        (r"\b(?:how\s+to\s+(?:make\s+a\s+bomb|build\s+(?:a\s+)?weapon|synthesize\s+poison))\b", "Illegal activity instructions", ("how",)),
+        (r"\b(?:terrorist\s+attack\s+plan|mass\s+(?:shooting|murder)\s+guide)\b", "Terrorism-related content", ("terrorist", "mass")),
         # English illegal activity
-        (r"\b(?:how\s+to\s+(?:hack|steal\s+identity|launder\s+money|traffic\s+(?:drugs|humans)))\b", "Illegal activity instructions"),
-        (r"\b(?:child\s+(?:porn|exploitation|abuse))\b", "Child exploitation content"),
+        (r"\b(?:how\s+to\s+(?:hack|steal\s+identity|launder\s+money|traffic\s+(?:drugs|humans)))\b", "Illegal activity instructions", ("how",)),
+        (r"\b(?:child\s+(?:porn|exploitation|abuse))\b", "Child exploitation content", ("child",)),
         # Korean hate speech
-        (r"(?:인종\s*청소|민족\s*말살|학살\s*해야)", "혐오 발언 (인종/민족)"),
-        (r"(?:여성\s*혐오|남성\s*혐오|장애인\s*혐오).*(?:죽|없애|제거)", "혐오 발언 (차별적 폭력)"),
+        (r"(?:인종\s*청소|민족\s*말살|학살\s*해야)", "혐오 발언 (인종/민족)", ("인종", "민족", "학살")),
+        (r"(?:여성\s*혐오|남성\s*혐오|장애인\s*혐오).*(?:죽|없애|제거)", "혐오 발언 (차별적 폭력)", ("여성", "남성", "장애인")),
         # Korean violence
-        (r"(?:폭탄\s*(?:만들|제조)|무기\s*제작|독극물\s*합성)", "불법 활동 지침"),
-        (r"(?:테러\s*계획|총기\s*난사\s*방법)", "테러 관련 콘텐츠"),
+        (r"(?:폭탄\s*(?:만들|제조)|무기\s*제작|독극물\s*합성)", "불법 활동 지침", ("폭탄", "무기", "독극물")),
+        (r"(?:테러\s*계획|총기\s*난사\s*방법)", "테러 관련 콘텐츠", ("테러", "총기")),
         # Korean illegal activity
-        (r"(?:마약\s*(?:제조|거래)|인신\s*매매|자금\s*세탁\s*방법)", "불법 활동 지침"),
-        (r"(?:아동\s*(?:포르노|착취|학대))", "아동 착취 콘텐츠"),
+        (r"(?:마약\s*(?:제조|거래)|인신\s*매매|자금\s*세탁\s*방법)", "불법 활동 지침", ("마약", "인신", "자금")),
+        (r"(?:아동\s*(?:포르노|착취|학대))", "아동 착취 콘텐츠", ("아동",)),
     ]
 
-    def __init__(self):
-        self._compiled = [
-            (re.compile(pattern, re.IGNORECASE), reason)
-            for pattern, reason in self.BLOCKED_PATTERNS
+    def __init__(self, patterns: list[tuple] | None = None, patterns_path: str | None = None):
+        self.patterns_path = patterns_path
+        self._mtime: float | None = None
+        self._next_reload_check = 0.0
+        self.reload(patterns if patterns is not None else self.BLOCKED_PATTERNS)
+        if patterns_path:
+            self._reload_if_changed()
+
+    def reload(self, patterns: list[tuple]):
+        """Swap in a new pattern set of (pattern, reason[, anchors]). Invalid patterns raise and keep the current set."""
+        compiled = [
+            (re.compile(entry[0], re.IGNORECASE), entry[1], _anchor_set(entry[2] if len(entry) > 2 else None))
+            for entry in patterns
         ]
+        all_anchors = {anchor for _, _, anchors in compiled if anchors for anchor in anchors}
+        # Single assignment so concurrent checks never see a half-built set
+        self._matchers = (_anchor_scanner(all_anchors), compiled)
 
     def check_content(self, text: str) -> tuple[bool, str | None]:
         """Check text against blocked patterns.
@@ -40,11 +92,203 @@ class ContentFilter:
         Returns:
             (True, None) if safe, (False, reason) if violation found.
         """
-        for regex, reason in self._compiled:
+        if self.patterns_path:
+            self._reload_if_changed()
+
+        (scanner, prefixes), compiled = self._matchers
+        if _has_special_case(text):
+            present = None
+        elif scanner is None:
+            present = set()
+        else:
+            present = set()
+            for found in {m.group(1) for m in scanner.finditer(text.lower())}:
+                present |= prefixes[found]
+        for regex, reason, anchors in compiled:
+            if present is not None and anchors is not None and present.isdisjoint(anchors):
+                continue
             if regex.search(text):
                 return False, reason
         return True, None
 
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now < self._next_reload_check:
+            return
+        self._next_reload_check = now + settings.content_filter_reload_seconds
+
+        try:
+            mtime = os.stat(self.patterns_path).st_mtime
+            if mtime == self._mtime:
+                return
+            # Remember the attempt so a broken file is reported once, not on every check
+            self._mtime = mtime
+            with open(self.patterns_path, encoding="utf-8") as f:
+                entries = json.load(f)
+            self.reload([(entry["pattern"], entry["reason"], entry.get("anchors")) for entry in entries])
+            logger.info(f"Loaded {len(entries)} content filter patterns from {self.patterns_path}")
+        except Exception:
+            logger.exception(f"Failed to load content filter patterns from {self.patterns_path}; keeping current set")
+
+
+class StreamingContentFilter:
+    """Incremental ``check_content`` over streamed text chunks.
+
+    Text is checked in windows that start with the last ``OVERLAP_CHARS`` of
+    already-checked text, so matches spanning chunk boundaries are still found.
+    Windows are cut at whitespace on both ends so a partial word never fakes a
+    word boundary. Matches longer than the overlap are left to the full check
+    the caller runs on the final text.
+
+    With ``json_field``, only that top-level string field of a streamed JSON
+    object is checked (e.g. the turn's ``argument``), matching what the full
+    check looks at.
+    """
+
+    OVERLAP_CHARS = 200
+    CHECK_EVERY_CHARS = 48
+
+    def __init__(self, content_filter: ContentFilter, json_field: str | None = None):
+        self.content_filter = content_filter
+        self.json_field = json_field
+        self.reset()
+
+    def reset(self):
+        """Start over, e.g. when a request is retried."""
+        self._field = _JsonStringField(self.json_field) if self.json_field else None
+        self._tail = ""
+        self._pending = ""
+
+    def feed(self, chunk: str):
+        """Add a streamed chunk; raises ContentViolationError on a blocked pattern."""
+        self._pending += self._field.feed(chunk) if self._field else chunk
+        if len(self._pending) < self.CHECK_EVERY_CHARS:
+            return
+
+        cut = _last_space(self._pending)
+        if cut <= 0:
+            if len(self._pending) < 4 * self.OVERLAP_CHARS:
+                return  # wait for the end of the word
+            cut = len(self._pending)
+        ready, self._pending = self._pending[:cut], self._pending[cut:]
+
+        window = self._tail + ready
+        is_safe, reason = self.content_filter.check_content(window)
+        if not is_safe:
+            raise ContentViolationError(reason)
+
+        tail = window[-self.OVERLAP_CHARS:]
+        if len(window) > self.OVERLAP_CHARS:
+            space = _first_space(tail)
+            tail = tail[space:] if space >= 0 else ""
+        self._tail = tail
+
+
+class _JsonStringField:
+    """Extracts the decoded value of one top-level string field from streamed JSON."""
+
+    _ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+    def __init__(self, key: str):
+        self.key = key
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode: str | None = None
+        self._is_value = False
+        self._expect_value = False
+        self._capturing = False
+        self._buffer: list[str] = []
+        self._last_key: str | None = None
+
+    def feed(self, chunk: str) -> str:
+        out = []
+        for c in chunk:
+            if self._in_string:
+                self._string_char(c, out)
+            elif c == '"':
+                self._in_string = True
+                self._is_value = self._expect_value
+                self._capturing = self._is_value and self._depth == 1 and self._last_key == self.key
+                self._expect_value = False
+                self._buffer = []
+            elif c in "{[":
+                self._depth += 1
+                self._expect_value = False
+            elif c in "}]":
+                self._depth -= 1
+            elif c == ":":
+                self._expect_value = self._depth == 1
+            elif c == ",":
+                self._last_key = None
+                self._expect_value = False
+            elif not c.isspace():
+                self._expect_value = False
+        return "".join(out)
+
+    def _string_char(self, c: str, out: list[str]):
+        # Only keys are buffered; values other than the wanted field are skipped
+        target = out if self._capturing else (None if self._is_value else self._buffer)
+        if self._unicode is not None:
+            self._unicode += c
+            if len(self._unicode) == 4:
+                if target is not None and all(h in "0123456789abcdefABCDEF" for h in self._unicode):
+                    target.append(chr(int(self._unicode, 16)))
+                self._unicode = None
+        elif self._escape:
+            self._escape = False
+            if c == "u":
+                self._unicode = ""
+            elif target is not None:
+                target.append(self._ESCAPES.get(c, c))
+        elif c == "\\":
+            self._escape = True
+        elif c == '"':
+            self._in_string = False
+            self._capturing = False
+            if self._depth == 1 and not self._is_value:
+                self._last_key = "".join(self._buffer)
+        elif target is not None:
+            target.append(c)
+
+
+def _last_space(text: str) -> int:
+    for i in range(len(text) - 1, -1, -1):
+        if text[i].isspace():
+            return i
+    return -1
+
+
+def _first_space(text: str) -> int:
+    for i, c in enumerate(text):
+        if c.isspace():
+            return i
+    return -1
+
+
+def _anchor_set(anchors) -> frozenset[str] | None:
+    if not anchors:
+        return None
+    return frozenset(anchor.lower() for anchor in anchors)
+
+
+def _anchor_scanner(anchors: set[str]) -> tuple[re.Pattern | None, dict[str, frozenset[str]]]:
+    """One regex finding every anchor start, plus each anchor's prefix anchors (itself included)."""
+    if not anchors:
+        return None, {}
+    ordered = sorted(anchors, key=len, reverse=True)
+    scanner = re.compile("(?=(" + "|".join(re.escape(anchor) for anchor in ordered) + "))")
+    prefixes = {anchor: frozenset(a for a in anchors if anchor.startswith(a)) for anchor in anchors}
+    return scanner, prefixes
+
+
+def _has_special_case(text: str) -> bool:
+    """Whether ``text`` has a non-ASCII cased character, where lower() and IGNORECASE can disagree."""
+    if text.isascii():
+        return False
+    rest = _ASCII_RUNS.sub("", text)
+    return rest.lower() != rest or rest.upper() != rest
+
 
 # Module-level singleton
-content_filter = ContentFilter()
+content_filter = ContentFilter(patterns_path=settings.content_filter_patterns_path or None)
@@ -0,0 +1,119 @@
+"""In-process cache of serialized responses for finished debates and closed topics.
+
+Once a debate is completed (or failed/cancelled) or a topic is closed, its
+detail, turns and comments no longer change. Their JSON bytes are cached
+under a resource key with a strong ETag, so repeat requests skip Postgres and
+Pydantic entirely, and clients revalidating with ``If-None-Match`` get a 304.
+
+Factchecks and analyses of finished debates can still change (late factcheck
+results, regenerated analyses), possibly in another process. They are cached
+too, but served with ``no-cache`` and tagged with a version read from the
+database on every request (e.g. the analysis's ``updated_at``); an entry is
+only served while its version is current. Writers in the same process also
+invalidate them directly.
+
+The cache is bounded by total body size (LRU) and is per process.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app import rendering
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_DEBATE_STATUSES = frozenset({"completed", "failed", "cancelled"})
+TERMINAL_TOPIC_STATUSES = frozenset({"closed"})
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    cache_control: str
+    version: object = None
+
+    def to_response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if _etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._adapters: dict[object, TypeAdapter] = {}
+
+    def get(self, request: Request, key: tuple, version=None) -> Response | None:
+        """Cached response for ``key``, if there is one for ``version``."""
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            return None
+        self._entries.move_to_end(key)
+        return entry.to_response(request)
+
+    def put(self, request: Request, key: tuple, response_type, value, immutable: bool = True, version=None) -> Response:
+        """Serialize ``value`` as ``response_type``, cache it and return the response."""
+        adapter = self._adapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+        return self._store(key, body, immutable, version).to_response(request)
+
+    def put_rendered(self, request: Request, key: tuple, content, immutable: bool = True, version=None) -> Response:
+        """Cache ``content`` already shaped like the response (see app/rendering.py)."""
+        return self._store(key, rendering.dumps(content), immutable, version).to_response(request)
+
+    def invalidate(self, *key):
+        """Drop ``key`` and every entry it is a prefix of (e.g. all turn variants of a debate)."""
+        for cached_key in [k for k in self._entries if k[: len(key)] == key]:
+            self._discard(cached_key)
+
+    def _discard(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.body)
+
+    def _store(self, key: tuple, body: bytes, immutable: bool, version=None) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            cache_control=IMMUTABLE if immutable else REVALIDATE,
+            version=version,
+        )
+        if len(body) <= self.max_bytes:
+            self._discard(key)
+            self._entries[key] = entry
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+        return entry
+
+    def _adapter(self, response_type) -> TypeAdapter:
+        adapter = self._adapters.get(response_type)
+        if adapter is None:
+            adapter = TypeAdapter(response_type)
+            self._adapters[response_type] = adapter
+        return adapter
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+# Module-level singleton
+response_cache = ResponseCache(max_bytes=settings.response_cache_max_bytes)
@@ -1,9 +1,9 @@
 from app.models.base import Base
-from app.models.agent import Agent
+from app.models.agent import Agent, AgentLatencyBucket
 from app.models.debate import Debate, DebateParticipant, Turn
 from app.models.developer import Developer, SandboxResult
 from app.models.factcheck import FactcheckRequest, FactcheckResult
-from app.models.reaction import AnalysisResult, Reaction
+from app.models.reaction import AnalysisResult, Reaction, ReactionCount
 from app.models.topic import Comment, Topic, TopicParticipant
 
-__all__ = ["Base", "Agent", "Debate", "DebateParticipant", "Turn", "Developer", "SandboxResult", "FactcheckRequest", "FactcheckResult", "Reaction", "AnalysisResult", "Topic", "TopicParticipant", "Comment"]
+__all__ = ["Base", "Agent", "AgentLatencyBucket", "Debate", "DebateParticipant", "Turn", "Developer", "SandboxResult", "FactcheckRequest", "FactcheckResult", "Reaction", "ReactionCount", "AnalysisResult", "Topic", "TopicParticipant", "Comment"]
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, String, Text
+from sqlalchemy import BigInteger, Boolean, ForeignKey, Integer, SmallInteger, String, Text
 from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -19,6 +19,9 @@ class Agent(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="registered")
     endpoint_url: Mapped[str | None] = mapped_column(String(500))
     is_builtin: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    active_debate_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    consecutive_turn_failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_turn_failure_at: Mapped[str | None] = mapped_column(TIMESTAMP(timezone=True))
     developer_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("developers.id", ondelete="SET NULL"), nullable=True)
     created_at: Mapped[str] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at: Mapped[str] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -26,4 +29,15 @@ class Agent(Base):
     developer: Mapped["Developer"] = relationship()
 
 
+class AgentLatencyBucket(Base):
+    """One bucket of an agent's turn latency histogram (see app/engine/latency_tracker.py)."""
+
+    __tablename__ = "agent_latency_buckets"
+
+    agent_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("agents.id", ondelete="CASCADE"), primary_key=True)
+    period: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
+
 from app.models.developer import Developer  # noqa: E402
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -63,6 +63,10 @@ class Turn(Base):
     token_count: Mapped[int | None] = mapped_column(Integer)
     submitted_at: Mapped[str | None] = mapped_column(TIMESTAMP(timezone=True))
     validated_at: Mapped[str | None] = mapped_column(TIMESTAMP(timezone=True))
+    # Sentiment scores (app/engine/sentiment_scorer.py) and the hash of the claim/argument they were computed from
+    sentiment_aggression: Mapped[float | None] = mapped_column(Float)
+    sentiment_confidence: Mapped[float | None] = mapped_column(Float)
+    sentiment_hash: Mapped[str | None] = mapped_column(String(64))
     created_at: Mapped[str] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
 
     debate: Mapped["Debate"] = relationship(back_populates="turns")
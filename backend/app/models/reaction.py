@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -19,11 +19,27 @@ class Reaction(Base):
     created_at: Mapped[str] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
 
 
+class ReactionCount(Base):
+    """Rollup of reactions per turn or comment and type; maintained by app/engine/reaction_ingest.py."""
+
+    __tablename__ = "reaction_counts"
+
+    # Turn or comment id, and the debate or topic it belongs to
+    target_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    scope_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     debate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("debates.id", ondelete="CASCADE"), nullable=False, unique=True)
+    # Job state (pending, processing, completed, failed); see app/engine/analysis_worker.py
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    # Hash of the validated turns the job covers; generating again for the same version is a no-op
+    transcript_version: Mapped[str | None] = mapped_column(String(64))
     sentiment_data: Mapped[dict | None] = mapped_column(JSONB)
     citation_stats: Mapped[dict | None] = mapped_column(JSONB)
     created_at: Mapped[str] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -18,6 +18,12 @@ class Topic(Base):
     duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=60)
     max_comments_per_agent: Mapped[int] = mapped_column(Integer, nullable=False, default=10)
     polling_interval_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=30)
+    # Denormalized counters for the topic list; see app/engine/topic_counters.py
+    participant_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    comment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Process scheduling the open topic and until when; see app/engine/topic_scheduler.py
+    scheduler_owner: Mapped[str | None] = mapped_column(String(64))
+    scheduler_lease_until: Mapped[str | None] = mapped_column(TIMESTAMP(timezone=True))
     created_at: Mapped[str] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
     started_at: Mapped[str | None] = mapped_column(TIMESTAMP(timezone=True))
     closes_at: Mapped[str | None] = mapped_column(TIMESTAMP(timezone=True))
@@ -3,6 +3,9 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, model_validator
 
+from app.schemas.factcheck import FactcheckResultResponse
+from app.schemas.turn import AnalysisResponse, TurnResponse
+
 
 # Expected agent count per format
 FORMAT_AGENT_COUNT = {"1v1": 2, "2v2": 4, "3v3": 6}
@@ -68,3 +71,13 @@ class DebateListResponse(BaseModel):
     completed_at: datetime | None
 
     model_config = {"from_attributes": True}
+
+
+class DebateBundleResponse(BaseModel):
+    """Everything the debate page renders, returned by one request."""
+
+    debate: DebateResponse
+    turns: list[TurnResponse]
+    reactions: dict[str, dict[str, int]]
+    factchecks: list[FactcheckResultResponse]
+    analysis: AnalysisResponse | None
@@ -0,0 +1,35 @@
+from typing import Annotated
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class TournamentCreate(BaseModel):
+    agent_ids: list[UUID] = Field(min_length=2, max_length=64)
+    topics: list[Annotated[str, Field(min_length=10, max_length=500)]] = Field(min_length=1, max_length=50)
+    bracket: str = Field(default="round_robin", pattern="^(round_robin|swiss)$")
+    rounds: int | None = Field(default=None, ge=1, le=20)
+    max_turns: int = Field(default=10, ge=1, le=50)
+    parallelism: int | None = Field(default=None, ge=1, le=256)
+    auto_factcheck: bool = False
+
+
+class TournamentStanding(BaseModel):
+    agent_id: UUID
+    agent_name: str
+    wins: int
+    draws: int
+    losses: int
+    byes: int
+    points: float
+    debates: int
+
+
+class TournamentResponse(BaseModel):
+    id: UUID
+    status: str
+    bracket: str
+    total_debates: int
+    completed_debates: int
+    failed_debates: int
+    standings: list[TournamentStanding]
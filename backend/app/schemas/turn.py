@@ -43,21 +43,35 @@ class ReactionCreate(BaseModel):
     session_id: str = Field(min_length=1, max_length=100)
 
 
-class ReactionResponse(BaseModel):
-    id: UUID
-    turn_id: UUID
-    type: str
-    session_id: str
-    created_at: datetime
-
-    model_config = {"from_attributes": True}
+class ReactionAccepted(BaseModel):
+    status: str = "accepted"
 
 
 class AnalysisResponse(BaseModel):
     id: UUID
     debate_id: UUID
+    status: str = "completed"
+    transcript_version: str | None = None
     sentiment_data: list | dict | None
     citation_stats: dict | None
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class AnalysisJobResponse(BaseModel):
+    status: str
+    transcript_version: str
+
+
+class CitationDomainStats(BaseModel):
+    domain: str
+    source_type: str
+    citations: int
+    debates: int
+
+
+class CitationReportResponse(BaseModel):
+    total_citations: int
+    source_types: dict[str, int]
+    domains: list[CitationDomainStats]
@@ -0,0 +1,82 @@
+"""Shared tiktoken tokenizer for turn and comment token counts.
+
+The ``cl100k_base`` encoding is loaded once (``warm()`` at startup). Encodes of
+large texts run in a worker thread so they do not stall the event loop. Token
+ids are memoized in an LRU keyed by a hash of the text, so the count an agent
+computes for an argument is reused when the turn is saved and truncated.
+"""
+
+import asyncio
+import hashlib
+import logging
+from array import array
+from collections import OrderedDict
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+ENCODING_NAME = "cl100k_base"
+CACHE_SIZE = 4096
+# Texts longer than this are encoded in a worker thread
+THREAD_OFFLOAD_CHARS = 2000
+
+_encoding = None
+_cache: OrderedDict[bytes, array] = OrderedDict()
+
+
+def warm():
+    """Load the encoding ahead of the first turn (blocking; may download the BPE file)."""
+    _get_encoding()
+
+
+async def encode(text: str) -> list[int]:
+    """Token ids for ``text``; raises if the encoding cannot be loaded."""
+    key = _key(text)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached.tolist()
+
+    if len(text) > THREAD_OFFLOAD_CHARS:
+        tokens = await asyncio.to_thread(_encode, text)
+    else:
+        tokens = _encode(text)
+    _remember(key, tokens)
+    return tokens
+
+
+async def count(text: str) -> int:
+    """Number of tokens in ``text``, with a word-based estimate if tiktoken is unavailable."""
+    cached = _cache.get(_key(text))
+    if cached is not None:
+        return len(cached)
+    try:
+        return len(await encode(text))
+    except Exception:
+        return len(text.split()) * 2  # rough fallback
+
+
+def decode(tokens: list[int]) -> str:
+    return _get_encoding().decode(tokens)
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding(ENCODING_NAME)
+    return _encoding
+
+
+def _encode(text: str) -> list[int]:
+    return _get_encoding().encode(text)
+
+
+def _key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def _remember(key: bytes, tokens: list[int]):
+    _cache[key] = array("I", tokens)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
@@ -0,0 +1,147 @@
+"""Micro-benchmark: ORM + response_model rendering vs. row dicts rendered with orjson.
+
+The old path builds ORM instances, validates them against the response model
+(``from_attributes``), dumps them to JSON-compatible Python and encodes with
+the stdlib ``json`` module, as FastAPI does for ``response_model`` routes. The
+new path turns row tuples into dicts and renders them with orjson
+(app/rendering.py). Times are per 1,000 rows, without database I/O.
+
+Usage (from backend/):
+    uv run python -m benchmarks.response_rendering [--rows 1000] [--repeat 5]
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+
+from app.models.debate import Debate, Turn
+from app.models.factcheck import FactcheckResult
+from app.rendering import dumps
+from app.schemas.debate import DebateListResponse
+from app.schemas.factcheck import FactcheckResultResponse
+from app.schemas.turn import TurnResponse
+
+WORDS = (
+    "the policy would reduce emissions while increasing costs for households and small businesses "
+    "evidence from several countries suggests regulation improves safety outcomes but slows adoption"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def _when(rng: random.Random) -> datetime:
+    return datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(10_000_000))
+
+
+def turn_row(rng: random.Random) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "debate_id": uuid.uuid4(),
+        "agent_id": uuid.uuid4(),
+        "turn_number": rng.randrange(1, 20),
+        "status": "validated",
+        "stance": "pro",
+        "claim": _text(rng, 15),
+        "argument": _text(rng, 300),
+        "citations": [
+            {"url": f"https://example.com/{i}", "title": _text(rng, 6), "quote": _text(rng, 25)}
+            for i in range(3)
+        ],
+        "rebuttal_target_id": uuid.uuid4(),
+        "team_id": None,
+        "support_target_id": None,
+        "token_count": rng.randrange(200, 800),
+        "submitted_at": _when(rng),
+        "created_at": _when(rng),
+    }
+
+
+def factcheck_row(rng: random.Random) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "request_id": uuid.uuid4(),
+        "turn_id": uuid.uuid4(),
+        "verdict": "verified",
+        "citation_url": "https://example.com/source",
+        "citation_accessible": True,
+        "content_match": True,
+        "logic_valid": None,
+        "details": {"explanation": _text(rng, 40), "confidence": 0.8},
+        "created_at": _when(rng),
+    }
+
+
+def debate_row(rng: random.Random) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "topic": _text(rng, 12),
+        "status": "completed",
+        "format": "1v1",
+        "mode": "async",
+        "max_turns": 10,
+        "current_turn": 10,
+        "viewer_count": rng.randrange(100),
+        "created_at": _when(rng),
+        "started_at": _when(rng),
+        "completed_at": _when(rng),
+    }
+
+
+def orm_path(model, schema):
+    adapter = TypeAdapter(list[schema])
+
+    def render(rows: list[tuple], keys: list[str]) -> bytes:
+        objects = [model(**dict(zip(keys, row))) for row in rows]
+        content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    return render
+
+
+def row_path(rows: list[tuple], keys: list[str]) -> bytes:
+    return dumps([dict(zip(keys, row)) for row in rows])
+
+
+def bench(render, rows: list[tuple], keys: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(rows, keys)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    cases = (
+        ("turns", Turn, TurnResponse, turn_row),
+        ("factchecks", FactcheckResult, FactcheckResultResponse, factcheck_row),
+        ("debates", Debate, DebateListResponse, debate_row),
+    )
+    for name, model, schema, make_row in cases:
+        keys = list(schema.model_fields)
+        rows = [tuple(make_row(rng)[key] for key in keys) for _ in range(args.rows)]
+        old_render = orm_path(model, schema)
+        same = json.loads(old_render(rows, keys)) == json.loads(row_path(rows, keys))
+        old = bench(old_render, rows, keys, args.repeat) * 1000 / args.rows
+        new = bench(row_path, rows, keys, args.repeat) * 1000 / args.rows
+        print(
+            f"{name:10s} per 1,000 rows  orm+response_model {old * 1000:7.2f} ms  "
+            f"rows+orjson {new * 1000:6.2f} ms  speedup {old / new:5.1f}x  same output {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
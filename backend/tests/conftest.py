@@ -34,6 +34,15 @@ def mock_db() -> AsyncMock:
     return db
 
 
+@pytest.fixture
+def db_factory(mock_db):
+    """Create a session factory whose sessions are ``mock_db`` (like ``async_session``)."""
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=mock_db)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return lambda: session
+
+
 @pytest.fixture
 def sample_agent() -> Agent:
     """Create a sample agent for testing."""
@@ -0,0 +1,129 @@
+"""Tests for background analysis jobs."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import Request
+from sqlalchemy.dialects import postgresql
+
+from app.api.analysis import generate_analysis
+from app.engine.analysis_worker import AnalysisWorker, transcript_version
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": [], "client": ("127.0.0.1", 0)})
+
+
+def _scalar(value) -> MagicMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+def _ids(*ids) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(ids)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_generate_is_a_noop_for_an_unchanged_transcript(mock_db):
+    """Test a job for the current transcript is not queued again."""
+    debate_id, turn_ids = uuid4(), [uuid4(), uuid4()]
+    mock_db.scalar = AsyncMock(side_effect=[debate_id, "completed"])
+    mock_db.execute.side_effect = [_ids(*turn_ids), _scalar(None)]  # upsert WHERE did not match
+
+    with patch("app.api.analysis.analysis_worker") as worker:
+        worker.enqueue = AsyncMock()
+        response = await generate_analysis.__wrapped__(_request(), debate_id, mock_db)
+
+    assert response.status == "completed"
+    assert response.transcript_version == transcript_version(turn_ids)
+    worker.enqueue.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_generate_queues_a_job_for_a_new_transcript(mock_db):
+    """Test a changed transcript resets the row to pending and enqueues the debate."""
+    debate_id = uuid4()
+    mock_db.scalar = AsyncMock(return_value=debate_id)
+    mock_db.execute.side_effect = [_ids(uuid4()), _scalar(uuid4())]
+
+    with patch("app.api.analysis.analysis_worker") as worker, \
+            patch("app.api.analysis.response_cache") as cache:
+        worker.enqueue = AsyncMock()
+        response = await generate_analysis.__wrapped__(_request(), debate_id, mock_db)
+
+    assert response.status == "pending"
+    worker.enqueue.assert_awaited_once_with(debate_id)
+    cache.invalidate.assert_called_once_with("analysis", debate_id)
+    upsert = str(mock_db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert "analysis_results.updated_at < now() -" in upsert  # stale unfinished jobs are queued again
+
+
+@pytest.mark.asyncio
+async def test_worker_holds_no_session_during_the_llm_call(mock_db, db_factory):
+    """Test the transcript is read and the result written in separate short sessions."""
+    debate_id = uuid4()
+    open_sessions = []
+    session = db_factory()
+    session.__aenter__.side_effect = lambda: open_sessions.append(1) or mock_db
+    session.__aexit__.side_effect = lambda *exc: open_sessions.pop() and False
+    worker = AnalysisWorker(db_factory=db_factory)
+
+    turn = MagicMock(id=uuid4())
+    transcript = MagicMock()
+    transcript.all.return_value = [(turn, "pro")]
+    mock_db.execute.side_effect = [_scalar(uuid4()), transcript, MagicMock()]
+    stats = {"pro": {"total": 1, "unique_sources": 1, "source_types": {"academic": 1}}}
+
+    async def score(turns):
+        assert open_sessions == []
+        return [{"aggression": 0.2, "confidence": 0.9}]
+
+    with patch("app.engine.analysis_worker.sentiment_scorer") as scorer, \
+            patch("app.engine.analysis_worker.debate_citation_stats", AsyncMock(return_value=stats)), \
+            patch("app.engine.analysis_worker.response_cache") as cache:
+        scorer.score = AsyncMock(side_effect=score)
+        await worker.process(debate_id)
+
+    write = mock_db.execute.await_args_list[2].args[0]
+    params = write.compile().params
+    assert params["status"] == "completed"
+    assert params["status_1"] == "processing"  # only while still claimed by this job
+    assert params["citation_stats"] == stats
+    assert params["sentiment_data"][0]["aggression"] == 0.2
+    assert mock_db.commit.await_count == 2
+    cache.invalidate.assert_called_once_with("analysis", debate_id)
+
+
+@pytest.mark.asyncio
+async def test_worker_skips_debates_without_an_unfinished_job(mock_db, db_factory):
+    """Test a stale queue entry does not assemble an analysis."""
+    worker = AnalysisWorker(db_factory=db_factory)
+    mock_db.execute.side_effect = [_scalar(None)]
+
+    with patch("app.engine.analysis_worker.sentiment_scorer") as scorer:
+        await worker.process(uuid4())
+
+    scorer.score.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_worker_fails_the_job_when_the_transcript_cannot_be_read(mock_db, db_factory):
+    """Test an error in the claiming session marks the job failed instead of leaving it pending."""
+    debate_id = uuid4()
+    worker = AnalysisWorker(db_factory=db_factory)
+    mock_db.execute.side_effect = [_scalar(uuid4()), RuntimeError("connection lost"), MagicMock()]
+
+    with patch("app.engine.analysis_worker.sentiment_scorer") as scorer, \
+            patch("app.engine.analysis_worker.response_cache") as cache:
+        await worker.process(debate_id)
+
+    scorer.score.assert_not_called()
+    write = mock_db.execute.await_args_list[2].args[0]
+    params = write.compile().params
+    assert params["status"] == "failed"
+    assert params["status_1"] == ["pending", "processing"]  # the claim was rolled back
+    cache.invalidate.assert_called_once_with("analysis", debate_id)
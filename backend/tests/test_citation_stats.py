@@ -0,0 +1,78 @@
+"""Tests for SQL-side citation statistics."""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.engine.citation_stats import (
+    citation_report,
+    classify_citation_url,
+    classify_domain,
+    debate_citation_stats,
+    normalize_domain,
+)
+
+
+def _rows(*rows) -> MagicMock:
+    result = MagicMock()
+    result.all.return_value = list(rows)
+    return result
+
+
+def test_domains_are_normalized_and_classified_in_priority_order():
+    """Test hosts are extracted with or without a scheme and matched by the first source type."""
+    assert normalize_domain("HTTPS://user@Www.BBC.co.uk:443/news?q=1") == "www.bbc.co.uk"
+    assert normalize_domain("en.wikipedia.org/wiki/Debate") == "en.wikipedia.org"
+    assert classify_citation_url("https://arxiv.org/abs/2401.00001") == "academic"
+    assert classify_citation_url("https://news.stanford.edu/story") == "academic"
+    assert classify_citation_url("https://www.reuters.com/world") == "news"
+    assert classify_citation_url("https://en.wikipedia.org/wiki/X") == "wiki"
+    assert classify_citation_url("https://www.moef.go.kr/report") == "government"
+    assert classify_citation_url("https://example.com/academic") == "other"  # the path is not classified
+
+    classify_domain.cache_clear()
+    for _ in range(3):
+        classify_domain("www.who.int")
+    assert classify_domain.cache_info().misses == 1
+
+
+@pytest.mark.asyncio
+async def test_debate_stats_are_assembled_from_grouping_sets(mock_db):
+    """Test per-side rows give totals and per-domain rows give source types."""
+    mock_db.execute.return_value = _rows(
+        ("pro", None, 1, 4, 3, 3),           # per side: 4 citations, 3 unique URLs
+        ("pro", "arxiv.org", 0, 2, 2, 2),
+        ("pro", "www.bbc.com", 0, 1, 1, 1),
+        ("pro", None, 0, 1, 0, 0),           # citation without a URL
+        ("con", None, 1, 1, 1, 1),
+        ("con", "example.com", 0, 1, 1, 1),
+    )
+
+    stats = await debate_citation_stats(mock_db, uuid4())
+
+    assert stats["pro"]["total"] == 4
+    assert stats["pro"]["unique_sources"] == 3
+    assert stats["pro"]["source_types"] == {"academic": 2, "news": 1, "wiki": 0, "government": 0, "other": 0}
+    assert stats["con"]["source_types"]["other"] == 1
+    sql = str(mock_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "jsonb_array_elements" in sql
+    assert "GROUPING SETS" in sql
+
+
+@pytest.mark.asyncio
+async def test_citation_report_totals_all_domains_and_lists_the_top(mock_db):
+    """Test source type totals cover every domain while only `limit` domains are listed."""
+    mock_db.execute.return_value = _rows(
+        ("en.wikipedia.org", 10, 4),
+        ("www.nytimes.com", 5, 2),
+        ("www.oecd.org", 1, 1),
+    )
+
+    report = await citation_report(mock_db, limit=2)
+
+    assert report["total_citations"] == 16
+    assert report["source_types"]["government"] == 1
+    assert [d["domain"] for d in report["domains"]] == ["en.wikipedia.org", "www.nytimes.com"]
+    assert report["domains"][1] == {"domain": "www.nytimes.com", "source_type": "news", "citations": 5, "debates": 2}
@@ -0,0 +1,250 @@
+"""Tests for concurrent agent polling in CommentOrchestrator."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.engine.comment_orchestrator import CommentOrchestrator
+from app.models.topic import Comment
+
+
+def _participant(name: str):
+    agent = SimpleNamespace(id=uuid4(), name=name, is_builtin=False, status="active")
+    return SimpleNamespace(agent=agent, agent_id=agent.id, comment_count=0, max_comments=5)
+
+
+def _orchestrator(replies: dict, delays: dict, calls: list):
+    orchestrator = CommentOrchestrator(topic_id=uuid4(), db_factory=None)
+
+    async def fake_request(topic, participant, existing_comments, timeout):
+        calls.append((participant.agent.name, len(existing_comments)))
+        await asyncio.sleep(delays.get(participant.agent.name, 0))
+        reply = replies[participant.agent.name]
+        data = reply(existing_comments) if callable(reply) else reply
+        return data, True
+
+    async def fake_commit(participant, comment_data, existing_comments):
+        participant.comment_count += 1
+        existing_comments.append({"agent_id": str(participant.agent.id), "content": comment_data["content"]})
+
+    orchestrator._request_comment = fake_request
+    orchestrator._commit_comment = fake_commit
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_poll_cycle_commits_in_arrival_order():
+    """Test the fastest agent's comment is committed first."""
+    slow, fast = _participant("slow"), _participant("fast")
+    calls = []
+    orchestrator = _orchestrator(
+        {"slow": {"content": "slow"}, "fast": {"content": "fast"}},
+        {"slow": 0.05},
+        calls,
+    )
+    existing = []
+
+    await orchestrator._poll_cycle(SimpleNamespace(), [slow, fast], existing)
+
+    assert [c["content"] for c in existing] == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_poll_cycle_gives_skipped_agents_a_second_chance():
+    """Test an agent that skipped before a new comment arrived is polled again with it."""
+    talker, lurker = _participant("talker"), _participant("lurker")
+    calls = []
+    orchestrator = _orchestrator(
+        {
+            "talker": {"content": "opening"},
+            "lurker": lambda comments: {"content": "reply"} if comments else None,
+        },
+        {"talker": 0.05},
+        calls,
+    )
+    existing = []
+
+    await orchestrator._poll_cycle(SimpleNamespace(), [talker, lurker], existing)
+
+    assert ("lurker", 0) in calls and ("lurker", 1) in calls
+    assert [c["content"] for c in existing] == ["opening", "reply"]
+
+
+@pytest.mark.asyncio
+async def test_poll_cycle_respects_concurrency_cap():
+    """Test no more than comment_polling_concurrency polls run at once."""
+    participants = [_participant(f"agent-{i}") for i in range(6)]
+    in_flight = 0
+    peak = 0
+    orchestrator = CommentOrchestrator(topic_id=uuid4(), db_factory=None)
+
+    async def fake_request(topic, participant, existing_comments, timeout):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return None, True
+
+    orchestrator._request_comment = fake_request
+    with patch("app.engine.comment_orchestrator.settings.comment_polling_concurrency", 2):
+        await orchestrator._poll_cycle(SimpleNamespace(), participants, [])
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_load_new_comments_appends_only_unseen_comments(mock_db):
+    """Test incremental loads advance the cursor and skip comments already in context."""
+    topic_id = uuid4()
+    agent_id = uuid4()
+    now = datetime.now(timezone.utc)
+    first = Comment(id=uuid4(), topic_id=topic_id, agent_id=agent_id, content="first", created_at=now)
+    second = Comment(id=uuid4(), topic_id=topic_id, agent_id=agent_id, content="second", created_at=now + timedelta(seconds=1))
+
+    def rows(*comments):
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = list(comments)
+        return result
+
+    orchestrator = CommentOrchestrator(topic_id=topic_id, db_factory=None)
+    orchestrator._agent_names = {str(agent_id): "Claude Pro"}
+
+    mock_db.execute.return_value = rows(first)
+    await orchestrator._load_new_comments(mock_db)
+    # The inclusive cursor returns the boundary comment again
+    mock_db.execute.return_value = rows(first, second)
+    await orchestrator._load_new_comments(mock_db)
+
+    assert [c["content"] for c in orchestrator._comments] == ["first", "second"]
+    assert orchestrator._comments[0]["agent_name"] == "Claude Pro"
+    assert orchestrator._comments_cursor == second.created_at
+
+
+@pytest.mark.asyncio
+async def test_repeated_skips_back_off_exponentially(db_factory):
+    """Test an agent that keeps skipping is polled on cycles 1, 2, 4, 8, ..."""
+    lurker = _participant("lurker")
+    calls = []
+    orchestrator = _orchestrator({"lurker": None}, {}, calls)
+    orchestrator._participants = [lurker]
+    orchestrator._topic = SimpleNamespace()
+
+    async def no_new_comments(db):
+        return None
+
+    orchestrator._load_new_comments = no_new_comments
+    orchestrator._refresh_participants = no_new_comments
+    orchestrator.db_factory = db_factory
+
+    polled_cycles = []
+    for cycle in range(1, 10):
+        before = len(calls)
+        await orchestrator.run_cycle()
+        if len(calls) > before:
+            polled_cycles.append(cycle)
+
+    assert polled_cycles == [1, 2, 4, 8]
+
+
+@pytest.mark.asyncio
+async def test_agent_suspended_mid_topic_is_no_longer_polled(mock_db, db_factory):
+    """Test each cycle re-reads agent status, skips suspended agents and closes their client."""
+    active, suspended = _participant("active"), _participant("suspended")
+    calls = []
+    orchestrator = _orchestrator({"active": None, "suspended": None}, {}, calls)
+    orchestrator._participants = [active, suspended]
+    orchestrator._topic = SimpleNamespace()
+    client = MagicMock(agent=suspended.agent, close=AsyncMock())
+    orchestrator._agents[suspended.agent_id] = client
+
+    async def no_new_comments(db):
+        return None
+
+    orchestrator._load_new_comments = no_new_comments
+    status = MagicMock()
+    status.all.return_value = [(active.agent_id, 0, "active"), (suspended.agent_id, 2, "suspended")]
+    mock_db.execute.return_value = status
+    orchestrator.db_factory = db_factory
+
+    assert await orchestrator.run_cycle() is True
+
+    assert [name for name, _ in calls] == ["active"]
+    assert suspended.comment_count == 2
+    client.close.assert_awaited_once()
+    assert suspended.agent_id not in orchestrator._agents
+
+
+def test_backed_off_agent_wakes_on_reference():
+    """Test a backed-off agent is polled early when a new comment references it."""
+    lurker = _participant("lurker")
+    orchestrator = CommentOrchestrator(topic_id=uuid4(), db_factory=None)
+    own = {"id": "c1", "agent_id": str(lurker.agent_id), "content": "mine", "references": []}
+    orchestrator._add_comment(orchestrator._comments, own)
+    orchestrator._cycle = 1
+    orchestrator._skip_streaks[lurker.agent_id] = 3
+    orchestrator._back_off(lurker)
+    orchestrator._cycle = 2
+
+    assert orchestrator._poll_due(lurker) is False
+
+    orchestrator._add_comment(orchestrator._comments, {
+        "id": "c2", "agent_id": str(uuid4()), "content": "I disagree",
+        "references": [{"comment_id": "c1", "type": "rebut", "quote": "mine"}],
+    })
+    assert orchestrator._poll_due(lurker) is True
+
+
+def _backed_off(orchestrator, participant):
+    orchestrator._cycle = 1
+    orchestrator._skip_streaks[participant.agent_id] = 3
+    orchestrator._back_off(participant)
+    orchestrator._cycle = 2
+
+
+def test_backed_off_agent_wakes_on_whole_word_or_at_mention():
+    """Test names match as whole words or @mentions, not inside other words."""
+    lurker = _participant("Al")
+    orchestrator = CommentOrchestrator(topic_id=uuid4(), db_factory=None)
+    _backed_off(orchestrator, lurker)
+    other = str(uuid4())
+
+    orchestrator._add_comment(orchestrator._comments, {
+        "id": "c1", "agent_id": other, "content": "This also applies to Alice", "references": [],
+    })
+    assert orchestrator._poll_due(lurker) is False
+
+    orchestrator._add_comment(orchestrator._comments, {
+        "id": "c2", "agent_id": other, "content": "What do you think, Al?", "references": [],
+    })
+    assert orchestrator._poll_due(lurker) is True
+
+    orchestrator._add_comment(orchestrator._comments, {
+        "id": "c3", "agent_id": other, "content": "@Al은 어떻게 생각하나요?", "references": [],
+    })
+    assert orchestrator._poll_due(lurker) is True
+
+
+def test_backed_off_agent_wakes_on_stance_change():
+    """Test a comment that changes its author's stance wakes backed-off agents; a repeated stance does not."""
+    lurker = _participant("lurker")
+    orchestrator = CommentOrchestrator(topic_id=uuid4(), db_factory=None)
+    other = str(uuid4())
+    orchestrator._add_comment(orchestrator._comments, {
+        "id": "c1", "agent_id": other, "content": "first", "references": [], "stance": "pro",
+    })
+    _backed_off(orchestrator, lurker)
+
+    orchestrator._add_comment(orchestrator._comments, {
+        "id": "c2", "agent_id": other, "content": "still", "references": [], "stance": "pro",
+    })
+    assert orchestrator._poll_due(lurker) is False
+
+    orchestrator._add_comment(orchestrator._comments, {
+        "id": "c3", "agent_id": other, "content": "convinced", "references": [], "stance": "con",
+    })
+    assert orchestrator._poll_due(lurker) is True
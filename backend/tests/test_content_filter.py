@@ -0,0 +1,122 @@
+"""Tests for the content filter."""
+
+import json
+import os
+import re
+
+import pytest
+
+from app.config import settings
+from app.middleware.content_filter import ContentFilter, ContentViolationError, StreamingContentFilter
+
+
+@pytest.mark.parametrize("text,reason", [
+    ("They want to KILL ALL of them", "Incitement to violence/genocide"),
+    ("a guide on how to launder money", "Illegal activity instructions"),
+    ("폭탄 제조 방법을 알려줘", "불법 활동 지침"),
+    ("여성 혐오 세력을 없애야 한다", "혐오 발언 (차별적 폭력)"),
+    ("Carbon taxes reduce emissions at a modest cost.", None),
+    ("탄소세는 적은 비용으로 배출을 줄인다.", None),
+])
+def test_check_content_reports_first_matching_reason(text, reason):
+    """Test English and Korean texts get the same verdicts as a sequential scan."""
+    assert ContentFilter().check_content(text) == (reason is None, reason)
+
+
+def _full_scan(text):
+    for pattern, reason, _ in ContentFilter.BLOCKED_PATTERNS:
+        if re.search(pattern, text, re.IGNORECASE):
+            return False, reason
+    return True, None
+
+
+@pytest.mark.parametrize("text", [
+    "genocİde",                      # "İ".lower() is two characters
+    "chİld porn",
+    "KİLL ALL of them",
+    "how to launder mon\u0435y",     # Cyrillic е: no match either way
+    "an enſlave them all",            # long s matches s under IGNORECASE
+    "\u212aill all",                # Kelvin sign matches k under IGNORECASE
+    "ΑΒΓ white power",
+    "Ethnic cleansing 인종 청소",
+    "Terrorist attack plan",
+    "a mass shooting guide here",
+    "nothing to see here",
+])
+def test_prefilter_matches_full_scan(text):
+    """Test the anchor prefilter gives the verdicts and reasons of a full IGNORECASE scan."""
+    assert ContentFilter().check_content(text) == _full_scan(text)
+
+
+def test_patterns_without_anchors_always_run():
+    """Test a pattern with no anchors is checked against every text."""
+    content_filter = ContentFilter(patterns=[(r"\d+\s+dead", "Casualty count"), (r"\bbomb\b", "Bomb", ["bomb"])])
+    assert content_filter.check_content("12 dead") == (False, "Casualty count")
+    assert content_filter.check_content("a BOMB threat") == (False, "Bomb")
+    assert content_filter.check_content("a bombastic speech") == (True, None)
+
+
+def test_overlapping_anchors_are_all_found():
+    """Test anchors that are prefixes of, or overlap, other anchors still enable their patterns."""
+    content_filter = ContentFilter(patterns=[
+        (r"\bmassacre\b", "Massacre", ["massacre"]),
+        (r"\bmass\w*\s+grave\b", "Mass grave", ["mass"]),
+        (r"acre\s+fire", "Acre fire", ["acre"]),
+    ])
+    assert content_filter.check_content("a massacre") == (False, "Massacre")
+    assert content_filter.check_content("massacres grave") == (False, "Mass grave")
+    assert content_filter.check_content("massacreacre fire") == (False, "Acre fire")
+    assert content_filter.check_content("nothing here") == (True, None)
+
+
+def test_patterns_file_is_hot_reloaded(tmp_path, monkeypatch):
+    """Test a changed patterns file replaces the set and a broken one keeps the current set."""
+    monkeypatch.setattr(settings, "content_filter_reload_seconds", 0)
+    path = tmp_path / "patterns.json"
+    path.write_text(json.dumps([{"pattern": r"\bforbidden\b", "reason": "Custom", "anchors": ["forbidden"]}]))
+    content_filter = ContentFilter(patterns_path=str(path))
+
+    assert content_filter.check_content("a forbidden word") == (False, "Custom")
+    assert content_filter.check_content("kill all") == (True, None)
+
+    path.write_text(json.dumps([{"pattern": r"\bbanned\b", "reason": "Updated"}]))
+    os.utime(path, (1, 1))
+    assert content_filter.check_content("a banned word") == (False, "Updated")
+
+    path.write_text("not json")
+    os.utime(path, (2, 2))
+    assert content_filter.check_content("a banned word") == (False, "Updated")
+
+
+def _feed_all(screen, chunks):
+    for chunk in chunks:
+        screen.feed(chunk)
+
+
+def test_streaming_filter_matches_across_chunk_boundaries():
+    """Test a blocked phrase split over several chunks is caught before the stream ends."""
+    screen = StreamingContentFilter(ContentFilter())
+    with pytest.raises(ContentViolationError) as exc:
+        _feed_all(screen, ["Some filler text about policy ", "and then how to ", "laun", "der money is explained ", "x" * 60 + " "])
+    assert exc.value.reason == "Illegal activity instructions"
+
+
+def test_streaming_filter_does_not_fake_word_boundaries():
+    """Test a chunk ending mid-word does not match a \\b-anchored pattern the full text would not."""
+    screen = StreamingContentFilter(ContentFilter())
+    filler = "The historian " + "discussed evidence carefully and at length " * 6
+    _feed_all(screen, [filler + "about genocide", "s denial in scholarly debates " + "y" * 60 + " "])
+
+
+def test_streaming_filter_only_checks_json_field():
+    """Test only the requested JSON field is screened, with escapes decoded."""
+    screen = StreamingContentFilter(ContentFilter(), json_field="argument")
+    _feed_all(screen, [
+        '{"stance": "pro", "claim": "Studies of genocide prevention", ',
+        '"citations": [{"title": "Genocide Watch", "argument": "genocide"}], ',
+        '"argument": "Early warning systems \\"work\\" ' + "z" * 60 + ' "}',
+    ])
+
+    screen = StreamingContentFilter(ContentFilter(), json_field="argument")
+    with pytest.raises(ContentViolationError):
+        _feed_all(screen, ['{"argument": "They say \\uD3ED\\uD0C4 \\uC81C\\uC870 is ', "easy " + "w" * 60 + ' "}'])
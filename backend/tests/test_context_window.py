@@ -0,0 +1,67 @@
+"""Tests for bounded prompt context (app/agents/context_window.py)."""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.agents import context_window
+from app.agents.context_window import estimate_tokens, window_comments, window_turns
+from app.models.debate import Turn
+
+
+def _comments(count: int) -> list[dict]:
+    return [
+        {"id": str(uuid4()), "agent_name": f"Agent {i % 3}", "content": f"Point number {i}. Supporting detail follows."}
+        for i in range(count)
+    ]
+
+
+def test_short_history_is_kept_verbatim():
+    """Test nothing is summarized while the history fits the window."""
+    comments = _comments(5)
+    summary, recent = window_comments(comments)
+    assert summary is None
+    assert recent == comments
+
+
+def test_older_comments_are_summarized_by_first_sentence():
+    """Test only the latest items stay verbatim and older ones become gist lines."""
+    comments = _comments(30)
+    summary, recent = window_comments(comments)
+
+    assert recent == comments[-12:]
+    assert f"(id={comments[0]['id']})" in summary
+    assert "Point number 0." in summary
+    assert "Supporting detail" not in summary
+
+
+def test_summary_stays_within_token_budget():
+    """Test the summary is capped no matter how long the discussion gets."""
+    with patch.object(context_window.settings, "context_summary_tokens", 200):
+        summary, _ = window_comments(_comments(1000))
+    assert estimate_tokens(summary) <= 200 + 20
+    assert summary.startswith("(")  # omitted-items header
+
+
+def test_summary_is_extended_incrementally_from_cache():
+    """Test a longer history reuses the cached lines up to the high-water mark."""
+    comments = _comments(20)
+    window_comments(comments)
+    comments.extend(_comments(3))
+
+    with patch.object(context_window, "_gist", wraps=context_window._gist) as gist:
+        window_comments(comments)
+    assert gist.call_count == 3
+
+
+def test_turn_window_summarizes_claims():
+    """Test older debate turns are summarized by their claims."""
+    debate_id = uuid4()
+    turns = [
+        Turn(id=uuid4(), debate_id=debate_id, turn_number=i, stance="pro" if i % 2 else "con",
+             claim=f"Claim {i}", argument="Long argument " * 50)
+        for i in range(1, 21)
+    ]
+    summary, recent = window_turns(turns)
+    assert recent == turns[-12:]
+    assert "- Turn 1 (pro): Claim 1" in summary
+    assert "Long argument" not in summary
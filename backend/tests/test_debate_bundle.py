@@ -0,0 +1,60 @@
+"""Tests for the one-shot debate bundle endpoint."""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.debates import get_debate_bundle
+from app.schemas.debate import DebateBundleResponse
+from app.schemas.turn import TurnResponse
+
+
+def _result(*, row=None, mappings=None, rows=None) -> MagicMock:
+    result = MagicMock()
+    result.unique.return_value.one_or_none.return_value = row
+    result.mappings.return_value = mappings or []
+    result.all.return_value = rows or []
+    return result
+
+
+@pytest.mark.asyncio
+async def test_bundle_streams_every_section_from_four_queries(mock_db, sample_debate, sample_turn):
+    """Test the bundle assembles debate, turns, reactions, factchecks and analysis in four queries."""
+    sample_debate.mode, sample_debate.viewer_count = "async", 0
+    sample_turn.debate_id = sample_debate.id
+    sample_turn.created_at = datetime.now(timezone.utc)
+    turn_row = {name: getattr(sample_turn, name) for name in TurnResponse.model_fields}
+    mock_db.execute.side_effect = [
+        _result(row=(sample_debate, None)),
+        _result(mappings=[turn_row]),
+        _result(rows=[(sample_turn.id, "like", 3)]),
+        _result(),
+    ]
+
+    response = await get_debate_bundle(sample_debate.id, mock_db)
+    body = b"".join([chunk async for chunk in response.body_iterator])
+
+    bundle = DebateBundleResponse.model_validate(json.loads(body))
+    assert bundle.debate.id == sample_debate.id
+    assert [p.agent_name for p in bundle.debate.participants] == ["Pro Agent", "Con Agent"]
+    assert [t.id for t in bundle.turns] == [sample_turn.id]
+    assert bundle.reactions == {str(sample_turn.id): {"like": 3}}
+    assert bundle.factchecks == []
+    assert bundle.analysis is None
+    assert mock_db.execute.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_bundle_of_unknown_debate_is_404(mock_db):
+    """Test a missing debate fails before anything is streamed."""
+    mock_db.execute.return_value = _result()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_debate_bundle(uuid4(), mock_db)
+
+    assert exc_info.value.status_code == 404
+    assert mock_db.execute.await_count == 1
@@ -2,7 +2,7 @@
 
 import pytest
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 from uuid import UUID, uuid4
 
 from app.engine.debate_manager import DebateManager
@@ -244,3 +244,65 @@ async def test_update_current_turn(mock_db, sample_debate):
     assert debate.current_turn == 3
 
     mock_db.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_acquire_debate_slots_records_over_limit_agents(sample_debate, db_factory):
+    """Test external agents at the concurrency limit are denied once at start."""
+    pro, con = sample_debate.participants
+    pro.agent.is_builtin = False
+    con.agent.is_builtin = False
+
+    granted = {pro.agent_id}
+
+    async def fake_acquire(db, agent_id):
+        return agent_id in granted
+
+    manager = DebateManager(debate_id=sample_debate.id, db_factory=db_factory)
+    with patch("app.engine.debate_manager.acquire_debate_slot", side_effect=fake_acquire):
+        await manager._acquire_debate_slots(sample_debate.participants)
+
+    assert manager._slot_agent_ids == {pro.agent_id}
+    assert manager._over_limit_agent_ids == {con.agent_id}
+
+
+@pytest.mark.asyncio
+async def test_acquire_debate_slots_keeps_slots_claimed_by_the_caller(sample_debate):
+    """Test slots claimed before the debate (e.g. by a tournament) are not claimed again but are released."""
+    pro, con = sample_debate.participants
+    pro.agent.is_builtin = False
+    con.agent.is_builtin = False
+
+    manager = DebateManager(debate_id=sample_debate.id, db_factory=None, claimed_slots={pro.agent_id, con.agent_id})
+    with patch("app.engine.debate_manager.acquire_debate_slot") as acquire:
+        await manager._acquire_debate_slots(sample_debate.participants)
+
+    acquire.assert_not_called()
+    assert manager._slot_agent_ids == {pro.agent_id, con.agent_id}
+
+
+@pytest.mark.asyncio
+async def test_acquire_debate_slots_skips_builtin_agents(sample_debate):
+    """Test builtin agents never claim a debate slot."""
+    manager = DebateManager(debate_id=sample_debate.id, db_factory=None)
+    with patch("app.engine.debate_manager.acquire_debate_slot") as acquire:
+        await manager._acquire_debate_slots(sample_debate.participants)
+
+    acquire.assert_not_called()
+    assert manager._slot_agent_ids == set()
+    assert manager._over_limit_agent_ids == set()
+
+
+def test_debate_agent_is_reused_across_turns(sample_debate):
+    """Test each participant gets one agent implementation for the whole debate."""
+    manager = DebateManager(debate_id=sample_debate.id, db_factory=None)
+    pro = sample_debate.participants[0]
+
+    first = manager._get_debate_agent(pro, is_live=False)
+    second = manager._get_debate_agent(pro, is_live=False)
+
+    assert first is second
+
+    manager._suspend_local_agent(pro.agent_id)
+    assert pro.agent.status == "suspended"
+    assert pro.id not in manager._agents
@@ -0,0 +1,125 @@
+"""Tests for the external agent HTTP protocol (app/agents/external_agent.py)."""
+
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.agents import external_agent
+from app.agents.external_agent import ExternalDebateAgent
+from app.models.agent import Agent
+from app.models.debate import Turn
+
+
+TURN_REPLY = {"stance": "con", "claim": "c", "argument": "a", "citations": []}
+
+
+def _agent(handler, endpoint: str) -> ExternalDebateAgent:
+    external_agent._protocol_versions.pop(endpoint, None)
+    agent = ExternalDebateAgent(
+        Agent(id=uuid4(), name="Ext", endpoint_url=endpoint, is_builtin=False, status="active"),
+        "con",
+    )
+    agent._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return agent
+
+
+def _turns(count: int) -> list[Turn]:
+    return [
+        Turn(id=uuid4(), turn_number=i, stance="pro", claim=f"claim {i}", argument=f"argument {i}")
+        for i in range(1, count + 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_v1_agents_receive_full_context():
+    """Test agents that don't advertise a protocol version keep the v1 payload."""
+    sent = []
+
+    def handler(request: httpx.Request):
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, json=TURN_REPLY)
+
+    agent = _agent(handler, "http://v1.test")
+    await agent.generate_turn("topic", "con", _turns(2), 3)
+
+    assert [t["claim"] for t in sent[0]["previous_turns"]] == ["claim 1", "claim 2"]
+    assert "session_id" not in sent[0]
+
+
+@pytest.mark.asyncio
+async def test_delta_agents_receive_only_unacknowledged_turns():
+    """Test v2 agents get only turns after their ack_seq, under a stable session id."""
+    sent = []
+
+    def handler(request: httpx.Request):
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok", "protocol_version": 2})
+        body = json.loads(request.content)
+        sent.append(body)
+        return httpx.Response(200, json={**TURN_REPLY, "ack_seq": body["seq"]})
+
+    agent = _agent(handler, "http://delta.test")
+    turns = _turns(4)
+    await agent.generate_turn("topic", "con", turns[:2], 3)
+    await agent.generate_turn("topic", "con", turns, 5)
+
+    assert [t["claim"] for t in sent[0]["new_turns"]] == ["claim 1", "claim 2"]
+    assert sent[1]["since_seq"] == 2
+    assert [t["claim"] for t in sent[1]["new_turns"]] == ["claim 3", "claim 4"]
+    assert sent[0]["session_id"] == sent[1]["session_id"]
+    assert "previous_turns" not in sent[1]
+
+
+@pytest.mark.asyncio
+async def test_delta_conflict_triggers_one_full_resync():
+    """Test a 409 makes the platform resend the full context once."""
+    sent = []
+
+    def handler(request: httpx.Request):
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok", "protocol_version": 2})
+        body = json.loads(request.content)
+        sent.append(body)
+        if not body.get("resync"):
+            return httpx.Response(409, json={"detail": "unknown session"})
+        return httpx.Response(200, json={**TURN_REPLY, "ack_seq": body["seq"]})
+
+    agent = _agent(handler, "http://resync.test")
+    agent._sessions["turns"].acked_seq = 1
+    await agent.generate_turn("topic", "con", _turns(3), 4)
+
+    assert len(sent) == 2
+    assert sent[1]["resync"] is True
+    assert sent[1]["since_seq"] == 0
+    assert len(sent[1]["new_turns"]) == 3
+    assert agent._sessions["turns"].acked_seq == 3
+
+
+@pytest.mark.asyncio
+async def test_delta_fresh_session_gets_the_windowed_context(monkeypatch):
+    """Test a new session with a long transcript gets the windowed resync, not the whole history."""
+    monkeypatch.setattr(external_agent.settings, "context_recent_items", 3)
+    sent = []
+
+    def handler(request: httpx.Request):
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok", "protocol_version": 2})
+        body = json.loads(request.content)
+        sent.append(body)
+        return httpx.Response(200, json={**TURN_REPLY, "ack_seq": body["seq"]})
+
+    agent = _agent(handler, "http://fresh.test")
+    turns = _turns(20)
+    await agent.generate_turn("topic", "con", turns, 21)
+    agent._sessions["turns"].acked_seq = 10  # acked long ago
+    await agent.generate_turn("topic", "con", turns, 21)
+
+    for body in sent:
+        assert body["resync"] is True
+        assert body["since_seq"] == 17
+        assert [t["claim"] for t in body["new_turns"]] == ["claim 18", "claim 19", "claim 20"]
+        assert body["earlier_turns_summary"]
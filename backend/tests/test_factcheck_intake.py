@@ -0,0 +1,68 @@
+"""Tests for buffered automatic factcheck intake."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.engine import factcheck_intake as intake_module
+from app.engine.factcheck_intake import FactcheckIntake
+
+
+def test_submit_deduplicates_claims_per_scope(db_factory):
+    """Test a claim is buffered once per debate/topic and again after the scope is forgotten."""
+    intake = FactcheckIntake(db_factory=db_factory)
+    debate_id, other_debate_id, topic_id = uuid4(), uuid4(), uuid4()
+
+    assert intake.submit_turn(debate_id, uuid4(), "hash-a") is True
+    assert intake.submit_turn(debate_id, uuid4(), "hash-a") is False
+    assert intake.submit_turn(other_debate_id, uuid4(), "hash-a") is True
+    assert intake.submit_comment(topic_id, uuid4(), "hash-a") is True
+    assert len(intake._pending) == 3
+
+    intake.forget("debate", debate_id)
+    assert intake.submit_turn(debate_id, uuid4(), "hash-a") is True
+
+
+@pytest.mark.asyncio
+async def test_flush_inserts_batch_once_and_enqueues_only_new_rows(mock_db, db_factory):
+    """Test the buffer is written in one INSERT and only RETURNING ids reach the worker."""
+    intake = FactcheckIntake(db_factory=db_factory)
+    debate_id = uuid4()
+    for i in range(3):
+        intake.submit_turn(debate_id, uuid4(), f"hash-{i}")
+
+    inserted_id = uuid4()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [inserted_id]
+    mock_db.execute = AsyncMock(return_value=result)
+    worker = MagicMock()
+    worker.enqueue = AsyncMock()
+
+    with patch("app.engine.factcheck_worker.factcheck_worker", worker):
+        assert await intake.flush() == [inserted_id]
+        assert await intake.flush() == []
+
+    mock_db.execute.assert_awaited_once()
+    mock_db.commit.assert_awaited_once()
+    worker.enqueue.assert_awaited_once_with(str(inserted_id))
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_rows_buffered(mock_db, db_factory, monkeypatch):
+    """Test rows of a failed INSERT are retried, and claims dropped past MAX_PENDING can be resubmitted."""
+    monkeypatch.setattr(intake_module, "MAX_PENDING", 2)
+    intake = FactcheckIntake(db_factory=db_factory)
+    debate_id = uuid4()
+    for i in range(2):
+        intake.submit_turn(debate_id, uuid4(), f"hash-{i}")
+
+    mock_db.execute = AsyncMock(side_effect=RuntimeError("connection lost"))
+    assert await intake.flush() == []
+    assert [row["claim_hash"] for row in intake._pending] == ["hash-0", "hash-1"]
+
+    intake.submit_turn(debate_id, uuid4(), "hash-2")
+    assert await intake.flush() == []
+    assert [row["claim_hash"] for row in intake._pending] == ["hash-1", "hash-2"]
+    assert intake.submit_turn(debate_id, uuid4(), "hash-0") is True
+    assert intake.submit_turn(debate_id, uuid4(), "hash-1") is False
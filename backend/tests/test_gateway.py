@@ -1,7 +1,7 @@
 """Tests for ClaudeDebateAgent gateway (JSON parsing and formatting)."""
 
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.agents.claude_agent import ClaudeDebateAgent
 from app.models.agent import Agent
@@ -120,28 +120,30 @@ def test_parse_response_with_malformed_json_returns_fallback(claude_agent):
     assert "Missing comma" in result["argument"]
 
 
-def test_count_tokens_returns_reasonable_values(claude_agent):
+@pytest.mark.asyncio
+async def test_count_tokens_returns_reasonable_values(claude_agent):
     """Test _count_tokens returns reasonable token counts."""
     # Short text
     short_text = "Hello world"
-    short_count = claude_agent._count_tokens(short_text)
+    short_count = await claude_agent._count_tokens(short_text)
     assert 1 <= short_count <= 5
 
     # Medium text
     medium_text = " ".join(["word"] * 50)
-    medium_count = claude_agent._count_tokens(medium_text)
+    medium_count = await claude_agent._count_tokens(medium_text)
     assert 40 <= medium_count <= 60
 
     # Long text
     long_text = " ".join(["word"] * 200)
-    long_count = claude_agent._count_tokens(long_text)
+    long_count = await claude_agent._count_tokens(long_text)
     assert 180 <= long_count <= 220
 
 
-def test_count_tokens_handles_exceptions(claude_agent):
+@pytest.mark.asyncio
+async def test_count_tokens_handles_exceptions(claude_agent):
     """Test _count_tokens fallback when tiktoken fails."""
     # Empty string should not raise
-    result = claude_agent._count_tokens("")
+    result = await claude_agent._count_tokens("")
     assert result >= 0
 
 
@@ -243,3 +245,24 @@ def test_parse_response_with_json_language_marker(claude_agent):
 
     assert result["stance"] == "pro"
     assert result["claim"] == "Test"
+
+
+@pytest.mark.asyncio
+async def test_model_fallback_skips_tripped_primary(claude_agent):
+    """Test _call_with_model_fallback routes straight to a fallback when the primary breaker is open."""
+    from app.agents import model_health as mh
+    from app.agents.claude_agent import FALLBACK_MODELS
+    from app.config import settings
+
+    registry = mh.ModelHealthRegistry()
+    for _ in range(mh.MIN_CALLS):
+        registry.breaker(settings.claude_model).record_failure()
+    fallback = next(m for m in FALLBACK_MODELS if m != settings.claude_model)
+
+    claude_agent._call_with_retry = AsyncMock(return_value="response")
+    with patch("app.agents.claude_agent.model_health", registry):
+        result = await claude_agent._call_with_model_fallback(max_tokens=10, messages=[])
+
+    assert result == "response"
+    claude_agent._call_with_retry.assert_awaited_once()
+    assert claude_agent._call_with_retry.await_args.kwargs["model"] == fallback
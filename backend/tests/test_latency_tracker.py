@@ -0,0 +1,84 @@
+"""Tests for adaptive turn timeouts (app/engine/latency_tracker.py)."""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.engine.latency_tracker import AgentLatency, bucket_for, current_period, percentile, record_turn_failure
+
+
+def test_percentile_reports_bucket_upper_bound():
+    """Test p99 lands on the upper bound of the bucket holding the tail."""
+    counts = {bucket_for(2.5): 98, bucket_for(40): 2}
+    assert percentile(counts, 0.5) == 3
+    assert percentile(counts, 0.99) == 45
+    assert percentile({}, 0.99) is None
+
+
+def test_timeout_falls_back_without_enough_history():
+    """Test agents with few samples keep the debate's configured timeout."""
+    latency = AgentLatency(is_external=True, counts={bucket_for(1): 3})
+    assert latency.timeout(120) == 120
+
+
+def test_timeout_is_p99_times_margin_clamped():
+    """Test timeout follows p99 x margin within the configured range."""
+    fast = AgentLatency(is_external=True, counts={bucket_for(1): 100})
+    assert fast.timeout(120) == settings.turn_timeout_min
+
+    slow = AgentLatency(is_external=True, counts={bucket_for(100): 100})
+    assert slow.timeout(120) == 120 * settings.turn_timeout_margin
+
+    glacial = AgentLatency(is_external=True, counts={bucket_for(1000): 100})
+    assert glacial.timeout(120) == settings.turn_timeout_max
+
+
+def test_known_down_external_agent_fails_fast():
+    """Test a recent failure streak shortens the timeout, and a success ends it."""
+    latency = AgentLatency(is_external=True, counts={bucket_for(10): 100})
+    for _ in range(settings.turn_fast_fail_after):
+        latency.fail()
+    assert latency.timeout(120) == settings.turn_fast_fail_timeout
+
+    latency.observe(10)
+    assert latency.timeout(120) > settings.turn_fast_fail_timeout
+
+
+def test_fast_fail_ignores_stale_failures_and_builtin_agents():
+    """Test old failure streaks and builtin agents never get the fast-fail timeout."""
+    stale = AgentLatency(
+        is_external=True,
+        consecutive_failures=settings.turn_fast_fail_after,
+        last_failure_at=datetime.now(timezone.utc) - timedelta(seconds=settings.turn_fast_fail_window + 1),
+    )
+    assert stale.timeout(120) == 120
+
+    builtin = AgentLatency(is_external=False)
+    for _ in range(settings.turn_fast_fail_after):
+        builtin.fail()
+    assert builtin.timeout(120) == 120
+
+
+def test_timed_out_turns_count_at_the_timeout():
+    """Test a timeout adds a sample at the timeout value, so p99 is not biased low."""
+    latency = AgentLatency(is_external=False, counts={bucket_for(10): 98})
+    latency.fail(timed_out_after=60)
+    latency.fail(timed_out_after=60)
+    assert percentile(latency.counts, 0.99) == 60
+    assert latency.consecutive_failures == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout_sample_goes_to_current_period_and_old_periods_are_pruned(mock_db):
+    """Test a recorded timeout lands in the current period and periods outside the window are deleted."""
+    await record_turn_failure(mock_db, uuid4(), timed_out_after=60)
+
+    upsert, prune = (call.args[0] for call in mock_db.execute.await_args_list[:2])
+    params = upsert.compile(dialect=postgresql.dialect()).params
+    assert params["period"] == current_period()
+    assert params["bucket"] == bucket_for(60)
+    prune_params = prune.compile(dialect=postgresql.dialect()).params
+    assert prune_params["period_1"] == current_period() - settings.turn_latency_periods
@@ -0,0 +1,160 @@
+"""Tests for the LLM governor (token buckets and priority scheduling)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.agents.llm_governor import LLMGovernor, LLMPriority, estimate_request_tokens
+from app.middleware.content_filter import ContentFilter, ContentViolationError, StreamingContentFilter
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_in_priority_order():
+    """Test queued calls run highest priority first once a slot frees up."""
+    governor = LLMGovernor(requests_per_minute=6000, tokens_per_minute=600000, max_concurrency=1)
+    order = []
+    release = asyncio.Event()
+
+    async def call(name, priority):
+        async with governor.reserve("m", 10, priority):
+            order.append(name)
+            if name == "first":
+                await release.wait()
+
+    first = asyncio.create_task(call("first", LLMPriority.TURN))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(call("factcheck", LLMPriority.FACTCHECK)),
+        asyncio.create_task(call("comment", LLMPriority.COMMENT)),
+        asyncio.create_task(call("live", LLMPriority.LIVE_TURN)),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, *waiters)
+
+    assert order == ["first", "live", "comment", "factcheck"]
+
+
+@pytest.mark.asyncio
+async def test_request_budget_delays_excess_calls():
+    """Test calls beyond the request bucket wait for it to refill."""
+    governor = LLMGovernor(requests_per_minute=2, tokens_per_minute=600000, max_concurrency=10)
+
+    async with governor.reserve("m", 10):
+        pass
+    async with governor.reserve("m", 10):
+        pass
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with asyncio.timeout(0.1):
+            async with governor.reserve("m", 10):
+                pass
+    assert all(waiter[3].done() for waiter in governor._budget("m").waiters)
+
+
+@pytest.mark.asyncio
+async def test_background_priority_keeps_reserve_for_turns():
+    """Test sentiment/factcheck calls cannot drain the reserve left for turns."""
+    governor = LLMGovernor(
+        requests_per_minute=6000, tokens_per_minute=1000, max_concurrency=10, background_reserve=0.5,
+    )
+
+    async with governor.reserve("m", 600, LLMPriority.TURN):
+        pass
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with asyncio.timeout(0.1):
+            async with governor.reserve("m", 100, LLMPriority.SENTIMENT):
+                pass
+
+    async with asyncio.timeout(0.1):
+        async with governor.reserve("m", 100, LLMPriority.LIVE_TURN):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_penalize_pauses_model():
+    """Test an overload penalty holds every caller for the model."""
+    governor = LLMGovernor(requests_per_minute=6000, tokens_per_minute=600000, max_concurrency=10)
+    governor.penalize("m", 5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with asyncio.timeout(0.1):
+            async with governor.reserve("m", 10, LLMPriority.LIVE_TURN):
+                pass
+
+    async with asyncio.timeout(0.1):
+        async with governor.reserve("other", 10):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_reported_latency_excludes_time_queued_in_the_governor():
+    """Test on_success gets the API round-trip time, not the wait for a concurrency slot."""
+    governor = LLMGovernor(requests_per_minute=6000, tokens_per_minute=600000, max_concurrency=1)
+    client = MagicMock()
+    client.messages.create = AsyncMock(return_value=MagicMock(usage=None))
+    latencies = []
+
+    async def hold_slot():
+        async with governor.reserve("m", 10):
+            await asyncio.sleep(0.2)
+
+    holder = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+    await governor.create_message(client, LLMPriority.TURN, on_success=latencies.append, model="m", max_tokens=10, messages=[])
+    await holder
+
+    assert len(latencies) == 1
+    assert latencies[0] < 0.1
+
+
+def test_estimate_request_tokens_includes_output_budget():
+    """Test the estimate covers prompt text plus max_tokens."""
+    estimate = estimate_request_tokens(
+        max_tokens=800,
+        system="x" * 300,
+        messages=[{"role": "user", "content": "y" * 300}],
+    )
+    assert estimate == 1000
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sent = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+    async def get_final_message(self):
+        return "final"
+
+
+@pytest.mark.asyncio
+async def test_screened_stream_stops_on_content_violation():
+    """Test a screen that raises closes the stream without consuming the rest of it."""
+    governor = LLMGovernor(requests_per_minute=6000, tokens_per_minute=600000, max_concurrency=1)
+    stream = _FakeStream(["how to make a bomb at home " + "x" * 60 + " "] + ["more text "] * 50)
+    client = MagicMock()
+    client.messages.stream.return_value = stream
+    screen = StreamingContentFilter(ContentFilter())
+
+    with pytest.raises(ContentViolationError):
+        await governor.create_message(client, LLMPriority.TURN, screen=screen, model="m", max_tokens=100, messages=[])
+
+    assert stream.sent == 1
+    assert stream.closed
+    assert governor._budget("m").in_flight == 0
@@ -0,0 +1,83 @@
+"""Tests for per-model circuit breakers and routing."""
+
+from unittest.mock import patch
+
+from app.agents import model_health as mh
+from app.agents.model_health import ModelCircuitBreaker, ModelHealthRegistry
+
+
+def _trip(breaker: ModelCircuitBreaker):
+    for _ in range(mh.MIN_CALLS):
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_error_threshold():
+    """Test the breaker opens once enough calls in the window fail."""
+    breaker = ModelCircuitBreaker("primary")
+    breaker.record_success(1.0)
+    breaker.record_failure()
+    assert breaker.current_state() == mh.CLOSED
+
+    _trip(breaker)
+    assert breaker.current_state() == mh.OPEN
+
+
+def test_half_open_allows_single_probe_and_closes_on_success():
+    """Test a tripped breaker admits one probe after the cooldown."""
+    breaker = ModelCircuitBreaker("primary")
+    _trip(breaker)
+    breaker.opened_at -= mh.OPEN_SECONDS
+
+    assert breaker.current_state() == mh.HALF_OPEN
+    assert breaker.try_acquire_probe() is True
+    assert breaker.try_acquire_probe() is False
+
+    breaker.record_success(0.5)
+    assert breaker.current_state() == mh.CLOSED
+
+
+def test_half_open_probe_failure_reopens():
+    """Test a failed probe trips the breaker again."""
+    breaker = ModelCircuitBreaker("primary")
+    _trip(breaker)
+    breaker.opened_at -= mh.OPEN_SECONDS
+    assert breaker.try_acquire_probe() is True
+
+    breaker.record_failure()
+    assert breaker.current_state() == mh.OPEN
+
+
+def test_route_skips_open_primary():
+    """Test routing goes straight to a healthy fallback while the primary is open."""
+    registry = ModelHealthRegistry()
+    _trip(registry.breaker("primary"))
+
+    assert registry.route(["primary", "fallback"]) == [("fallback", "normal")]
+
+
+def test_route_probes_half_open_primary_first():
+    """Test a half-open primary is probed before healthy fallbacks."""
+    registry = ModelHealthRegistry()
+    _trip(registry.breaker("primary"))
+    registry.breaker("primary").opened_at -= mh.OPEN_SECONDS
+
+    assert registry.route(["primary", "fallback"]) == [("primary", "probe"), ("fallback", "normal")]
+
+
+def test_route_demotes_slow_model():
+    """Test a consistently slow model is ordered after a fast one."""
+    registry = ModelHealthRegistry()
+    registry.breaker("primary").record_success(mh.LATENCY_BUDGET_SECONDS)
+    registry.breaker("fallback").record_success(1.0)
+
+    assert [m for m, _ in registry.route(["primary", "fallback"])] == ["fallback", "primary"]
+
+
+def test_route_forces_attempts_when_everything_is_open():
+    """Test routing still yields single attempts when all breakers are open."""
+    registry = ModelHealthRegistry()
+    _trip(registry.breaker("primary"))
+    _trip(registry.breaker("fallback"))
+
+    with patch.object(mh.time, "monotonic", return_value=registry.breaker("fallback").opened_at):
+        assert registry.route(["primary", "fallback"]) == [("primary", "forced"), ("fallback", "forced")]
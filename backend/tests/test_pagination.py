@@ -0,0 +1,70 @@
+"""Tests for keyset pagination and field selection on list endpoints."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, page_response, parse_fields
+from app.api.topics import list_topics
+from app.schemas.topic import TopicListResponse
+
+
+def _rows(count):
+    now = datetime.now(timezone.utc)
+    return [
+        {"id": uuid4(), "created_at": now - timedelta(minutes=i), "title": f"Topic {i}", "status": "open"}
+        for i in range(count)
+    ]
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    """Test cursors decode to the encoded key and garbage cursors are a 400."""
+    created_at, row_id = datetime.now(timezone.utc), uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_parse_fields_rejects_unknown_fields():
+    """Test sparse field selection keeps model order and rejects unknown names."""
+    assert parse_fields("status, title", TopicListResponse) == ["title", "status"]
+    assert parse_fields(None, TopicListResponse) is None
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("title,secret", TopicListResponse)
+    assert exc.value.status_code == 400
+
+
+def test_page_response_sets_next_cursor_and_projects_fields():
+    """Test the extra row becomes the next cursor and projection drops unrequested fields."""
+    rows = _rows(3)
+    response = page_response(rows, 2, None)
+    assert len(json.loads(response.body)) == 2
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (rows[1]["created_at"], rows[1]["id"])
+
+    projected = page_response(rows[:2], 2, ["title"])
+    assert NEXT_CURSOR_HEADER not in projected.headers
+    assert json.loads(projected.body) == [{"title": "Topic 0"}, {"title": "Topic 1"}]
+
+
+@pytest.mark.asyncio
+async def test_list_topics_pages_by_keyset_without_counting(mock_db):
+    """Test the topic list seeks past the cursor, limits the page and reads stored counters."""
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = []
+    mock_db.execute.return_value = result
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid4())
+
+    await list_topics(status=None, limit=10, cursor=cursor, fields="title,comment_count", db=mock_db)
+
+    sql = str(mock_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "(topics.created_at, topics.id) < (" in sql
+    assert "ORDER BY topics.created_at DESC, topics.id DESC" in sql
+    assert "LIMIT" in sql
+    assert "topics.comment_count" in sql
+    assert "GROUP BY" not in sql and "count(" not in sql
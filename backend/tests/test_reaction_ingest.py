@@ -0,0 +1,102 @@
+"""Tests for write-behind reaction ingestion."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.engine.reaction_ingest import PUBLISH_INTERVAL_SECONDS, ReactionIngest
+
+
+def _ids(*ids) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(ids)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_turn_ids_are_loaded_once_per_debate_and_misses_looked_up(mock_db, db_factory):
+    """Test known turns are validated in memory and unknown turns cost one lookup each."""
+    ingest = ReactionIngest(db_factory=db_factory)
+    debate_id, turn_id, new_turn_id = uuid4(), uuid4(), uuid4()
+    mock_db.execute.side_effect = [_ids(turn_id), _ids(new_turn_id), _ids()]
+
+    assert await ingest.submit_turn_reaction(debate_id, turn_id, "like", "s1") is True
+    assert await ingest.submit_turn_reaction(debate_id, turn_id, "like", "s2") is True
+    assert await ingest.submit_turn_reaction(debate_id, new_turn_id, "like", "s1") is True
+    assert await ingest.submit_turn_reaction(debate_id, new_turn_id, "logic_error", "s1") is True
+    assert await ingest.submit_turn_reaction(debate_id, uuid4(), "like", "s1") is False
+
+    assert mock_db.execute.await_count == 3
+    assert len(ingest._pending) == 4
+
+
+@pytest.mark.asyncio
+async def test_flush_collapses_repeats_and_rolls_up_only_inserted_rows(mock_db, db_factory):
+    """Test repeats collapse into one INSERT and only inserted rows are added to the rollup."""
+    ingest = ReactionIngest(db_factory=db_factory)
+    topic_id, comment_id = uuid4(), uuid4()
+    inserted = MagicMock()
+    inserted.all.return_value = [(None, comment_id, "like")]  # the other row was already stored
+    rolled_up = MagicMock()
+    rolled_up.all.return_value = [(topic_id, comment_id, "like", 7)]
+    mock_db.execute.side_effect = [_ids(comment_id), inserted, rolled_up]
+
+    for _ in range(3):
+        await ingest.submit_comment_reaction(topic_id, comment_id, "like", "s1")
+    await ingest.submit_comment_reaction(topic_id, comment_id, "like", "s2")
+
+    assert await ingest.flush() == 1
+    assert await ingest.flush() == 0
+
+    insert, upsert = (call.args[0] for call in mock_db.execute.await_args_list[1:])
+    assert len(insert.compile().params) == 2 * 5  # two rows of (id, turn_id, comment_id, type, session_id)
+    assert upsert.compile().params["count_m0"] == 1
+    mock_db.commit.assert_awaited_once()
+    assert ingest._changed == {topic_id: {str(comment_id): {"like": 7}}}
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_reactions_buffered(mock_db, db_factory, monkeypatch):
+    """Test reactions of a failed INSERT are merged back into the buffer, bounded by MAX_PENDING."""
+    monkeypatch.setattr("app.engine.reaction_ingest.MAX_PENDING", 2)
+    ingest = ReactionIngest(db_factory=db_factory)
+    debate_id, turn_id = uuid4(), uuid4()
+    mock_db.execute.side_effect = [_ids(turn_id), RuntimeError("connection lost"), RuntimeError("connection lost")]
+
+    await ingest.submit_turn_reaction(debate_id, turn_id, "like", "s1")
+    await ingest.submit_turn_reaction(debate_id, turn_id, "like", "s2")
+    assert await ingest.flush() == 0
+    assert [row["session_id"] for row in ingest._pending.values()] == ["s1", "s2"]
+    assert ingest._scopes == {turn_id: debate_id}
+
+    await ingest.submit_turn_reaction(debate_id, turn_id, "like", "s2")  # collapses into the requeued row
+    await ingest.submit_turn_reaction(debate_id, turn_id, "like", "s3")
+    assert await ingest.flush() == 0
+    assert [row["session_id"] for row in ingest._pending.values()] == ["s2", "s3"]
+
+
+@pytest.mark.asyncio
+async def test_count_events_are_throttled_per_scope(db_factory):
+    """Test changed counts are published at most once per interval per debate/topic."""
+    ingest = ReactionIngest(db_factory=db_factory)
+    debate_id, turn_id = uuid4(), uuid4()
+    bus = MagicMock()
+    bus.publish = AsyncMock()
+
+    with patch("app.engine.reaction_ingest.event_bus", bus):
+        ingest._changed[debate_id] = {str(turn_id): {"like": 1}}
+        await ingest.publish_counts()
+        ingest._changed[debate_id] = {str(turn_id): {"like": 2}}
+        await ingest.publish_counts()
+
+        bus.publish.assert_awaited_once_with(
+            debate_id, {"type": "reaction_counts", "data": {"counts": {str(turn_id): {"like": 1}}}},
+        )
+
+        ingest._published_at[debate_id] -= PUBLISH_INTERVAL_SECONDS
+        await ingest.publish_counts()
+
+    assert bus.publish.await_count == 2
+    assert bus.publish.await_args.args[1]["data"]["counts"] == {str(turn_id): {"like": 2}}
+    assert ingest._changed == {}
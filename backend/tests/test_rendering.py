@@ -0,0 +1,50 @@
+"""Tests for orjson rendering of row dicts on hot read endpoints."""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy import func, select
+
+from app.models.agent import Agent
+from app.models.debate import Turn
+from app.models.topic import Comment
+from app.rendering import columns, dumps
+from app.schemas.topic import CommentResponse
+from app.schemas.turn import TurnResponse
+
+
+def test_row_rendering_matches_pydantic_output():
+    """Test a rendered turn row is byte-identical to the response model's JSON."""
+    row = {
+        "id": uuid4(),
+        "debate_id": uuid4(),
+        "agent_id": uuid4(),
+        "turn_number": 3,
+        "status": "validated",
+        "stance": "pro",
+        "claim": "규제는 필요하다",
+        "argument": 'An argument with "quotes" and a newline\n',
+        "citations": [{"url": "https://example.com", "title": "T", "quote": "Q"}],
+        "rebuttal_target_id": None,
+        "team_id": None,
+        "support_target_id": None,
+        "token_count": 42,
+        "submitted_at": datetime(2025, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+        "created_at": datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc),
+    }
+
+    assert dumps(row) == TurnResponse.model_validate(row).model_dump_json().encode()
+
+
+def test_columns_follow_schema_fields_with_labelled_overrides():
+    """Test columns are selected in schema field order and overrides are labelled with the field name."""
+    query = select(*columns(Turn, TurnResponse))
+    assert list(query.selected_columns.keys()) == list(TurnResponse.model_fields)
+
+    query = select(*columns(
+        Comment,
+        CommentResponse,
+        agent_name=func.coalesce(Agent.name, "Unknown"),
+        references=Comment.references_,
+    ))
+    assert list(query.selected_columns.keys()) == list(CommentResponse.model_fields)
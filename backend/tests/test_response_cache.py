@@ -0,0 +1,104 @@
+"""Tests for the serialized response cache of finished debates and topics."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from app.api.analysis import get_analysis
+from app.api.turns import list_turns
+from app.middleware.response_cache import ResponseCache, response_cache
+
+
+class Item(BaseModel):
+    name: str
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_cached_response_has_strong_etag_and_answers_304():
+    """Test cached bytes come back with the same ETag and a matching If-None-Match gets 304."""
+    cache = ResponseCache(max_bytes=1024)
+    first = cache.put(_request(), ("debate", 1), list[Item], [Item(name="a")])
+    assert first.body == b'[{"name":"a"}]'
+    assert first.headers["cache-control"].endswith("immutable")
+
+    etag = first.headers["etag"]
+    assert cache.get(_request(), ("debate", 1)).body == first.body
+    not_modified = cache.get(_request(f'"other", {etag}'), ("debate", 1))
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+
+
+def test_cache_evicts_least_recently_used_by_size_and_invalidates_by_prefix():
+    """Test the byte budget evicts the oldest entries and invalidation drops all variants."""
+    cache = ResponseCache(max_bytes=30)
+    cache.put(_request(), ("turns", 0, None), list[Item], [Item(name="x")])  # 14 bytes each
+    cache.put(_request(), ("turns", 1, None), list[Item], [Item(name="x")])
+    cache.get(_request(), ("turns", 0, None))
+    cache.put(_request(), ("turns", 0, "agent"), list[Item], [Item(name="y")])
+
+    assert cache.get(_request(), ("turns", 1, None)) is None
+    assert cache.get(_request(), ("turns", 0, None)) is not None
+
+    cache.invalidate("turns", 0)
+    assert cache.get(_request(), ("turns", 0, None)) is None
+    assert cache.get(_request(), ("turns", 0, "agent")) is None
+
+
+@pytest.mark.asyncio
+async def test_mutable_entry_is_served_only_while_its_version_is_current(mock_db):
+    """Test an analysis rewritten by another process is reloaded instead of served from cache."""
+    debate_id = uuid4()
+    written_at = datetime.now(timezone.utc)
+    rewritten_at = written_at + timedelta(minutes=1)
+
+    def analysis(updated_at, aggression):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = MagicMock(
+            id=uuid4(), debate_id=debate_id, status="completed", transcript_version="v",
+            sentiment_data=[{"aggression": aggression}], citation_stats={}, created_at=written_at,
+            updated_at=updated_at,
+        )
+        return result
+
+    mock_db.scalar = AsyncMock(side_effect=[written_at, written_at, rewritten_at])
+    mock_db.execute.side_effect = [analysis(written_at, 0.1), analysis(rewritten_at, 0.9)]
+
+    try:
+        first = await get_analysis(_request(), debate_id, mock_db)
+        second = await get_analysis(_request(), debate_id, mock_db)
+        third = await get_analysis(_request(), debate_id, mock_db)
+    finally:
+        response_cache.invalidate("analysis", debate_id)
+
+    assert first.body == second.body
+    assert b"0.9" in third.body
+    assert mock_db.execute.await_count == 2
+    assert third.headers["cache-control"] == "no-cache"
+
+
+@pytest.mark.asyncio
+async def test_turns_of_completed_debate_are_served_from_cache(mock_db):
+    """Test a completed debate's turns hit the database once and are then served from memory."""
+    debate_id = uuid4()
+    status_result = MagicMock()
+    status_result.scalar_one_or_none.return_value = "completed"
+    turns_result = MagicMock()
+    turns_result.mappings.return_value = []
+    mock_db.execute.side_effect = [status_result, turns_result]
+
+    try:
+        first = await list_turns(_request(), debate_id, None, mock_db)
+        second = await list_turns(_request(), debate_id, None, mock_db)
+    finally:
+        response_cache.invalidate("turns", debate_id)
+
+    assert first.body == second.body == b"[]"
+    assert mock_db.execute.await_count == 2
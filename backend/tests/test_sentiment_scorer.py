@@ -0,0 +1,108 @@
+"""Tests for incremental per-turn sentiment scoring."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.agents.sentiment_analyzer import score_turns
+from app.engine.sentiment_scorer import BATCH_SIZE, SentimentScorer, content_hash
+
+
+def _turn(claim="Claim", argument="Argument", **scores):
+    turn = MagicMock(id=uuid4(), claim=claim, argument=argument)
+    turn.sentiment_hash = scores.get("sentiment_hash")
+    turn.sentiment_aggression = scores.get("sentiment_aggression")
+    turn.sentiment_confidence = scores.get("sentiment_confidence")
+    return turn
+
+
+@pytest.mark.asyncio
+async def test_turns_from_concurrent_debates_are_scored_in_one_call(mock_db, db_factory):
+    """Test submitted turns are batched into one Claude call and one bulk UPDATE."""
+    scorer = SentimentScorer(db_factory=db_factory)
+    turns = [_turn(f"claim {i}") for i in range(3)]
+    score = {"aggression": 0.3, "confidence": 0.6}
+
+    with patch("app.engine.sentiment_scorer.score_turns", AsyncMock(return_value=[score] * 3)) as score_turns:
+        for turn in turns:
+            scorer.submit(turn)
+        assert await scorer.flush() == 3
+
+    score_turns.assert_awaited_once()
+    assert len(score_turns.await_args.args[0]) == 3
+    rows = mock_db.execute.await_args.args[1]
+    assert {row["id"] for row in rows} == {turn.id for turn in turns}
+    assert rows[0]["sentiment_hash"] == content_hash("claim 0", "Argument")
+    mock_db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_scored_once(mock_db, db_factory):
+    """Test scores are memoized by content hash across turns and flushes."""
+    scorer = SentimentScorer(db_factory=db_factory)
+    score = {"aggression": 0.8, "confidence": 0.4}
+
+    with patch("app.engine.sentiment_scorer.score_turns", AsyncMock(return_value=[score])) as score_turns:
+        scorer.submit(_turn())
+        scorer.submit(_turn())
+        assert await scorer.flush() == 2
+        later = _turn()
+        assert await scorer.score([later]) == [score]
+        assert await scorer.flush() == 1
+
+    score_turns.assert_awaited_once()
+    assert mock_db.execute.await_args.args[1][0]["id"] == later.id
+
+
+@pytest.mark.asyncio
+async def test_score_reads_stored_scores_and_waits_for_missing_ones(db_factory):
+    """Test stored scores are used as-is and missing ones resolve once their batch is scored."""
+    scorer = SentimentScorer(db_factory=db_factory)
+    stored = _turn(
+        "stored", sentiment_hash=content_hash("stored", "Argument"),
+        sentiment_aggression=0.1, sentiment_confidence=0.2,
+    )
+    missing = [_turn(f"missing {i}") for i in range(BATCH_SIZE + 1)]
+    score = {"aggression": 0.5, "confidence": 0.5}
+
+    async def score_turns(texts):
+        return [score] * len(texts)
+
+    with patch("app.engine.sentiment_scorer.score_turns", side_effect=score_turns) as patched:
+        scores = asyncio.ensure_future(scorer.score([stored, *missing]))
+        await asyncio.sleep(0)
+        await scorer.flush()
+        result = await scores
+
+    assert result[0] == {"aggression": 0.1, "confidence": 0.2}
+    assert result[1:] == [score] * (BATCH_SIZE + 1)
+    assert patched.await_count == 2  # BATCH_SIZE turns per call
+
+
+@pytest.mark.asyncio
+async def test_failed_scoring_leaves_turns_unscored(mock_db, db_factory):
+    """Test a failed Claude call stores nothing and resolves waiters with None."""
+    scorer = SentimentScorer(db_factory=db_factory)
+    turn = _turn()
+
+    with patch("app.engine.sentiment_scorer.score_turns", AsyncMock(side_effect=RuntimeError("overloaded"))):
+        scores = asyncio.ensure_future(scorer.score([turn]))
+        await asyncio.sleep(0)
+        assert await scorer.flush() == 0
+
+    assert await scores == [None]
+    mock_db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_score_turns_maps_items_back_to_turns():
+    """Test the batched response is matched by item number, clamped, and gaps left as None."""
+    response = MagicMock()
+    response.content = [MagicMock(text='{"analyses": [{"item": 2, "aggression": 1.4, "confidence": 0.3}]}')]
+    with patch("app.agents.sentiment_analyzer._call_with_retry", AsyncMock(return_value=response)) as call:
+        scores = await score_turns([("a", "b"), ("c", "d")])
+
+    assert scores == [None, {"aggression": 1.0, "confidence": 0.3}]
+    assert "Item 2:\nClaim: c" in call.await_args.kwargs["messages"][0]["content"]
@@ -0,0 +1,52 @@
+"""Tests for the shared tokenizer."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import tokenizer
+
+
+@pytest.fixture
+def fake_encoding(monkeypatch):
+    encoding = MagicMock()
+    encoding.encode.side_effect = lambda text: [len(word) for word in text.split()]
+    encoding.decode.side_effect = lambda tokens: " ".join("x" * t for t in tokens)
+    monkeypatch.setattr(tokenizer, "_encoding", encoding)
+    monkeypatch.setattr(tokenizer, "_cache", type(tokenizer._cache)())
+    return encoding
+
+
+@pytest.mark.asyncio
+async def test_encode_memoizes_token_ids_by_content(fake_encoding):
+    """Test repeated counts and encodes of the same text reuse the cached token ids."""
+    assert await tokenizer.count("one three") == 2
+    assert await tokenizer.encode("one three") == [3, 5]
+    assert await tokenizer.count("one three") == 2
+
+    fake_encoding.encode.assert_called_once_with("one three")
+    assert tokenizer.decode([3]) == "xxx"
+
+
+@pytest.mark.asyncio
+async def test_large_texts_are_encoded_in_a_thread(fake_encoding):
+    """Test only texts above the offload threshold go through asyncio.to_thread."""
+    large = "word " * tokenizer.THREAD_OFFLOAD_CHARS
+
+    async def fake_to_thread(func, *args):
+        return func(*args)
+
+    with patch("app.tokenizer.asyncio.to_thread", side_effect=fake_to_thread) as to_thread:
+        await tokenizer.encode("short text")
+        to_thread.assert_not_called()
+        assert len(await tokenizer.encode(large)) == tokenizer.THREAD_OFFLOAD_CHARS
+        to_thread.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_count_falls_back_to_estimate_without_encoding(monkeypatch):
+    """Test counts fall back to a word estimate when the encoding cannot load."""
+    monkeypatch.setattr(tokenizer, "_encoding", None)
+    monkeypatch.setattr(tokenizer, "_cache", type(tokenizer._cache)())
+    with patch("app.tokenizer.tiktoken.get_encoding", side_effect=OSError("offline")):
+        assert await tokenizer.count("three words here") == 6
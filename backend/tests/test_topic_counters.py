@@ -0,0 +1,45 @@
+"""Tests for the denormalized topic counters."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.engine.comment_orchestrator import CommentOrchestrator
+from app.engine.topic_counters import reconcile_topic_counters
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_only_drifted_topics(mock_db):
+    """Test one UPDATE recomputes both counters for topics whose stored values differ."""
+    mock_db.execute.return_value = MagicMock(rowcount=2)
+
+    assert await reconcile_topic_counters(mock_db) == 2
+
+    sql = _sql(mock_db.execute.await_args.args[0])
+    assert sql.startswith("UPDATE topics SET participant_count=")
+    assert "topics.participant_count != (SELECT count(topic_participants.id)" in sql
+    assert "topics.comment_count != (SELECT count(comments.id)" in sql
+    mock_db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_commit_comment_increments_topic_counter(mock_db, db_factory):
+    """Test saving a comment bumps the topic's comment_count in the same transaction."""
+    orchestrator = CommentOrchestrator(topic_id=uuid4(), db_factory=db_factory)
+    agent = SimpleNamespace(id=uuid4(), name="agent")
+    participant = SimpleNamespace(agent=agent, agent_id=agent.id, comment_count=0, max_comments=5)
+
+    with patch("app.engine.live_event_bus.event_bus.publish", AsyncMock()):
+        await orchestrator._commit_comment(participant, {"content": "hello"}, [])
+
+    statements = [_sql(call.args[0]) for call in mock_db.execute.await_args_list]
+    assert any(s.startswith("UPDATE topics SET comment_count=(topics.comment_count + ") for s in statements)
+    mock_db.commit.assert_awaited_once()
+    assert participant.comment_count == 1
@@ -0,0 +1,154 @@
+"""Tests for the shared topic scheduler."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.engine.topic_scheduler import TopicScheduler
+
+
+def _fake_orchestrator(keep_going=True):
+    orchestrator = MagicMock()
+    orchestrator.start = AsyncMock(return_value=30)
+    orchestrator.run_cycle = AsyncMock(return_value=keep_going)
+    orchestrator.finish = AsyncMock()
+    orchestrator.close_after_failure = AsyncMock()
+    return orchestrator
+
+
+def _result(rows=(), scalars=()):
+    result = MagicMock()
+    result.all.return_value = list(rows)
+    result.scalars.return_value.all.return_value = list(scalars)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_dispatch_renews_leases_in_one_query_and_closes_expired(mock_db, db_factory):
+    """Test one lease UPDATE covers every due topic and expired topics close in one UPDATE."""
+    now = datetime.now(timezone.utc)
+    open_id, expired_id, closed_id = uuid4(), uuid4(), uuid4()
+    mock_db.execute.side_effect = [
+        _result(rows=[
+            SimpleNamespace(id=open_id, closes_at=now + timedelta(minutes=5)),
+            SimpleNamespace(id=expired_id, closes_at=now - timedelta(seconds=1)),
+        ]),
+        _result(scalars=[]),  # closed_id is no longer open
+        _result(),
+    ]
+
+    scheduler = TopicScheduler(db_factory=db_factory)
+    orchestrators = {tid: _fake_orchestrator() for tid in (open_id, expired_id, closed_id)}
+    scheduler._orchestrators = dict(orchestrators)
+
+    await scheduler._dispatch([open_id, expired_id, closed_id])
+    await asyncio.gather(*scheduler._cycles)
+
+    assert mock_db.execute.await_count == 3  # lease UPDATE, status of the rest, bulk close
+    lease = str(mock_db.execute.await_args_list[0].args[0])
+    assert "scheduler_owner" in lease and "scheduler_lease_until" in lease
+    orchestrators[open_id].run_cycle.assert_awaited_once()
+    orchestrators[expired_id].finish.assert_awaited_once()
+    orchestrators[closed_id].finish.assert_awaited_once()
+    assert set(scheduler._orchestrators) == {open_id}
+
+
+@pytest.mark.asyncio
+async def test_topic_leased_by_another_process_is_released_not_closed(mock_db, db_factory):
+    """Test a due topic another live process holds is dropped without announcing it closed."""
+    topic_id = uuid4()
+    mock_db.execute.side_effect = [_result(), _result(scalars=[topic_id])]
+    scheduler = TopicScheduler(db_factory=db_factory)
+    orchestrator = _fake_orchestrator()
+    orchestrator.release = AsyncMock()
+    scheduler._orchestrators[topic_id] = orchestrator
+
+    await scheduler._dispatch([topic_id])
+
+    orchestrator.release.assert_awaited_once()
+    orchestrator.finish.assert_not_awaited()
+    orchestrator.run_cycle.assert_not_awaited()
+    assert topic_id not in scheduler._orchestrators
+
+
+@pytest.mark.asyncio
+async def test_recovery_adopts_only_claimed_topics(mock_db, db_factory):
+    """Test startup adopts the open topics whose lease it won, not every open topic."""
+    claimed = uuid4()
+    mock_db.execute.return_value = _result(scalars=[claimed])
+    scheduler = TopicScheduler(db_factory=db_factory)
+
+    await scheduler.recover_open_topics()
+
+    claim = mock_db.execute.await_args.args[0]
+    sql = str(claim)
+    assert "scheduler_owner IS NULL" in sql and "scheduler_lease_until <" in sql
+    assert set(scheduler._orchestrators) == {claimed}
+    mock_db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_leases_of_topics_mid_cycle_are_renewed(mock_db, db_factory):
+    """Test a long cycle keeps its lease: running topics are renewed in one UPDATE, finished ones are not."""
+    scheduler = TopicScheduler(db_factory=db_factory)
+    topic_id, idle_id = uuid4(), uuid4()
+    release = asyncio.Event()
+    orchestrator = _fake_orchestrator()
+
+    async def slow_cycle():
+        await release.wait()
+        return True
+
+    orchestrator.run_cycle = AsyncMock(side_effect=slow_cycle)
+    scheduler._orchestrators[topic_id] = orchestrator
+    scheduler._orchestrators[idle_id] = _fake_orchestrator()
+    mock_db.execute.return_value = _result(scalars=[topic_id])
+
+    cycle = asyncio.create_task(scheduler._run_cycle(topic_id))
+    await asyncio.sleep(0)
+    await scheduler.renew_running_leases()
+
+    renewal = mock_db.execute.await_args.args[0]
+    params = renewal.compile().params
+    assert params["id_1"] == [topic_id]
+    assert params["scheduler_owner_1"] == scheduler.owner_id
+    mock_db.commit.assert_awaited_once()
+
+    release.set()
+    await cycle
+    await scheduler.renew_running_leases()
+    assert mock_db.execute.await_count == 1  # nothing in flight, nothing to renew
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_reschedules_after_polling_interval(db_factory):
+    """Test a finished cycle is pushed back one polling interval after it started."""
+    scheduler = TopicScheduler(db_factory=db_factory)
+    topic_id = uuid4()
+    scheduler._orchestrators[topic_id] = _fake_orchestrator()
+
+    await scheduler._run_cycle(topic_id)
+
+    assert len(scheduler._heap) == 1
+    due, _, queued_id = scheduler._heap[0]
+    assert queued_id == topic_id
+    assert scheduler._intervals[topic_id] == 30
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_finishes_topic_when_cycle_reports_closed(db_factory):
+    """Test a topic whose cycle closed it is dropped and finished."""
+    scheduler = TopicScheduler(db_factory=db_factory)
+    topic_id = uuid4()
+    orchestrator = _fake_orchestrator(keep_going=False)
+    scheduler._orchestrators[topic_id] = orchestrator
+
+    await scheduler._run_cycle(topic_id)
+
+    orchestrator.finish.assert_awaited_once()
+    assert scheduler._heap == []
+    assert topic_id not in scheduler._orchestrators
@@ -0,0 +1,167 @@
+"""Tests for the tournament engine."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.api import tournaments as tournaments_api
+from app.engine.tournament import Tournament
+from app.models.agent import Agent
+
+
+def _agents(count: int) -> list[Agent]:
+    return [Agent(id=uuid4(), name=f"Agent {i}", is_builtin=True, status="active") for i in range(count)]
+
+
+def _result(pro, con, winner=None, status="completed"):
+    return {
+        "debate_id": uuid4(),
+        "topic": "AI 규제가 필요한가?",
+        "pro_agent_id": pro,
+        "con_agent_id": con,
+        "status": status,
+        "pro_validated_turns": 0,
+        "con_validated_turns": 0,
+        "winner_agent_id": winner,
+    }
+
+
+def test_round_robin_pairs_every_agent_on_every_topic():
+    """Test round-robin plays each pair once per topic and alternates sides."""
+    agents = _agents(4)
+    topics = ["Should AI be regulated?", "Is remote work better?"]
+    tournament = Tournament(agents, topics, db_factory=None)
+
+    pairings = tournament._round_robin_pairings()
+
+    assert len(pairings) == tournament.total_debates == 12
+    first_pair = [p for p in pairings if {p[0], p[1]} == {agents[0].id, agents[1].id}]
+    assert len(first_pair) == 2
+    assert first_pair[0][0] != first_pair[1][0]
+
+
+def test_swiss_avoids_rematches_and_gives_bye():
+    """Test Swiss pairing skips agents already met and gives the odd agent out a bye."""
+    agents = _agents(5)
+    tournament = Tournament(agents, ["Should AI be regulated?"], db_factory=None, bracket="swiss")
+
+    first_round = tournament._swiss_pairings(0)
+    assert len(first_round) == 2
+    for pro, con, _ in first_round:
+        tournament._record(_result(pro, con, winner=pro))
+
+    second_round = tournament._swiss_pairings(1)
+    played = {frozenset((pro, con)) for pro, con, _ in first_round}
+    assert all(frozenset((pro, con)) not in played for pro, con, _ in second_round)
+    assert sum(s["byes"] for s in tournament.standings.values()) == 2
+
+
+def test_record_scores_wins_draws_and_failures():
+    """Test standings award win/draw points and ignore failed debates."""
+    a, b, c = _agents(3)
+    tournament = Tournament([a, b, c], ["Should AI be regulated?"], db_factory=None)
+
+    tournament._record(_result(a.id, b.id, winner=a.id))
+    tournament._record(_result(b.id, c.id))
+    tournament._record(_result(a.id, c.id, status="failed"))
+
+    summary = tournament.summary()
+    by_id = {s["agent_id"]: s for s in summary["standings"]}
+    assert by_id[a.id]["points"] == 1.0
+    assert by_id[b.id]["points"] == 0.5
+    assert by_id[c.id]["points"] == 0.5
+    assert by_id[a.id]["debates"] == 1
+    assert summary["standings"][0]["agent_id"] == a.id
+    assert summary["completed_debates"] == 2
+    assert summary["failed_debates"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_streams_results_as_debates_finish():
+    """Test run() yields one result per debate and completes the tournament."""
+    agents = _agents(3)
+    tournament = Tournament(agents, ["Should AI be regulated?"], db_factory=None, parallelism=2)
+
+    async def fake_match(pro, con, topic, claimed):
+        return _result(pro, con, winner=pro)
+
+    tournament._run_match = fake_match
+    results = [r async for r in tournament.run()]
+
+    assert len(results) == 3
+    assert tournament.status == "completed"
+    assert sum(s["wins"] for s in tournament.standings.values()) == 3
+
+
+def _external_tournament(db_factory, agent_count=2, topics=("Should AI be regulated?",), **kwargs):
+    agents = _agents(agent_count)
+    for agent in agents:
+        agent.is_builtin = False
+    tournament = Tournament(agents, list(topics), db_factory=db_factory, **kwargs)
+    tournament._create_debate = AsyncMock(side_effect=lambda *args: uuid4())
+    tournament._debate_status = AsyncMock(return_value="completed")
+    return tournament, agents
+
+
+@pytest.mark.asyncio
+async def test_busy_agent_is_retried_and_claimed_slots_go_to_the_debate(db_factory, monkeypatch):
+    """Test slots are claimed all or nothing, an agent busy elsewhere is retried, and the debate gets the slots."""
+    tournament, (a, b) = _external_tournament(db_factory)
+    monkeypatch.setattr("app.engine.tournament.SLOT_RETRY_SECONDS", 0.01)
+
+    # b is busy in a debate outside the tournament on the first attempt
+    attempts = iter([True, False, True, True])
+    acquire = AsyncMock(side_effect=lambda db, agent_id: next(attempts))
+    release = AsyncMock()
+    manager = MagicMock(run=AsyncMock(), transcript=[])
+
+    with patch("app.engine.tournament.acquire_debate_slot", acquire), \
+            patch("app.engine.tournament.release_debate_slot", release), \
+            patch("app.engine.tournament.DebateManager", return_value=manager) as manager_cls:
+        results = [r async for r in tournament.run()]
+
+    assert [r["status"] for r in results] == ["completed"]
+    assert acquire.await_count == 4
+    release.assert_awaited_once()  # a's slot from the failed attempt
+    assert release.await_args.args[1] == a.id
+    assert manager_cls.call_args.kwargs["claimed_slots"] == {a.id, b.id}
+    assert +tournament._held == {}
+
+
+@pytest.mark.asyncio
+async def test_matches_wait_for_released_slots_without_polling(db_factory, monkeypatch):
+    """Test a pairing blocked by the tournament's own matches waits for their release, not the database."""
+    tournament, (a, b) = _external_tournament(db_factory, topics=("t1", "t2", "t3"), parallelism=3)
+    monkeypatch.setattr("app.engine.tournament.MAX_CONCURRENT_DEBATES", 1)
+    monkeypatch.setattr("app.engine.tournament.SLOT_RETRY_SECONDS", 60)
+    acquire = AsyncMock(return_value=True)
+    running = []
+
+    async def run():
+        running.append(1)
+        assert len(running) == 1  # one slot per agent: matches run one at a time
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    with patch("app.engine.tournament.acquire_debate_slot", acquire), \
+            patch("app.engine.tournament.DebateManager", side_effect=lambda *a, **kw: MagicMock(run=run, transcript=[])):
+        async with asyncio.timeout(5):
+            results = [r async for r in tournament.run()]
+
+    assert len(results) == 3
+    assert acquire.await_count == 3 * 2  # only claims that could succeed reached the database
+
+
+def test_finished_tournaments_are_evicted_after_the_ttl(monkeypatch):
+    """Test finished tournaments are dropped from the registry once their TTL passes."""
+    finished = Tournament(_agents(2), ["Should AI be regulated?"], db_factory=None)
+    running = Tournament(_agents(2), ["Should AI be regulated?"], db_factory=None)
+    finished.finished_at = 0.0
+    monkeypatch.setattr(tournaments_api, "_tournaments", {finished.id: finished, running.id: running})
+    monkeypatch.setattr(tournaments_api.time, "monotonic", lambda: tournaments_api.FINISHED_TTL_SECONDS + 1)
+
+    tournaments_api._evict_finished()
+
+    assert list(tournaments_api._tournaments) == [running.id]
@@ -46,6 +46,8 @@ function buildSourceTypeData(citationStats: AnalysisResult["citation_stats"]) {
   }));
 }
 
+const ANALYSIS_POLL_MS = 2000;
+
 export default function AnalysisPage() {
   const { id } = useParams<{ id: string }>();
   const [debate, setDebate] = useState<Debate | null>(null);
@@ -54,13 +56,40 @@ export default function AnalysisPage() {
   const [error, setError] = useState<string | null>(null);
   const [generatingAnalysis, setGeneratingAnalysis] = useState(false);
 
+  const pollAnalysis = useCallback(async () => {
+    setGeneratingAnalysis(true);
+    try {
+      // Generation runs as a background job; poll until it finishes
+      for (;;) {
+        const a = await fetchApi<AnalysisResult>(`/api/debates/${id}/analysis`);
+        if (a.status === "completed") {
+          setAnalysis(a);
+          return;
+        }
+        if (a.status === "failed") {
+          setError("Failed to generate analysis.");
+          return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, ANALYSIS_POLL_MS));
+      }
+    } catch {
+      setError("Failed to generate analysis.");
+    } finally {
+      setGeneratingAnalysis(false);
+    }
+  }, [id]);
+
   const loadData = useCallback(async () => {
     try {
       const d = await fetchApi<Debate>(`/api/debates/${id}`);
       setDebate(d);
       try {
         const a = await fetchApi<AnalysisResult>(`/api/debates/${id}/analysis`);
-        setAnalysis(a);
+        if (a.status === "completed") {
+          setAnalysis(a);
+        } else if (a.status !== "failed") {
+          pollAnalysis();
+        }
       } catch {
         setAnalysis(null);
       }
@@ -69,23 +98,21 @@ export default function AnalysisPage() {
     } finally {
       setLoading(false);
     }
-  }, [id]);
+  }, [id, pollAnalysis]);
 
   useEffect(() => {
     loadData();
   }, [loadData]);
 
   const handleGenerateAnalysis = async () => {
-    setGeneratingAnalysis(true);
+    setError(null);
     try {
       await fetchApi(`/api/debates/${id}/analysis/generate`, { method: "POST" });
-      const a = await fetchApi<AnalysisResult>(`/api/debates/${id}/analysis`);
-      setAnalysis(a);
     } catch {
       setError("Failed to generate analysis.");
-    } finally {
-      setGeneratingAnalysis(false);
+      return;
     }
+    await pollAnalysis();
   };
 
   if (loading) {
@@ -137,6 +164,7 @@ export default function AnalysisPage() {
               {generatingAnalysis ? "Generating..." : "Generate Analysis"}
             </button>
           )}
+          {error && <p className="mt-3 text-sm text-red-400">{error}</p>}
         </div>
       ) : (
         <div className="space-y-8">
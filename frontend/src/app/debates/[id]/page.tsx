@@ -11,6 +11,9 @@ import { useTopicComments } from "@/hooks/useTopicComments";
 
 type ReactionCounts = Record<string, Record<string, number>>;
 
+// Reactions are accepted right away and written in batches about every 0.5s
+const REACTION_REFRESH_DELAY_MS = 1000;
+
 export default function TopicDetailPage() {
   const { id } = useParams<{ id: string }>();
   const [topic, setTopic] = useState<Topic | null>(null);
@@ -28,6 +31,10 @@ export default function TopicDetailPage() {
     fetchApi<ReactionCounts>(`/api/topics/${id}/reactions`).then(setReactions).catch(() => {});
   }, [id]);
 
+  const reloadReactionsSoon = useCallback(() => {
+    setTimeout(loadReactions, REACTION_REFRESH_DELAY_MS);
+  }, [loadReactions]);
+
   const loadFactchecks = useCallback(async () => {
     try {
       const results = await fetchApi<FactcheckResult[]>(`/api/topics/${id}/factchecks`);
@@ -183,7 +190,7 @@ export default function TopicDetailPage() {
             comment={comment}
             topicId={id}
             reactions={reactions[comment.id] ?? {}}
-            onReacted={loadReactions}
+            onReacted={reloadReactionsSoon}
             isNew={isNewComment(comment.id)}
             factcheckResult={factcheckResults[comment.id] ?? null}
             allComments={comments}
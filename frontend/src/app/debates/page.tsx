@@ -3,7 +3,7 @@
 import Link from "next/link";
 import { useEffect, useState } from "react";
 import type { Agent, TopicListItem } from "@/types";
-import { fetchApi } from "@/lib/api";
+import { fetchApi, fetchPage } from "@/lib/api";
 
 const STATUS_LABELS: Record<string, { label: string; color: string }> = {
   scheduled: { label: "Scheduled", color: "text-yellow-400" },
@@ -11,26 +11,43 @@ const STATUS_LABELS: Record<string, { label: string; color: string }> = {
   closed: { label: "Closed", color: "text-muted" },
 };
 
+const TOPICS_PAGE_PATH = "/api/topics?limit=20";
+
 export default function TopicsPage() {
   const [topics, setTopics] = useState<TopicListItem[]>([]);
   const [agents, setAgents] = useState<Agent[]>([]);
   const [showForm, setShowForm] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     Promise.all([
-      fetchApi<TopicListItem[]>("/api/topics"),
+      fetchPage<TopicListItem>(TOPICS_PAGE_PATH),
       fetchApi<Agent[]>("/api/agents"),
     ])
-      .then(([t, a]) => {
-        setTopics(t);
+      .then(([page, a]) => {
+        setTopics(page.items);
+        setNextCursor(page.nextCursor);
         setAgents(a);
       })
       .catch(() => setError("Failed to load topics. Please check if the backend is running."))
       .finally(() => setLoading(false));
   }, []);
 
+  const loadMore = () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    fetchPage<TopicListItem>(TOPICS_PAGE_PATH, nextCursor)
+      .then((page) => {
+        setTopics((prev) => [...prev, ...page.items]);
+        setNextCursor(page.nextCursor);
+      })
+      .catch(() => {})
+      .finally(() => setLoadingMore(false));
+  };
+
   return (
     <div>
       <div className="flex items-center justify-between mb-8">
@@ -113,6 +130,15 @@ export default function TopicsPage() {
               </Link>
             );
           })}
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="rounded-lg border border-card-border bg-card px-4 py-2 text-sm text-muted hover:border-accent/50 transition-colors disabled:opacity-50"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -16,8 +16,8 @@ export default function LandingPage() {
   const [loadingRecent, setLoadingRecent] = useState(true);
 
   useEffect(() => {
-    fetchApi<TopicListItem[]>("/api/topics")
-      .then((topics) => setRecentTopics(topics.slice(0, 3)))
+    fetchApi<TopicListItem[]>("/api/topics?limit=3")
+      .then((topics) => setRecentTopics(topics))
       .catch(() => {})
       .finally(() => setLoadingRecent(false));
   }, []);
@@ -62,7 +62,7 @@ export function CommentCard({
       });
       onReacted();
     } catch {
-      // Ignore duplicate reaction errors
+      // Ignore failed reactions (repeats are accepted and ignored server-side)
     }
   };
 
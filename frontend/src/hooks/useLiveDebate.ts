@@ -10,6 +10,7 @@ interface LiveDebateState {
   viewerCount: number;
   cooldownSeconds: number;
   latestTurn: Turn | null;
+  reactionCounts: Record<string, Record<string, number>>;
 }
 
 export function useLiveDebate(debateId: string, enabled: boolean): LiveDebateState {
@@ -17,6 +18,7 @@ export function useLiveDebate(debateId: string, enabled: boolean): LiveDebateSta
   const [viewerCount, setViewerCount] = useState(0);
   const [cooldownSeconds, setCooldownSeconds] = useState(0);
   const [latestTurn, setLatestTurn] = useState<Turn | null>(null);
+  const [reactionCounts, setReactionCounts] = useState<Record<string, Record<string, number>>>({});
   const retryCount = useRef(0);
   const eventSourceRef = useRef<EventSource | null>(null);
 
@@ -59,6 +61,20 @@ export function useLiveDebate(debateId: string, enabled: boolean): LiveDebateSta
       } catch { /* ignore */ }
     });
 
+    // Throttled; carries current counts of the turns that changed since the last event
+    es.addEventListener("reaction_counts", (e) => {
+      try {
+        const data = JSON.parse(e.data);
+        setReactionCounts((prev) => {
+          const next = { ...prev };
+          for (const [turnId, counts] of Object.entries<Record<string, number>>(data.counts ?? {})) {
+            next[turnId] = { ...next[turnId], ...counts };
+          }
+          return next;
+        });
+      } catch { /* ignore */ }
+    });
+
     es.addEventListener("debate_complete", () => {
       setIsLive(false);
       es.close();
@@ -89,5 +105,5 @@ export function useLiveDebate(debateId: string, enabled: boolean): LiveDebateSta
     };
   }, [connect, enabled]);
 
-  return { isLive, viewerCount, cooldownSeconds, latestTurn };
+  return { isLive, viewerCount, cooldownSeconds, latestTurn, reactionCounts };
 }
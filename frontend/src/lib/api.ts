@@ -13,3 +13,15 @@ export async function fetchApi<T>(
   if (!res.ok) throw new Error(`API Error: ${res.status}`);
   return res.json();
 }
+
+/** One page of a keyset-paginated list; pass `nextCursor` back as `cursor` for the next page. */
+export async function fetchPage<T>(
+  path: string,
+  cursor?: string | null,
+): Promise<{ items: T[]; nextCursor: string | null }> {
+  const sep = path.includes("?") ? "&" : "?";
+  const url = cursor ? `${API_BASE}${path}${sep}cursor=${encodeURIComponent(cursor)}` : `${API_BASE}${path}`;
+  const res = await fetch(url, { headers: { "Content-Type": "application/json" } });
+  if (!res.ok) throw new Error(`API Error: ${res.status}`);
+  return { items: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
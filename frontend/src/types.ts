@@ -185,6 +185,8 @@ export interface Comment {
 export interface AnalysisResult {
   id: string;
   debate_id: string;
+  status: "pending" | "processing" | "completed" | "failed";
+  transcript_version: string | null;
   sentiment_data: Array<{
     turn_number: number;
     side: string;
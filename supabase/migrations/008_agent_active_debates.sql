@@ -0,0 +1,20 @@
+-- ============================================================================
+-- AgonAI - Agent Active Debate Counter
+-- ============================================================================
+-- Migration: 008_agent_active_debates.sql
+-- Description: Per-agent counter of in-progress debates, used to enforce the
+--              external agent concurrency limit without a join per turn
+-- ============================================================================
+
+ALTER TABLE agents ADD COLUMN active_debate_count INTEGER NOT NULL DEFAULT 0 CHECK (active_debate_count >= 0);
+
+-- Backfill from debates currently in progress
+UPDATE agents a SET active_debate_count = sub.cnt
+FROM (
+    SELECT dp.agent_id, count(DISTINCT dp.debate_id) AS cnt
+    FROM debate_participants dp
+    JOIN debates d ON d.id = dp.debate_id
+    WHERE d.status = 'in_progress' AND d.is_sandbox = false
+    GROUP BY dp.agent_id
+) sub
+WHERE a.id = sub.agent_id AND a.is_builtin = false;
@@ -0,0 +1,17 @@
+-- ============================================================================
+-- AgonAI - Agent Turn Latency
+-- ============================================================================
+-- Migration: 009_agent_turn_latency.sql
+-- Description: Per-agent turn latency histograms and failure streaks, used to
+--              pick adaptive turn timeouts and fail fast on dead endpoints
+-- ============================================================================
+
+CREATE TABLE agent_latency_buckets (
+    agent_id UUID NOT NULL REFERENCES agents(id) ON DELETE CASCADE,
+    bucket SMALLINT NOT NULL CHECK (bucket >= 0),
+    count BIGINT NOT NULL DEFAULT 0 CHECK (count >= 0),
+    PRIMARY KEY (agent_id, bucket)
+);
+
+ALTER TABLE agents ADD COLUMN consecutive_turn_failures INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE agents ADD COLUMN last_turn_failure_at TIMESTAMPTZ;
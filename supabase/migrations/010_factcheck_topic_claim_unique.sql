@@ -0,0 +1,16 @@
+-- ============================================================================
+-- AgonAI - Factcheck Topic Claim Dedup
+-- ============================================================================
+-- Migration: 010_factcheck_topic_claim_unique.sql
+-- Description: One factcheck request per claim per topic, so batched
+--              auto-factcheck inserts can rely on ON CONFLICT DO NOTHING
+-- ============================================================================
+
+-- Keep the earliest request for any claim requested more than once in a topic
+DELETE FROM factcheck_requests a
+USING factcheck_requests b
+WHERE a.topic_id = b.topic_id
+  AND a.claim_hash = b.claim_hash
+  AND (a.created_at, a.id) > (b.created_at, b.id);
+
+CREATE UNIQUE INDEX idx_factcheck_req_topic_claim ON factcheck_requests(topic_id, claim_hash);
@@ -0,0 +1,16 @@
+-- ============================================================================
+-- AgonAI - Keyset Pagination Indexes
+-- ============================================================================
+-- Migration: 011_list_keyset_indexes.sql
+-- Description: Composite (created_at, id) indexes so GET /api/debates and
+--              GET /api/topics can page by keyset instead of scanning history
+-- ============================================================================
+
+-- Lobby listing excludes sandbox debates
+CREATE INDEX idx_debates_keyset ON debates(created_at DESC, id DESC) WHERE is_sandbox = false;
+CREATE INDEX idx_debates_status_keyset ON debates(status, created_at DESC, id DESC) WHERE is_sandbox = false;
+
+CREATE INDEX idx_topics_keyset ON topics(created_at DESC, id DESC);
+-- Supersedes idx_topics_status (status is its leading column)
+CREATE INDEX idx_topics_status_keyset ON topics(status, created_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_topics_status;
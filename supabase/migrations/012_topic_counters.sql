@@ -0,0 +1,15 @@
+-- ============================================================================
+-- AgonAI - Topic Counters
+-- ============================================================================
+-- Migration: 012_topic_counters.sql
+-- Description: Denormalized participant/comment counters on topics so the
+--              topic list reads them instead of counting joined rows
+-- ============================================================================
+
+ALTER TABLE topics ADD COLUMN participant_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE topics ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill from existing rows
+UPDATE topics t SET
+    participant_count = (SELECT count(*) FROM topic_participants p WHERE p.topic_id = t.id),
+    comment_count = (SELECT count(*) FROM comments c WHERE c.topic_id = t.id);
@@ -0,0 +1,18 @@
+-- ============================================================================
+-- AgonAI - Comment Reaction Dedup
+-- ============================================================================
+-- Migration: 013_comment_reaction_unique.sql
+-- Description: One reaction per (comment, session, type), matching the
+--              existing UNIQUE(turn_id, session_id, type) on turn reactions,
+--              so batched reaction inserts can rely on ON CONFLICT DO NOTHING
+-- ============================================================================
+
+-- Keep the earliest of any repeated comment reaction
+DELETE FROM reactions a
+USING reactions b
+WHERE a.comment_id = b.comment_id
+  AND a.session_id = b.session_id
+  AND a.type = b.type
+  AND (a.created_at, a.id) > (b.created_at, b.id);
+
+CREATE UNIQUE INDEX idx_reactions_comment_session_type ON reactions(comment_id, session_id, type);
@@ -0,0 +1,39 @@
+-- ============================================================================
+-- AgonAI - Reaction Counts Rollup
+-- ============================================================================
+-- Migration: 014_reaction_counts.sql
+-- Description: Reaction counters per turn/comment and type, kept up to date
+--              by the reaction ingest flush so count endpoints read rows
+--              instead of grouping the reactions table
+-- ============================================================================
+
+CREATE TABLE reaction_counts (
+    target_id UUID NOT NULL,        -- turn or comment id
+    type VARCHAR(20) NOT NULL,
+    scope_id UUID NOT NULL,         -- debate or topic id
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (target_id, type)
+);
+
+CREATE INDEX idx_reaction_counts_scope ON reaction_counts(scope_id);
+
+-- Backfill from existing reactions
+INSERT INTO reaction_counts (target_id, type, scope_id, count)
+SELECT r.turn_id, r.type, t.debate_id, count(*)
+FROM reactions r
+JOIN turns t ON t.id = r.turn_id
+GROUP BY r.turn_id, r.type, t.debate_id;
+
+INSERT INTO reaction_counts (target_id, type, scope_id, count)
+SELECT r.comment_id, r.type, c.topic_id, count(*)
+FROM reactions r
+JOIN comments c ON c.id = r.comment_id
+GROUP BY r.comment_id, r.type, c.topic_id;
+
+ALTER TABLE reaction_counts ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "anon_read_reaction_counts" ON reaction_counts
+  FOR SELECT TO anon USING (true);
+
+CREATE POLICY "service_full_reaction_counts" ON reaction_counts
+  FOR ALL TO service_role USING (true) WITH CHECK (true);
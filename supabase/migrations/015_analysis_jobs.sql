@@ -0,0 +1,18 @@
+-- ============================================================================
+-- AgonAI - Analysis Jobs
+-- ============================================================================
+-- Migration: 015_analysis_jobs.sql
+-- Description: Analysis generation runs as a background job; the debate's
+--              analysis_results row tracks the job status and the transcript
+--              version it covers
+-- ============================================================================
+
+-- Existing rows hold finished analyses
+ALTER TABLE analysis_results ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT 'completed'
+    CHECK (status IN ('pending', 'processing', 'completed', 'failed'));
+ALTER TABLE analysis_results ALTER COLUMN status SET DEFAULT 'pending';
+ALTER TABLE analysis_results ADD COLUMN transcript_version VARCHAR(64);
+
+-- Startup recovery of unfinished jobs
+CREATE INDEX idx_analysis_results_unfinished ON analysis_results(status)
+    WHERE status IN ('pending', 'processing');
@@ -0,0 +1,18 @@
+-- ============================================================================
+-- AgonAI - Per-Turn Sentiment
+-- ============================================================================
+-- Migration: 016_turn_sentiment.sql
+-- Description: Sentiment scores are computed per turn as turns are validated
+--              and stored on the turn, with the hash of the claim/argument
+--              they were computed from; analyses assemble stored scores
+-- ============================================================================
+
+ALTER TABLE turns ADD COLUMN sentiment_aggression DOUBLE PRECISION
+    CHECK (sentiment_aggression BETWEEN 0 AND 1);
+ALTER TABLE turns ADD COLUMN sentiment_confidence DOUBLE PRECISION
+    CHECK (sentiment_confidence BETWEEN 0 AND 1);
+ALTER TABLE turns ADD COLUMN sentiment_hash VARCHAR(64);
+
+-- Startup recovery of validated turns that were never scored
+CREATE INDEX idx_turns_unscored ON turns(validated_at)
+    WHERE status = 'validated' AND sentiment_hash IS NULL;
@@ -0,0 +1,10 @@
+-- ============================================================================
+-- AgonAI - Citation Report Index
+-- ============================================================================
+-- Migration: 017_turn_citation_report.sql
+-- Description: Citation stats are computed in SQL from validated turns'
+--              citations; cross-debate reports filter them by validation time
+-- ============================================================================
+
+CREATE INDEX idx_turns_validated_at ON turns(validated_at)
+    WHERE status = 'validated';
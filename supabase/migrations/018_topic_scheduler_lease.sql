@@ -0,0 +1,11 @@
+-- ============================================================================
+-- AgonAI - Topic Scheduler Lease
+-- ============================================================================
+-- Migration: 018_topic_scheduler_lease.sql
+-- Description: The process that schedules an open topic holds a lease on it,
+--              so several workers (or an overlapping deploy) never poll the
+--              same topic twice
+-- ============================================================================
+
+ALTER TABLE topics ADD COLUMN scheduler_owner VARCHAR(64);
+ALTER TABLE topics ADD COLUMN scheduler_lease_until TIMESTAMPTZ;
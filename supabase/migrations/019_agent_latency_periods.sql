@@ -0,0 +1,16 @@
+-- ============================================================================
+-- AgonAI - Agent Latency Periods
+-- ============================================================================
+-- Migration: 019_agent_latency_periods.sql
+-- Description: Latency histograms are kept per period (one day by default) and
+--              only recent periods are read, so old latencies age out.
+--              Existing counts are moved into the current period and expire
+--              with it
+-- ============================================================================
+
+ALTER TABLE agent_latency_buckets
+    ADD COLUMN period INTEGER NOT NULL DEFAULT floor(extract(epoch FROM now()) / 86400)::INTEGER;
+ALTER TABLE agent_latency_buckets ALTER COLUMN period DROP DEFAULT;
+
+ALTER TABLE agent_latency_buckets DROP CONSTRAINT agent_latency_buckets_pkey;
+ALTER TABLE agent_latency_buckets ADD PRIMARY KEY (agent_id, period, bucket);